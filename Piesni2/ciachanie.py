@@ -0,0 +1,142 @@
+import io
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import RectangleObject
+
+# Pomiary (profilowanie.py) leżą w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from profilowanie import odcinek, uruchom_z_profilem
+
+# Jednoprzebiegowe przekształcanie skanu śpiewnika (zastępuje ciachanie1.py + ciachanie2.py).
+# Każda strona wejściowa jest opisywana listą prostokątów (na początku: cała strona), a kolejne
+# przekształcenia z łańcucha działają na tych prostokątach: podział na kolumny zamienia każdy prostokąt
+# na kilka węższych, przycinanie zmniejsza marginesy. Dla każdego prostokąta powstaje jedna strona
+# wyjściowa - kopia strony źródłowej z ustawionymi MediaBox i CropBox, bez nakładania treści na pustą
+# stronę i bez zapisywania pliku pośredniego. Zakresy stron są przetwarzane w puli procesów,
+# a częściowe wyniki łączone w kolejności stron.
+
+# --- Konfiguracja ---
+# Plik wejściowy i wynikowy
+input_pdf_path = "SAK.pdf"
+output_pdf_path = "SAK3.pdf"
+
+# Łańcuch przekształceń stosowany do każdej strony (w punktach PDF, tak jak w ciachanie2.py):
+#   {'op': 'split_columns', 'columns': N} - podział pionowy na N równych kolumn (od lewej),
+#   {'op': 'crop', 'left': .., 'right': .., 'top': .., 'bottom': ..} - odcięcie marginesów.
+transforms = [
+    {'op': 'split_columns', 'columns': 2},
+    {'op': 'crop', 'bottom': 185},
+]
+
+# Łańcuchy dla wybranych stron (numer strony wejściowej od 1 -> lista przekształceń zamiast domyślnej);
+# pusta lista oznacza skopiowanie strony bez zmian
+page_overrides = {}
+
+# Liczba stron wejściowych w jednym zadaniu puli procesów
+pages_per_task = 16
+# --- Koniec Konfiguracji ---
+
+
+def apply_transforms(box, chain):
+    """
+    Zwraca listę prostokątów (x0, y0, x1, y1) powstałych z prostokąta strony po zastosowaniu łańcucha.
+
+    Args:
+        box (tuple): Prostokąt strony (x0, y0, x1, y1).
+        chain (list): Lista przekształceń (jak w zmiennej 'transforms').
+    """
+    boxes = [box]
+    for transform in chain:
+        if transform['op'] == 'split_columns':
+            columns = transform['columns']
+            boxes = [(x0 + (x1 - x0) * i / columns, y0, x0 + (x1 - x0) * (i + 1) / columns, y1)
+                     for x0, y0, x1, y1 in boxes for i in range(columns)]
+        elif transform['op'] == 'crop':
+            cropped = []
+            for x0, y0, x1, y1 in boxes:
+                new = (x0 + transform.get('left', 0), y0 + transform.get('bottom', 0),
+                       x1 - transform.get('right', 0), y1 - transform.get('top', 0))
+                if new[2] <= new[0] or new[3] <= new[1]:
+                    print("Ostrzeżenie: Strona jest zbyt mała, aby ją przyciąć. Zostaje bez zmian.")
+                    new = (x0, y0, x1, y1)
+                cropped.append(new)
+            boxes = cropped
+        else:
+            raise ValueError(f"Nieznane przekształcenie: {transform['op']!r}")
+    return boxes
+
+
+def transform_page_range(input_path, start, stop, chain, overrides):
+    """
+    Przekształca strony [start, stop) pliku wejściowego i zwraca częściowy PDF jako bajty.
+    Uruchamiana w procesie roboczym - każdy proces otwiera plik wejściowy samodzielnie.
+    """
+    reader = PdfReader(input_path)
+    writer = PdfWriter()
+    for number in range(start, stop):
+        page = reader.pages[number]
+        mediabox = page.mediabox
+        box = (float(mediabox.left), float(mediabox.bottom), float(mediabox.right), float(mediabox.top))
+        for region in apply_transforms(box, overrides.get(number + 1, chain)):
+            new_page = writer.add_page(page)
+            new_page.mediabox = RectangleObject(region)
+            new_page.cropbox = RectangleObject(region)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def transform_pdf(input_path, output_path, chain, overrides=None, workers=None, chunk=pages_per_task):
+    """
+    Przekształca cały plik PDF jednym przebiegiem i zapisuje wynik (atomowo).
+
+    Returns:
+        Krotka (liczba stron wejściowych, liczba stron wyjściowych).
+    """
+    overrides = overrides or {}
+    page_count = len(PdfReader(input_path).pages)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+    with odcinek('pdf: przekształcanie stron'):
+        if len(ranges) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(transform_page_range, *zip(*[(input_path, a, b, chain, overrides) for a, b in ranges])))
+        else:
+            parts = [transform_page_range(input_path, a, b, chain, overrides) for a, b in ranges]
+
+    writer = PdfWriter()
+    with odcinek('pdf: łączenie części'):
+        for part in parts:
+            writer.append(PdfReader(io.BytesIO(part)))
+    temporary_path = f"{output_path}.tmp"
+    with open(temporary_path, "wb") as output_file, odcinek('pdf: zapis'):
+        writer.write(output_file)
+    os.replace(temporary_path, output_path)
+    return page_count, len(writer.pages)
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Podział na kolumny i przycinanie stron skanu śpiewnika w jednym przebiegu.")
+    parser.add_argument('input', nargs='?', default=input_pdf_path, help=f"plik wejściowy (domyślnie {input_pdf_path})")
+    parser.add_argument('output', nargs='?', default=output_pdf_path, help=f"plik wynikowy (domyślnie {output_pdf_path})")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni; 1 - bez puli)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Plik '{args.input}' nie istnieje. Proszę zaktualizować zmienną 'input_pdf_path' na górze skryptu.")
+        return
+    try:
+        pages_in, pages_out = transform_pdf(args.input, args.output, transforms, page_overrides, args.workers)
+    except Exception as e:
+        print(f"Wystąpił nieoczekiwany błąd: {e}")
+        return
+    print(f"Sukces! Przekształcono {pages_in} stron w {pages_out} i zapisano jako: {args.output}")
+
+
+# Ta część uruchamia funkcję, gdy skrypt jest wykonywany bezpośrednio
+if __name__ == "__main__":
+    uruchom_z_profilem(main)
@@ -0,0 +1,250 @@
+import os
+import re
+import sys
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pypdf import PdfReader
+
+# Manifesty (manifest.py) leżą w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, wczytaj_json, zapisz_json_atomowo
+from profilowanie import odcinek, uruchom_z_profilem
+
+# Odczyt spisu pieśni SAK z przyciętego skanu (SAK3.pdf z ciachanie.py) do postaci SAK.txt:
+# nagłówki kategorii i linie "numer tytuł", tak jak czytają je uzupelnianie.py i wzbogacanie.py.
+# Tekst każdej strony jest wyciągany tylko z jej widocznego obszaru (MediaBox) i składany w linie
+# według współrzędnej y. Rodzaj linii wynika z kroju pisma: nagłówki działów są składane krojem
+# nagłówkowym, a pozycje spisu zaczynają się pogrubionym numerem, po którym jest tytuł (teksty
+# pieśni na dalszych stronach nie tworzą pozycji, bo numery w spisie rosną). Wyniki są zapamiętywane
+# według skrótu treści strony i jej obszaru, więc po ponownym zeskanowaniu śpiewnika przetwarzane są tylko strony, które się zmieniły - równolegle w puli procesów.
+
+# --- Konfiguracja ---
+# Plik wejściowy (wynik ciachanie.py) i wynikowy spis
+INPUT_PDF_FILENAME = 'SAK3.pdf'
+OUTPUT_FILENAME = 'SAK_z_pdf.txt'
+
+# Plik z tekstem stron w folderze manifestów (głównym folderze projektu)
+CACHE_FILENAME = 'tekst_stron_pdf.json'
+
+# Wersja sposobu odczytu; zmiana unieważnia zapamiętany tekst stron
+EXTRACTION_VERSION = 1
+
+# Maksymalna różnica współrzędnej y (w punktach), przy której fragmenty należą do tej samej linii
+LINE_TOLERANCE = 3
+
+# Fragment kroju pisma nagłówków działów i fragment kroju pogrubionych numerów pozycji spisu
+HEADING_FONT = 'Lato'
+NUMBER_FONT = 'Bold'
+
+# Liczba stron w jednym zadaniu puli procesów
+PAGES_PER_TASK = 8
+
+# Nagłówki działów ze skanu -> nazwy kategorii używane w SAK.txt i Kategorie.txt (klucze bez spacji,
+# bo tekst ze skanu bywa rozstrzelony, np. 'PASY JNE'); pozostałe nagłówki są zapisywane tak, jak w skanie
+HEADINGS = {
+    'ŚPIEWYWCZASIEMSZYŚW.': 'Pieśni Mszalne',
+    'PIEŚNIMSZALNE': 'Pieśni Mszalne',
+    'PIEŚNIADWENTOWE': 'Adwent',
+    'PIEŚNINABOŻENARODZENIE': 'Boże Narodzenie',
+    'NAUROCZYSTOŚĆŚWIĘTEJRODZINY': 'Świętej Rodziny',
+    'NAOSTATNIDZIEŃSTAREGOROKU': 'Koniec Roku',
+    'NAUROCZYSTOŚĆOBJAWIENIAPAŃSKIEGO': 'Objawienie Pańskie',
+    'PIEŚNIWIELKOPOSTNE(POKUTNE)': 'Wielki Post',
+    'PIEŚNIWIELKOPOSTNE(PASYJNE)': 'Wielki Post',
+    'NAWIELKIPIĄTEK': 'Wielki Piątek',
+    'PIEŚNIWIELKANOCNE': 'Pieśni wielkanocne',
+    'NADNIKRZYŻOWE': 'Dni Krzyżowe',
+    'NAWNIBOWSTĄPIENIE': 'Wniebowstąpienie Pańskie',
+    'NAWNIEBOWSTĄPIENIE': 'Wniebowstąpienie Pańskie',
+    'DODUCHAŚWIĘTEGO': 'Pieśni do Ducha Świętego',
+    'KUCZCITRÓJCYPRZENAJŚWIĘTSZEJ': 'Pieśni do Trójcy Świętej',
+    'PIEŚNIEUCHARYSTYCZNE': 'Pieśni Eucharystyczne',
+    'ŚPIEWYUWIELBIENIA': 'Uwielbienie',
+    'DONAJŚWIĘTSZEGOSERCAPANAJEZUSA': 'Pieśni do Serca Jezusa',
+    'KUCZCICHRYSTUSAKRÓLA': 'Pieśni Jezusa Chrystusa, Króla Wszechświata',
+    'PIEŚNIKUCZCIMATKIBOŻEJ': 'Pieśni do Najświętszej Maryi Panny',
+}
+
+# Linia pieśni w postaci czytanej przez uzupelnianie.py / wzbogacanie.py (numer całkowity)
+SONG_LINE = re.compile(r'^(\d+)\s+(.+)$')
+# Podpunkty części stałych (np. '700.1', '751.10a') - nie są osobnymi pieśniami
+SUBITEM_LINE = re.compile(r'^\d+\.\d+[a-z]?\s')
+# --- Koniec Konfiguracji ---
+
+
+def page_key(page):
+    """Skrót treści strony razem z jej obszarem i wersją odczytu."""
+    digest = hashlib.sha256(f"{EXTRACTION_VERSION}|{LINE_TOLERANCE}|{list(page.mediabox)}|".encode())
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    return digest.hexdigest()
+
+
+def joiner(previous, following):
+    """
+    Odstęp wstawiany między sąsiednimi fragmentami linii. Spacje zapisane w samych fragmentach są zachowywane;
+    gdy ich brak, fragmenty przylegają przy nawiasach i znakach interpunkcyjnych (kursywa w nawiasie jest
+    osobnym fragmentem) oraz po inicjale złożonym innym krojem ('A' + 'lleluja'), a poza tym dzieli je spacja.
+    """
+    if not previous or not following or previous[-1].isspace() or following[0].isspace():
+        return ''
+    if previous[-1] == '(' or following[0] in ',.;:!?)':
+        return ''
+    if previous[-1].isupper() and (len(previous) == 1 or not previous[-2].isalpha()) and following[0].islower():
+        return ''
+    return ' '
+
+
+def page_lines(page):
+    """
+    Zwraca linie tekstu z widocznego obszaru strony, od góry do dołu, jako pary [rodzaj, tekst]:
+    'naglowek' (cała linia krojem nagłówkowym), 'pozycja' (pogrubiony numer, potem tytuł) lub 'tekst'.
+    """
+    box = page.mediabox
+    fragments = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        if text.strip() and box.left <= x < box.right and box.bottom <= y < box.top:
+            fragments.append((y, x, text, str((font_dict or {}).get('/BaseFont', ''))))
+
+    page.extract_text(visitor_text=visitor)
+    lines = {}
+    for y, x, text, font in fragments:
+        line_y = next((known for known in lines if abs(known - y) <= LINE_TOLERANCE), y)
+        lines.setdefault(line_y, []).append((x, text, font))
+
+    result = []
+    for y in sorted(lines, reverse=True):
+        parts = sorted(lines[y])
+        text = parts[0][1]
+        for _, part, _ in parts[1:]:
+            text += joiner(text, part) + part
+        text = re.sub(r'\(\s+', '(', re.sub(r'\s+\)', ')', text.strip()))
+        if all(HEADING_FONT in font for _, _, font in parts):
+            kind = 'naglowek'
+        elif len(parts) > 1 and NUMBER_FONT in parts[0][2] and re.fullmatch(r'\s*\d[\d.]*[a-z]?(\s+\w)?\s*', parts[0][1]):
+            kind = 'pozycja'
+        else:
+            kind = 'tekst'
+        result.append([kind, text])
+    return result
+
+
+def normalize_line(line):
+    """
+    Ujednolica odstępy w linii. Tekst rozstrzelony ('n i e s z p o r y  n i e d z i e l n e') jest
+    sklejany w słowa - litery dzielą pojedyncze spacje, a słowa co najmniej dwie.
+    """
+    tokens = line.split()
+    if len(tokens) > 3 and sum(len(token) == 1 for token in tokens) > 0.8 * len(tokens):
+        return ' '.join(word.replace(' ', '') for word in re.split(r'\s{2,}', line.strip()))
+    return ' '.join(tokens)
+
+
+def extract_pages(input_path, page_numbers):
+    """Wyciąga linie tekstu z podanych stron; uruchamiana w procesie roboczym."""
+    logging.getLogger('pypdf').setLevel(logging.ERROR)
+    reader = PdfReader(input_path)
+    return [(number, page_lines(reader.pages[number])) for number in page_numbers]
+
+
+def extract_text(input_path, cache_path, workers=None):
+    """
+    Zwraca linie tekstu wszystkich stron pliku, korzystając z tekstu zapamiętanego dla niezmienionych stron.
+
+    Returns:
+        Krotka (lista list linii dla kolejnych stron, liczba stron odczytanych na nowo).
+    """
+    logging.getLogger('pypdf').setLevel(logging.ERROR)
+    reader = PdfReader(input_path)
+    cache = wczytaj_json(cache_path, {})
+    keys = [page_key(page) for page in reader.pages]
+    missing = [number for number, key in enumerate(keys) if key not in cache]
+
+    chunks = [missing[i:i + PAGES_PER_TASK] for i in range(0, len(missing), PAGES_PER_TASK)]
+    if len(chunks) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(extract_pages, [input_path] * len(chunks), chunks))
+    else:
+        results = [extract_pages(input_path, chunk) for chunk in chunks]
+    for result in results:
+        for number, lines in result:
+            cache[keys[number]] = lines
+
+    if missing:
+        # Zapamiętujemy tylko strony obecnego pliku, żeby pamięć nie rosła z każdym skanem
+        zapisz_json_atomowo(cache_path, {key: cache[key] for key in keys})
+    return [cache[key] for key in keys], len(missing)
+
+
+def to_sak_text(pages):
+    """
+    Składa linie stron w tekst w formacie SAK.txt (nagłówek kategorii, linie "numer tytuł", pusta linia między działami).
+
+    Returns:
+        Krotka (tekst, liczba pieśni, pominięte podpunkty, nagłówki bez odpowiednika w HEADINGS).
+    """
+    output, songs, subitems, unknown = [], 0, 0, []
+    current_heading, last_number = None, 0
+    for lines in pages:
+        for kind, line in lines:
+            line = normalize_line(line)
+            if kind == 'pozycja':
+                match = SONG_LINE.match(line)
+                if SUBITEM_LINE.match(line):
+                    subitems += 1
+                elif match and int(match.group(1)) > last_number:
+                    output.append(line)
+                    last_number = int(match.group(1))
+                    songs += 1
+                continue
+            if kind != 'naglowek':
+                continue
+            name = HEADINGS.get(line.replace(' ', '').upper())
+            if name is None:
+                name = line[:1].upper() + line[1:].lower()
+                unknown.append(line)
+            if name != current_heading:
+                if output:
+                    output.append('')
+                output.append(name)
+                current_heading = name
+    return '\n'.join(output) + '\n', songs, subitems, unknown
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Odczyt spisu pieśni SAK z przyciętego skanu do formatu SAK.txt.")
+    parser.add_argument('input', nargs='?', default=INPUT_PDF_FILENAME, help=f"plik PDF (domyślnie {INPUT_PDF_FILENAME})")
+    parser.add_argument('output', nargs='?', default=OUTPUT_FILENAME, help=f"plik wynikowy (domyślnie {OUTPUT_FILENAME})")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni; 1 - bez puli)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"BŁĄD: Plik wejściowy '{args.input}' nie został znaleziony. Uruchom najpierw ciachanie.py.")
+        return
+    project_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    cache_path = os.path.join(project_folder, FOLDER_MANIFESTOW, CACHE_FILENAME)
+
+    with odcinek('pdf: odczyt stron'):
+        pages, extracted = extract_text(args.input, cache_path, args.workers)
+    with odcinek('pdf: składanie spisu'):
+        text, songs, subitems, unknown = to_sak_text(pages)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+    print("\n--- Podsumowanie ---")
+    print(f"Strony: {len(pages)}, odczytane na nowo: {extracted}, z pamięci: {len(pages) - extracted}.")
+    print(f"Pieśni: {songs}, pominięte podpunkty części stałych: {subitems}.")
+    if unknown:
+        print(f"Nagłówki bez odpowiednika w HEADINGS ({len(unknown)}) zapisano w brzmieniu ze skanu: {', '.join(unknown)}")
+    print(f"Zapisano spis w pliku '{args.output}'.")
+
+
+if __name__ == "__main__":
+    uruchom_z_profilem(main)
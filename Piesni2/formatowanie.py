@@ -1,4 +1,5 @@
 import json
+import os
 import re
 
 # ==============================================================================
@@ -48,6 +49,13 @@ def format_song_text(text):
     # Połącz wszystkie fragmenty w jeden ciąg znaków
     return "".join(parts)
 
+def format_songs(data):
+    """Formatuje w miejscu tekst każdej pieśni z listy."""
+    for song in data:
+        if 'tekst' in song and isinstance(song['tekst'], str):
+            song['tekst'] = format_song_text(song['tekst'])
+    return data
+
 def main():
     """Główna funkcja skryptu formatującego."""
     print("--- Skrypt 1: Formatowanie tekstu pieśni ---")
@@ -63,9 +71,7 @@ def main():
         print(f"Wczytano {len(data)} pieśni z pliku '{INPUT_FILENAME}'. Rozpoczynam formatowanie...")
 
         # Przetwarzanie każdego obiektu (słownika) w liście
-        for song in data:
-            if 'tekst' in song and isinstance(song['tekst'], str):
-                song['tekst'] = format_song_text(song['tekst'])
+        format_songs(data)
 
         # Zapis zmodyfikowanych danych do pliku wyjściowego
         with open(OUTPUT_FILENAME, 'w', encoding=FILE_ENCODING) as f:
@@ -79,5 +85,4 @@ def main():
         print(f"Wystąpił nieoczekiwany błąd: {e}")
 
 if __name__ == "__main__":
-    import os
     main()
\ No newline at end of file
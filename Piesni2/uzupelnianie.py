@@ -1,6 +1,12 @@
 import json
 import re
 import os
+import sys
+
+# Wspólne moduły (kategorie.py, dopasowanie_tytulow.py) leżą w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from kategorie import wczytaj_kategorie
+from dopasowanie_tytulow import IndeksTytulow, zapisz_przeglad
 
 # ==============================================================================
 # STAŁE KONFIGURACYJNE
@@ -15,6 +21,9 @@ PIESNI_INPUT_FILENAME = 'piesni2.json'
 # Nazwa pliku wyjściowego, który zostanie utworzony
 PIESNI_OUTPUT_FILENAME = 'piesni3.json'
 
+# Lista niepewnych dopasowań tytułów do ręcznego przejrzenia
+PRZEGLAD_FILENAME = 'dopasowania_sak_do_przegladu.json'
+
 # Kodowanie znaków używane we wszystkich plikach
 FILE_ENCODING = 'utf-8'
 
@@ -22,69 +31,6 @@ FILE_ENCODING = 'utf-8'
 JSON_INDENTATION = 4
 
 
-def parse_kategorie(kategorie_content):
-    """
-    Przetwarza zawartość pliku z kategoriami na dwie struktury danych:
-    jedną dla kategorii z zakresem numerów i drugą dla kategorii z samą nazwą.
-    """
-    ranged_categories = []
-    named_categories = {}
-    
-    lines = kategorie_content.strip().split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Dopasowanie dla kategorii z zakresem numerów, np. "1-29 - Adwent {Adw}"
-        range_match = re.match(r'(\d+)-(\d+)\s*-\s*(.+?)\s*\{(.+?)\}', line)
-        # Dopasowanie dla kategorii bez zakresu, np. "Boże Narodzenie {B. N.}"
-        named_match = re.match(r'^([^{]+?)\s*\{(.+?)\}', line)
-        
-        if range_match:
-            start, end, name, abbr = range_match.groups()
-            ranged_categories.append({
-                'start': int(start),
-                'end': int(end),
-                'name': name.strip(),
-                'abbr': abbr.strip()
-            })
-        elif named_match:
-            name, abbr = named_match.groups()
-            name = name.strip()
-            # Upewniamy się, że to nie jest linia z zakresem, którą regex mógł błędnie zinterpretować
-            if not re.match(r'\d+-\d+', name):
-                named_categories[name] = {
-                    'name': name,
-                    'abbr': abbr.strip()
-                }
-            
-    return ranged_categories, named_categories
-
-def find_category_by_siedl(numer_siedl, ranged_categories):
-    """Znajduje kategorię na podstawie numeru "Siedl" w zdefiniowanych zakresach."""
-    try:
-        num = int(numer_siedl)
-        for cat in ranged_categories:
-            if cat['start'] <= num <= cat['end']:
-                return cat
-    except (ValueError, TypeError):
-        # Ignoruje błędy, jeśli numerSiedl jest pusty lub nie jest liczbą
-        return None
-    return None
-
-def find_category_by_name(name, ranged_categories, named_categories):
-    """Znajduje kategorię na podstawie jej pełnej nazwy."""
-    if name in named_categories:
-        return named_categories[name]
-    
-    for cat in ranged_categories:
-        if cat['name'] == name:
-            return cat
-            
-    return None
-
 def process_and_create_new_song_file():
     """Główna funkcja wczytująca pliki, przetwarzająca dane i tworząca nowy plik JSON."""
     
@@ -102,8 +48,7 @@ def process_and_create_new_song_file():
     try:
         with open(SAK_FILENAME, 'r', encoding=FILE_ENCODING) as f:
             sak_content = f.read()
-        with open(KATEGORIE_FILENAME, 'r', encoding=FILE_ENCODING) as f:
-            kategorie_content = f.read()
+        indeks_kategorii = wczytaj_kategorie(KATEGORIE_FILENAME)
         with open(PIESNI_INPUT_FILENAME, 'r', encoding=FILE_ENCODING) as f:
             piesni_data = json.load(f)
     except json.JSONDecodeError:
@@ -114,10 +59,9 @@ def process_and_create_new_song_file():
         return
 
     print("Przetwarzanie danych...")
-    ranged_categories, named_categories = parse_kategorie(kategorie_content)
-    
-    # Tworzenie mapy tytułów dla szybkiego wyszukiwania
-    title_map = {song['tytul'].strip(): i for i, song in enumerate(piesni_data)}
+    # Indeks tytułów: dokładny tytuł, klucz znormalizowany i trigramy dla literówek
+    title_index = IndeksTytulow([song['tytul'] for song in piesni_data])
+    review_list = []
     
     current_sak_category_name = None
     sak_lines = sak_content.strip().split('\n')
@@ -135,16 +79,16 @@ def process_and_create_new_song_file():
             numer_sak, tytul_sak = song_match.groups()
             tytul_sak = tytul_sak.strip()
 
-            if tytul_sak in title_map:
+            song_index, _, candidates = title_index.dopasuj(tytul_sak)
+            if song_index is not None:
                 # AKTUALIZACJA ISTNIEJĄCEJ PIEŚNI
-                song_index = title_map[tytul_sak]
                 song_obj = piesni_data[song_index]
                 
                 song_obj['numerSAK'] = numer_sak.strip()
                 
                 numer_siedl = song_obj.get('numerSiedl')
                 if numer_siedl:
-                    category_info = find_category_by_siedl(numer_siedl, ranged_categories)
+                    category_info = indeks_kategorii.po_numerze(numer_siedl)
                     if category_info:
                         song_obj['kategoria'] = category_info['name']
                         song_obj['kategoriaSkr'] = category_info['abbr']
@@ -162,19 +106,24 @@ def process_and_create_new_song_file():
                 }
                 
                 if current_sak_category_name:
-                    category_info = find_category_by_name(current_sak_category_name, ranged_categories, named_categories)
+                    category_info = indeks_kategorii.po_nazwie(current_sak_category_name)
                     if category_info:
                         new_song['kategoria'] = category_info['name']
                         new_song['kategoriaSkr'] = category_info['abbr']
                 
+                if candidates:
+                    review_list.append(title_index.wpis_przegladu(tytul_sak, f"SAK {numer_sak.strip()}", candidates))
                 piesni_data.append(new_song)
-                title_map[tytul_sak] = len(piesni_data) - 1
+                title_index.dodaj(tytul_sak, len(piesni_data) - 1, rozmyte=False)
                 songs_added += 1
         else:
             # To jest linia z nagłówkiem kategorii
             current_sak_category_name = line
 
     print(f"Zakończono przetwarzanie. Zaktualizowano {songs_updated} pieśni, dodano {songs_added} nowych.")
+    if review_list:
+        zapisz_przeglad(PRZEGLAD_FILENAME, review_list)
+        print(f"Niepewne dopasowania tytułów ({len(review_list)}) dodano jako nowe pieśni i zapisano do przejrzenia w '{PRZEGLAD_FILENAME}'.")
     print(f"Zapisywanie wyników do nowego pliku: '{PIESNI_OUTPUT_FILENAME}'...")
     
     try:
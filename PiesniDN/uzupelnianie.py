@@ -1,5 +1,10 @@
 import json
 import os
+import sys
+
+# Indeks dopasowania tytułów (dopasowanie_tytulow.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dopasowanie_tytulow import IndeksTytulow, zapisz_przeglad
 
 # ==============================================================================
 # KONFIGURACJA
@@ -15,6 +20,9 @@ PIESNI_INPUT_FILENAME = 'piesni.json'
 # Nazwa pliku wyjściowego, który zostanie utworzony po przetworzeniu
 PIESNI_OUTPUT_FILENAME = 'piesni_zaktualizowany.json'
 
+# Lista niepewnych dopasowań tytułów do ręcznego przejrzenia
+PRZEGLAD_FILENAME = 'dopasowania_dn_do_przegladu.json'
+
 # Kodowanie znaków używane we wszystkich plikach
 FILE_ENCODING = 'utf-8'
 
@@ -22,6 +30,71 @@ FILE_ENCODING = 'utf-8'
 JSON_INDENTATION = 4
 
 
+def merge_dn_numbers(piesni_data, dn_data):
+    """
+    Dopisuje numery DN do pieśni z bazy (w miejscu), a pieśni, których nie udało się
+    dopasować, dodaje jako nowe wpisy. Istniejący, inny numer DN nie jest nadpisywany: taki wpis DN
+    jest dodawany jako osobna pieśń i trafia na listę przeglądu jako konflikt.
+
+    Returns:
+        Krotka (liczba zaktualizowanych, liczba dodanych, lista niepewnych dopasowań do przeglądu).
+    """
+    # Indeks tytułów dla optymalizacji wyszukiwania.
+    # Tytuły są dopasowywane dokładnie, po kluczu bez interpunkcji i znaków diakrytycznych,
+    # a literówki przez indeks trigramów; pozycją jest indeks pieśni w liście piesni_data.
+    # Pieśni dodane w tym przebiegu są dopasowywane tylko dokładnie lub po kluczu (rozmyte=False).
+    title_index = IndeksTytulow([song['tytul'] for song in piesni_data])
+    review_list = []
+    
+    # Liczniki do podsumowania operacji
+    updated_count = 0
+    added_count = 0
+
+    # Iteracja przez dane z DN.json i aktualizacja bazy pieśni
+    for dn_song in dn_data:
+        tytul = dn_song.get('tytul', '').strip()
+        numer_dn = dn_song.get('numerDN', '')
+
+        if not tytul:
+            continue  # Pomiń wpisy bez tytułu
+
+        # Sprawdzenie, czy pieśń o danym tytule już istnieje w bazie
+        song_index, _, candidates = title_index.dopasuj(tytul)
+        conflict = None
+        if song_index is not None:
+            stored_dn = piesni_data[song_index].get('numerDN', '')
+            if not stored_dn or stored_dn == numer_dn:
+                # AKTUALIZACJA: Pieśń istnieje, więc aktualizujemy jej numerDN
+                piesni_data[song_index]['numerDN'] = numer_dn
+                updated_count += 1
+                continue
+            # KONFLIKT: Pieśń ma już inny numer DN - nie nadpisujemy go
+            conflict = f"pieśń '{piesni_data[song_index]['tytul']}' ma już numer DN {stored_dn}"
+            print(f"Ostrzeżenie: DN {numer_dn} '{tytul}': {conflict} - dodano jako osobną pieśń.")
+
+        # DODAWANIE: Pieśni nie ma w bazie (albo ma inny numer DN), więc tworzymy nowy obiekt
+        new_song = {
+            "tytul": tytul,
+            "tekst": "",
+            "numerSiedl": "",
+            "numerSAK": "",
+            "numerDN": numer_dn,
+            "kategoria": "",
+            "kategoriaSkr": ""
+        }
+        if conflict:
+            review_list.append(dict(title_index.wpis_przegladu(tytul, f"DN {numer_dn}", [(song_index, 1.0)]), konflikt=conflict))
+        elif candidates:
+            # Niepewne dopasowanie - pieśń jest dodawana, ale trafia na listę do przejrzenia
+            review_list.append(title_index.wpis_przegladu(tytul, f"DN {numer_dn}", candidates))
+        piesni_data.append(new_song)
+        if not conflict:
+            title_index.dodaj(tytul, len(piesni_data) - 1, rozmyte=False)
+        added_count += 1
+
+    return updated_count, added_count, review_list
+
+
 def update_songs_database():
     """
     Główna funkcja skryptu. Wczytuje dane z plików DN.json i piesni.json,
@@ -54,47 +127,20 @@ def update_songs_database():
         print(f"BŁĄD: Wystąpił problem podczas wczytywania plików: {e}")
         return
 
-    # --- Krok 3: Stworzenie mapy tytułów dla optymalizacji wyszukiwania ---
-    # Kluczem jest tytuł, a wartością indeks pieśni w liście piesni_data.
-    title_to_index_map = {song['tytul'].strip(): i for i, song in enumerate(piesni_data)}
-    
-    # Liczniki do podsumowania operacji
-    updated_count = 0
-    added_count = 0
-
-    # --- Krok 4: Iteracja przez dane z DN.json i aktualizacja bazy pieśni ---
+    # --- Krok 3 i 4: Dopasowanie tytułów z DN.json i aktualizacja bazy pieśni ---
     print("Przetwarzanie pieśni i aktualizacja danych...")
-    for dn_song in dn_data:
-        tytul = dn_song.get('tytul', '').strip()
-        numer_dn = dn_song.get('numerDN', '')
+    updated_count, added_count, review_list = merge_dn_numbers(piesni_data, dn_data)
 
-        if not tytul:
-            continue  # Pomiń wpisy bez tytułu
-
-        # Sprawdzenie, czy pieśń o danym tytule już istnieje w bazie
-        if tytul in title_to_index_map:
-            # AKTUALIZACJA: Pieśń istnieje, więc aktualizujemy jej numerDN
-            song_index = title_to_index_map[tytul]
-            piesni_data[song_index]['numerDN'] = numer_dn
-            updated_count += 1
-        else:
-            # DODAWANIE: Pieśni nie ma w bazie, więc tworzymy nowy obiekt
-            new_song = {
-                "tytul": tytul,
-                "tekst": "",
-                "numerSiedl": "",
-                "numerSAK": "",
-                "numerDN": numer_dn,
-                "kategoria": "",
-                "kategoriaSkr": ""
-            }
-            piesni_data.append(new_song)
-            added_count += 1
-            
     # --- Krok 5: Zapisanie zaktualizowanych danych do nowego pliku ---
     print("\nZakończono przetwarzanie. Podsumowanie:")
     print(f" - Zaktualizowano numerDN dla {updated_count} istniejących pieśni.")
     print(f" - Dodano {added_count} nowych pieśni do bazy.")
+    conflicts = sum(1 for wpis in review_list if 'konflikt' in wpis)
+    if conflicts:
+        print(f" - Konflikty numerów DN (zachowano istniejący numer, wpis DN dodano osobno): {conflicts}.")
+    if review_list:
+        zapisz_przeglad(PRZEGLAD_FILENAME, review_list)
+        print(f" - Niepewne dopasowania tytułów ({len(review_list)}) zapisano do przejrzenia w '{PRZEGLAD_FILENAME}'.")
     
     try:
         with open(PIESNI_OUTPUT_FILENAME, 'w', encoding=FILE_ENCODING) as f:
@@ -1,56 +1,23 @@
 import json
-import re
 import os
+import sys
 
-def parse_categories(file_path):
-    """
-    Parsuje plik Kategorie.txt, aby wyodrębnić zakresy numerów i odpowiadające im kategorie.
-
-    Args:
-        file_path (str): Ścieżka do pliku Kategorie.txt.
-
-    Returns:
-        list: Lista krotek, gdzie każda krotka zawiera (start_num, end_num, category, category_short).
-    """
-    categories = []
-    # Wyrażenie regularne do dopasowania linii z zakresem numerów, nazwą kategorii i skrótem
-    pattern = re.compile(r'(\d+)\s*-\s*(\d+)\s*-\s*([^\{]+)\s*\{([^\}]+)\}')
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                match = pattern.match(line.strip())
-                if match:
-                    start, end, cat, cat_short = match.groups()
-                    categories.append((int(start), int(end), cat.strip(), cat_short.strip()))
-    except FileNotFoundError:
-        print(f"Błąd: Plik '{file_path}' nie został znaleziony.")
-        return None
-    return categories
-
-def find_category(song_number, categories):
-    """
-    Znajduje kategorię dla danego numeru pieśni na podstawie listy kategorii.
-
-    Args:
-        song_number (int): Numer pieśni do sklasyfikowania.
-        categories (list): Lista kategorii sparsowana z pliku.
-
-    Returns:
-        tuple: Krotka (category, category_short) lub (None, None), jeśli nie znaleziono dopasowania.
-    """
-    for start, end, cat, cat_short in categories:
-        if start <= song_number <= end:
-            return cat, cat_short
-    return None, None
+# Wspólny indeks kategorii (kategorie.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from kategorie import wczytaj_kategorie
 
 def update_songs_categories(input_json_path, categories_txt_path, output_json_path):
     """
     Czyta plik JSON z pieśniami, aktualizuje puste kategorie na podstawie numeru Siedleckiego
     i zapisuje wyniki do nowego pliku JSON.
     """
-    categories_map = parse_categories(categories_txt_path)
-    if categories_map is None:
+    try:
+        categories_index = wczytaj_kategorie(categories_txt_path)
+    except FileNotFoundError:
+        print(f"Błąd: Plik '{categories_txt_path}' nie został znaleziony.")
+        return
+    except ValueError as e:
+        print(f"Błąd: {e}")
         return
 
     try:
@@ -62,33 +29,21 @@ def update_songs_categories(input_json_path, categories_txt_path, output_json_pa
     except json.JSONDecodeError:
         print(f"Błąd: Plik '{input_json_path}' nie jest prawidłowym plikiem JSON.")
         return
-        
-    updated_songs = []
-    uncategorized_count = 0
-
-    for song in songs:
-        # Sprawdzamy, czy kategoria jest pusta i czy numerSiedl istnieje i nie jest pusty
-        if not song.get('kategoria') and song.get('numerSiedl'):
-            try:
-                song_number = int(song['numerSiedl'])
-                category, category_short = find_category(song_number, categories_map)
-                
-                if category and category_short:
-                    song['kategoria'] = category
-                    song['kategoriaSkr'] = category_short
-                    print(f"Zaktualizowano pieśń nr {song_number} ('{song['tytul']}'): Kategoria -> {category}")
-                else:
-                    # Jeśli nie znaleziono kategorii, pozostawiamy puste i informujemy
-                    uncategorized_count += 1
-                    print(f"Ostrzeżenie: Nie znaleziono kategorii dla pieśni nr {song_number} ('{song['tytul']}'). Pozostawiono bez zmian.")
 
-            except (ValueError, TypeError):
-                # Obsługa przypadku, gdy numerSiedl nie jest liczbą
-                uncategorized_count += 1
-                print(f"Ostrzeżenie: Nieprawidłowy numerSiedl ('{song['numerSiedl']}') dla pieśni '{song['tytul']}'.")
+    # Kategorie przypisywane są jednym przejściem po pieśniach posortowanych po numerze Siedleckiego
+    invalid = []
+    updated, uncategorized = categories_index.kategoryzuj(songs, tylko_puste=True, niepoprawne=invalid)
+    for song in updated:
+        print(f"Zaktualizowano pieśń nr {int(song['numerSiedl'])} ('{song['tytul']}'): Kategoria -> {song['kategoria']}")
+    for song in uncategorized:
+        # Jeśli nie znaleziono kategorii, pozostawiamy puste i informujemy
+        print(f"Ostrzeżenie: Nie znaleziono kategorii dla pieśni nr {int(song['numerSiedl'])} ('{song['tytul']}'). Pozostawiono bez zmian.")
+    for song in invalid:
+        # Obsługa przypadku, gdy numerSiedl nie jest liczbą (np. '-5', '12a')
+        print(f"Ostrzeżenie: Nieprawidłowy numerSiedl ('{song['numerSiedl']}') dla pieśni '{song['tytul']}'.")
+    uncategorized_count = len(uncategorized) + len(invalid)
+    updated_songs = songs
 
-        updated_songs.append(song)
-        
     # Zapisywanie zaktualizowanej listy do nowego pliku JSON
     try:
         with open(output_json_path, 'w', encoding='utf-8') as f:
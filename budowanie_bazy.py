@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import hashlib
+import inspect
+import argparse
+import importlib.util
+from typing import Any, Callable, Dict, List, Optional
+
+from manifest import FOLDER_MANIFESTOW, oblicz_skrot
+from kategorie import wczytaj_kategorie
+from profilowanie import odcinek, uruchom_z_profilem
+
+# Potok budujący bazę pieśni w miejsce ręcznego uruchamiania kolejnych skryptów
+# (Piesni2/wzbogacanie.py -> formatowanie.py -> kategoria_siedl.py -> PiesniDN/uzupelnianie.py
+# -> PiesniPoprawa/aktualizuj_kategorie.py). Etapy przekazują sobie dane w pamięci, a wynik każdego
+# etapu jest zapamiętywany pod kluczem ze skrótów jego plików wejściowych, kodu i klucza etapu poprzedniego.
+# Przy kolejnym uruchomieniu potok wczytuje wynik ostatniego aktualnego etapu i wykonuje tylko etapy dalsze.
+# Kategorie są przypisywane w ostatnim etapie (dopasowanie tytułów od nich nie zależy), więc zmiana
+# Kategorie.txt powoduje ponowne wykonanie wyłącznie kategoryzacji.
+
+# --- Konfiguracja ---
+# Podfolder folderu manifestów z zapamiętanymi wynikami etapów
+FOLDER_PAMIECI = 'budowanie_bazy'
+
+# Domyślny plik wynikowy (ten sam, który tworzył aktualizuj_kategorie.py)
+PLIK_WYJSCIOWY = os.path.join('PiesniPoprawa', 'piesni1.json')
+
+# Niepewne dopasowania tytułów ze wszystkich etapów
+PLIK_PRZEGLADU = os.path.join('PiesniPoprawa', 'dopasowania_do_przegladu.json')
+
+KATALOG_GLOWNY = os.path.dirname(os.path.abspath(__file__))
+
+
+def _wczytaj_modul(sciezka_wzgledna: str, nazwa: str):
+    """Importuje skrypt po ścieżce (Piesni2 i PiesniDN mają moduły o tych samych nazwach)."""
+    spec = importlib.util.spec_from_file_location(nazwa, os.path.join(KATALOG_GLOWNY, sciezka_wzgledna))
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+
+def _wczytaj_json(sciezka: str):
+    """Wczytuje plik JSON."""
+    with open(sciezka, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# --- Etapy ---
+# Każdy etap dostaje stan poprzedniego etapu ({'piesni', 'sekcje_sak', 'przeglad'}) i słownik
+# ścieżek swoich plików wejściowych, a zwraca nowy stan. Stan musi dać się zapisać jako JSON.
+
+def etap_sak(stan: Optional[dict], wejscia: Dict[str, str]) -> dict:
+    """Numery SAK i nowe pieśni ze spisu SAK (jak Piesni2/wzbogacanie.py, bez kategorii)."""
+    wzbogacanie = _wczytaj_modul('Piesni2/wzbogacanie.py', 'piesni2_wzbogacanie')
+    piesni = _wczytaj_json(wejscia['Piesni2/piesni2.json'])
+    with open(wejscia['Piesni2/SAK.txt'], 'r', encoding='utf-8') as f:
+        tresc_sak = f.read()
+    zaktualizowane, dodane, przeglad, sekcje = wzbogacanie.enrich_songs(piesni, tresc_sak)
+    print(f"  SAK: zaktualizowano {zaktualizowane}, dodano {dodane} pieśni.")
+    return {'piesni': piesni, 'sekcje_sak': sekcje, 'przeglad': przeglad}
+
+
+def etap_formatowanie(stan: dict, wejscia: Dict[str, str]) -> dict:
+    """Podział tekstów na zwrotki i refreny (jak Piesni2/formatowanie.py)."""
+    formatowanie = _wczytaj_modul('Piesni2/formatowanie.py', 'piesni2_formatowanie')
+    formatowanie.format_songs(stan['piesni'])
+    return stan
+
+
+def etap_dn(stan: dict, wejscia: Dict[str, str]) -> dict:
+    """Numery DN i nowe pieśni z DN.json (jak PiesniDN/uzupelnianie.py)."""
+    uzupelnianie = _wczytaj_modul('PiesniDN/uzupelnianie.py', 'piesnidn_uzupelnianie')
+    zaktualizowane, dodane, przeglad = uzupelnianie.merge_dn_numbers(stan['piesni'], _wczytaj_json(wejscia['PiesniDN/DN.json']))
+    print(f"  DN: zaktualizowano {zaktualizowane}, dodano {dodane} pieśni.")
+    stan['przeglad'] += przeglad
+    return stan
+
+
+def etap_kategorie(stan: dict, wejscia: Dict[str, str]) -> dict:
+    """
+    Kategorie: nowe pieśni z SAK po nagłówku sekcji, wszystkie pieśni po numerze Siedleckiego
+    (jak kategoria_siedl.py), a na końcu puste kategorie z PiesniPoprawa/Kategorie.txt
+    (jak aktualizuj_kategorie.py).
+    """
+    piesni = stan['piesni']
+    indeks = wczytaj_kategorie(wejscia['Piesni2/Kategorie.txt'])
+    for pozycja, sekcja in stan['sekcje_sak']:
+        kategoria = indeks.po_nazwie(sekcja)
+        if kategoria:
+            piesni[pozycja]['kategoria'] = kategoria['name']
+            piesni[pozycja]['kategoriaSkr'] = kategoria['abbr']
+    zaktualizowane, _ = indeks.kategoryzuj(piesni)
+    uzupelnione, bez_kategorii = wczytaj_kategorie(wejscia['PiesniPoprawa/Kategorie.txt']).kategoryzuj(piesni, tylko_puste=True)
+    print(f"  Kategorie: po numerze {len(zaktualizowane)}, uzupełnione puste {len(uzupelnione)}, bez kategorii {len(bez_kategorii)}.")
+    return {'piesni': piesni, 'przeglad': stan['przeglad']}
+
+
+# Kolejność etapów, ich pliki wejściowe i pliki kodu (względem głównego folderu projektu).
+# Kod etapu to jego funkcja w tym pliku oraz wymienione moduły.
+ETAPY: List[Dict[str, Any]] = [
+    {'nazwa': 'sak', 'funkcja': etap_sak,
+     'wejscia': ['Piesni2/piesni2.json', 'Piesni2/SAK.txt'],
+     'kod': ['Piesni2/wzbogacanie.py', 'dopasowanie_tytulow.py']},
+    {'nazwa': 'formatowanie', 'funkcja': etap_formatowanie,
+     'wejscia': [],
+     'kod': ['Piesni2/formatowanie.py']},
+    {'nazwa': 'dn', 'funkcja': etap_dn,
+     'wejscia': ['PiesniDN/DN.json'],
+     'kod': ['PiesniDN/uzupelnianie.py', 'dopasowanie_tytulow.py']},
+    {'nazwa': 'kategorie', 'funkcja': etap_kategorie,
+     'wejscia': ['Piesni2/Kategorie.txt', 'PiesniPoprawa/Kategorie.txt'],
+     'kod': ['kategorie.py']},
+]
+
+
+def klucz_etapu(etap: Dict[str, Any], klucz_poprzedni: str) -> str:
+    """
+    Liczy klucz wyniku etapu: SHA-256 z klucza etapu poprzedniego, kodu funkcji etapu,
+    skrótów plików kodu i skrótów plików wejściowych. Klucz poprzedniego etapu przenosi
+    zmiany w górę potoku na wszystkie etapy dalsze.
+    """
+    skrot = hashlib.sha256()
+    skrot.update(klucz_poprzedni.encode('utf-8'))
+    skrot.update(inspect.getsource(etap['funkcja']).encode('utf-8'))
+    for sciezka in etap['kod'] + etap['wejscia']:
+        skrot.update(f"\x1f{sciezka}\x1f{oblicz_skrot(os.path.join(KATALOG_GLOWNY, sciezka))}".encode('utf-8'))
+    return skrot.hexdigest()
+
+
+def _plik_pamieci(folder: str, etap: Dict[str, Any]) -> str:
+    """Ścieżka pliku z zapamiętanym wynikiem etapu."""
+    return os.path.join(folder, f"{etap['nazwa']}.json")
+
+
+@odcinek('budowanie bazy: odczyt pamięci')
+def wczytaj_z_pamieci(folder: str, etap: Dict[str, Any], klucz: str) -> Optional[dict]:
+    """Zwraca zapamiętany stan po etapie, jeśli zapisano go pod tym samym kluczem, w przeciwnym razie None."""
+    try:
+        zapis = _wczytaj_json(_plik_pamieci(folder, etap))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return zapis['stan'] if zapis.get('klucz') == klucz else None
+
+
+@odcinek('budowanie bazy: zapis pamięci')
+def zapisz_w_pamieci(folder: str, etap: Dict[str, Any], klucz: str, stan: dict):
+    """Zapisuje stan po etapie (przez plik tymczasowy, żeby przerwany zapis nie zostawił uszkodzonego wpisu)."""
+    os.makedirs(folder, exist_ok=True)
+    sciezka = _plik_pamieci(folder, etap)
+    with open(sciezka + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'klucz': klucz, 'stan': stan}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(sciezka + '.tmp', sciezka)
+
+
+def zbuduj(folder_pamieci: str, od_nowa: bool = False, wypisz: Callable[[str], None] = print) -> dict:
+    """
+    Uruchamia potok. Najpierw liczy klucze wszystkich etapów (same skróty plików), potem szuka
+    od końca ostatniego etapu z aktualnym wynikiem w pamięci, wczytuje tylko ten jeden wynik
+    i wykonuje pozostałe etapy.
+
+    Returns:
+        Stan po ostatnim etapie ({'piesni', 'przeglad'}).
+    """
+    klucze, klucz = [], ''
+    with odcinek('budowanie bazy: klucze etapów'):
+        for etap in ETAPY:
+            klucz = klucz_etapu(etap, klucz)
+            klucze.append(klucz)
+
+    stan, start = None, 0
+    if not od_nowa:
+        for i in range(len(ETAPY) - 1, -1, -1):
+            stan = wczytaj_z_pamieci(folder_pamieci, ETAPY[i], klucze[i])
+            if stan is not None:
+                start = i + 1
+                break
+    for etap in ETAPY[:start]:
+        wypisz(f"Etap '{etap['nazwa']}': aktualny, pominięty.")
+
+    for etap, klucz in zip(ETAPY[start:], klucze[start:]):
+        wejscia = {sciezka: os.path.join(KATALOG_GLOWNY, sciezka) for sciezka in etap['wejscia']}
+        poczatek = time.perf_counter()
+        with odcinek(f"etap: {etap['nazwa']}"):
+            stan = etap['funkcja'](stan, wejscia)
+        wypisz(f"Etap '{etap['nazwa']}': wykonany w {time.perf_counter() - poczatek:.2f} s.")
+        zapisz_w_pamieci(folder_pamieci, etap, klucz, stan)
+    return stan
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Przyrostowe budowanie bazy pieśni z SAK, DN i Kategorie.txt.")
+    parser.add_argument('--wyjscie', default=PLIK_WYJSCIOWY, help="plik wynikowy (względem głównego folderu projektu)")
+    parser.add_argument('--od-nowa', action='store_true', help="wykonaj wszystkie etapy, ignorując zapamiętane wyniki")
+    args = parser.parse_args()
+
+    folder_pamieci = os.path.join(KATALOG_GLOWNY, FOLDER_MANIFESTOW, FOLDER_PAMIECI)
+    for etap in ETAPY:
+        for sciezka in etap['wejscia'] + etap['kod']:
+            if not os.path.exists(os.path.join(KATALOG_GLOWNY, sciezka)):
+                print(f"BŁĄD: Nie znaleziono pliku '{sciezka}' (etap '{etap['nazwa']}').")
+                return
+
+    try:
+        stan = zbuduj(folder_pamieci, args.od_nowa)
+    except (OSError, ValueError) as e:
+        print(f"BŁĄD: {e}")
+        return
+
+    sciezka_wyjscia = os.path.join(KATALOG_GLOWNY, args.wyjscie)
+    with open(sciezka_wyjscia, 'w', encoding='utf-8') as f:
+        json.dump(stan['piesni'], f, ensure_ascii=False, indent=4)
+    print("\n--- Podsumowanie ---")
+    print(f"Zapisano {len(stan['piesni'])} pieśni do '{args.wyjscie}'.")
+    if stan['przeglad']:
+        with open(os.path.join(KATALOG_GLOWNY, PLIK_PRZEGLADU), 'w', encoding='utf-8') as f:
+            json.dump(stan['przeglad'], f, ensure_ascii=False, indent=4)
+        print(f"Niepewne dopasowania tytułów ({len(stan['przeglad'])}) zapisano do przejrzenia w '{PLIK_PRZEGLADU}'.")
+
+
+if __name__ == '__main__':
+    uruchom_z_profilem(main)
@@ -3,6 +3,7 @@
 
 import os
 import re
+import sys
 import json
 import requests
 from bs4 import BeautifulSoup
@@ -10,6 +11,10 @@ from urllib.parse import urljoin
 from time import sleep
 from typing import List, Tuple, Set
 
+# Pomiary (profilowanie.py) leżą w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from profilowanie import odcinek, uruchom_z_profilem
+
 # --- Konfiguracja Globalna ---
 BASE_URL = "https://liturgia.wiara.pl"
 NAVIGATOR_URL = urljoin(BASE_URL, "/Czytania_mszalne/Nawigator")
@@ -39,9 +44,11 @@ def discover_base_links(session: requests.Session) -> List[Tuple[str, str]]:
         print(f"\rSkanowanie: {current_url.replace(BASE_URL, '')}", end="", flush=True)
 
         try:
-            response = session.get(current_url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            with odcinek('scraper: pobieranie'):
+                response = session.get(current_url, timeout=15)
+                response.raise_for_status()
+            with odcinek('scraper: parsowanie HTML'):
+                soup = BeautifulSoup(response.text, "html.parser")
         except requests.RequestException: continue
 
         nav_containers = soup.find_all("div", class_=["menu_vert_open_w", "dirstree", "doc_content"])
@@ -67,9 +74,11 @@ def expand_and_filter_subpages(session: requests.Session, base_links: List[Tuple
         print(f"\rAnalizowanie linku {i}/{len(base_links)}: {url.replace(BASE_URL, '')}", end="", flush=True)
         try:
             sleep(0.1)
-            response = session.get(url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            with odcinek('scraper: pobieranie'):
+                response = session.get(url, timeout=15)
+                response.raise_for_status()
+            with odcinek('scraper: parsowanie HTML'):
+                soup = BeautifulSoup(response.text, "html.parser")
             
             pager = soup.find("div", class_="pgr")
             if pager:
@@ -116,4 +125,4 @@ def main():
         print(f"Pomyślnie zapisano {len(jobs_to_process)} linków do pliku: {JOBS_FILE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    uruchom_z_profilem(main)
\ No newline at end of file
@@ -10,6 +10,7 @@ Cel:
 """
 import os
 import re
+import sys
 import json
 import requests
 from bs4 import BeautifulSoup
@@ -18,6 +19,10 @@ from typing import List, Dict, Optional, Tuple
 import random
 from collections import defaultdict
 
+# Pomiary (profilowanie.py) leżą w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from profilowanie import licz, odcinek, uruchom_z_profilem
+
 # --- Konfiguracja Globalna ---
 BASE_URL = "https://liturgia.wiara.pl"
 ROOT_DIR = "Lekcjonarz_JSON_Finalny"
@@ -207,9 +212,12 @@ def finalize_readings(readings: List[Dict]) -> List[Dict]:
 def process_page(session: requests.Session, page_url: str) -> Optional[Dict]:
     """Pobiera i parsuje dane, wybierając odpowiednią, stabilną metodę."""
     try:
-        response = session.get(page_url, timeout=20)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        with odcinek('scraper: pobieranie'):
+            response = session.get(page_url, timeout=20)
+            response.raise_for_status()
+        licz('scraper: pobrane bajty', len(response.content))
+        with odcinek('scraper: parsowanie HTML'):
+            soup = BeautifulSoup(response.text, "html.parser")
     except requests.RequestException as e: return {"error": str(e)}
 
     article_container = soup.select_one("div.cf.txt")
@@ -261,7 +269,7 @@ def main():
                     dir_path = os.path.join(ROOT_DIR, sanitize_name(folder_name))
                     os.makedirs(dir_path, exist_ok=True)
                     filepath = os.path.join(dir_path, sanitize_name(day_data['page_title']) + ".json")
-                    with open(filepath, "w", encoding="utf-8") as f:
+                    with open(filepath, "w", encoding="utf-8") as f, odcinek('zapis JSON'):
                         json.dump({"url": page_url, "tytul_dnia": day_data['page_title'], "czytania": day_data['readings']}, f, ensure_ascii=False, indent=2)
                 else:
                     error_msg = result.get('error', 'Brak danych') if result else "Brak danych"
@@ -284,4 +292,4 @@ def main():
     print(f"Wszystkie dane zostały zapisane w katalogu: {ROOT_DIR}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    uruchom_z_profilem(main)
\ No newline at end of file
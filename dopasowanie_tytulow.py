@@ -0,0 +1,206 @@
+import re
+import json
+import argparse
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+# Indeks dopasowania tytułów pieśni przy łączeniu śpiewników (SAK, DN) z bazą pieśni.
+# Tytuł jest najpierw szukany dokładnie, potem po kluczu znormalizowanym (małe litery, bez znaków
+# diakrytycznych i interpunkcji), a na końcu przez odwrócony indeks trigramów znakowych: tylko tytuły
+# dzielące z szukanym odpowiednio dużo trigramów są porównywane odległością edycyjną, więc żaden tytuł
+# nie jest zestawiany z wszystkimi pozostałymi. Dopasowania poniżej progu pewności trafiają na listę do przeglądu.
+# Tytuły różniące się tylko końcowym oznaczeniem wariantu ('Aklamacja I'/'Aklamacja II', 'Litania Loretańska B'/'... C')
+# nigdy nie są łączone w przybliżeniu, a tytuły dodane w trakcie łączenia (dodaj(..., rozmyte=False)) są dopasowywane
+# tylko dokładnie lub po kluczu - inaczej kolejne wpisy tego samego śpiewnika zlewałyby się w jedną pieśń.
+
+# --- Konfiguracja ---
+# Podobieństwo (1 - odległość edycyjna / długość dłuższego klucza), od którego dopasowanie jest przyjmowane automatycznie
+PROG_PEWNY = 0.92
+
+# Podobieństwo, od którego dopasowanie trafia na listę do przeglądu (poniżej - tytuł uznawany za nowy)
+PROG_DO_PRZEGLADU = 0.75
+
+# Minimalna przewaga najlepszego kandydata nad drugim, żeby dopasowanie nie było niejednoznaczne
+MIN_PRZEWAGA = 0.05
+
+# Minimalny udział wspólnych trigramów (współczynnik Dice'a), od którego tytuł jest w ogóle kandydatem
+MIN_PODOBIENSTWO_TRIGRAMOW = 0.4
+
+# Ilu najlepszych kandydatów z indeksu trigramów porównywać odległością edycyjną
+MAKS_KANDYDATOW = 10
+
+_ZNAKI_BEZ_ROZKLADU = str.maketrans({'ł': 'l', 'Ł': 'l'})
+_NIE_ALFANUMERYCZNE = re.compile(r'[^0-9a-z]+')
+_WARIANT = re.compile(r'(?:^| )([ivx]+|[a-z]|[0-9]+)$')
+
+
+def normalizuj_tytul(tytul: str) -> str:
+    """Zwraca klucz tytułu: małe litery bez znaków diakrytycznych, słowa oddzielone pojedynczą spacją."""
+    tekst = unicodedata.normalize('NFKD', tytul.translate(_ZNAKI_BEZ_ROZKLADU).lower())
+    tekst = ''.join(z for z in tekst if not unicodedata.combining(z))
+    return _NIE_ALFANUMERYCZNE.sub(' ', tekst).strip()
+
+
+def wariant(klucz: str) -> str:
+    """Końcowe oznaczenie wariantu klucza tytułu (liczba rzymska, pojedyncza litera lub liczba) albo ''."""
+    dopasowanie = _WARIANT.search(klucz)
+    return dopasowanie.group(1) if dopasowanie else ''
+
+
+def trigramy(klucz: str) -> Set[str]:
+    """Zbiór trigramów znakowych klucza (z dopełnieniem spacjami na brzegach)."""
+    tekst = f"  {klucz} "
+    return {tekst[i:i + 3] for i in range(len(tekst) - 2)}
+
+
+def odleglosc_edycyjna(a: str, b: str, limit: int) -> int:
+    """
+    Odległość Levenshteina między napisami. Obliczenia są przerywane, gdy odległość na pewno
+    przekroczy limit - wtedy zwracane jest limit + 1.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) < len(b):
+        a, b = b, a
+    poprzedni = list(range(len(b) + 1))
+    for i, znak_a in enumerate(a, 1):
+        biezacy = [i]
+        for j, znak_b in enumerate(b, 1):
+            biezacy.append(min(poprzedni[j] + 1, biezacy[j - 1] + 1, poprzedni[j - 1] + (znak_a != znak_b)))
+        if min(biezacy) > limit:
+            return limit + 1
+        poprzedni = biezacy
+    return poprzedni[-1]
+
+
+def podobienstwo(a: str, b: str, minimum: float = 0.0) -> float:
+    """Podobieństwo kluczy w skali 0-1; wartości poniżej minimum są zwracane jako 0."""
+    dlugosc = max(len(a), len(b))
+    if not dlugosc:
+        return 1.0
+    limit = int(dlugosc * (1 - minimum))
+    odleglosc = odleglosc_edycyjna(a, b, limit)
+    return 0.0 if odleglosc > limit else 1 - odleglosc / dlugosc
+
+
+class IndeksTytulow:
+    """
+    Indeks tytułów bazy pieśni. Tytuły są identyfikowane pozycją na liście, z której je dodano,
+    tak jak w dotychczasowych mapach {tytul: indeks} w skryptach łączących śpiewniki.
+    """
+
+    def __init__(self, tytuly: List[str] = ()):
+        self.dokladne: Dict[str, int] = {}
+        self.po_kluczu: Dict[str, List[int]] = {}
+        self.klucze: Dict[int, str] = {}
+        self.tytuly: Dict[int, str] = {}
+        self.liczba_trigramow: Dict[int, int] = {}
+        self.indeks_trigramow: Dict[str, List[int]] = {}
+        for pozycja, tytul in enumerate(tytuly):
+            self.dodaj(tytul, pozycja)
+
+    def dodaj(self, tytul: str, pozycja: int, rozmyte: bool = True):
+        """
+        Dodaje tytuł pod podaną pozycją. Tytuł nowo utworzonej pieśni dodawany jest z rozmyte=False:
+        można go wtedy znaleźć dokładnie lub po kluczu, ale nie przez indeks trigramów.
+        """
+        tytul = tytul.strip()
+        klucz = normalizuj_tytul(tytul)
+        self.dokladne[tytul] = pozycja
+        self.po_kluczu.setdefault(klucz, []).append(pozycja)
+        self.klucze[pozycja] = klucz
+        self.tytuly[pozycja] = tytul
+        if not rozmyte:
+            return
+        trigramy_klucza = trigramy(klucz)
+        self.liczba_trigramow[pozycja] = len(trigramy_klucza)
+        for trigram in trigramy_klucza:
+            self.indeks_trigramow.setdefault(trigram, []).append(pozycja)
+
+    def kandydaci(self, klucz: str) -> List[int]:
+        """Pozycje tytułów dzielących z kluczem dość trigramów, od najbardziej podobnych."""
+        szukane = trigramy(klucz)
+        wspolne = Counter()
+        for trigram in szukane:
+            wspolne.update(self.indeks_trigramow.get(trigram, ()))
+        oceny = []
+        for pozycja, liczba in wspolne.items():
+            dice = 2 * liczba / (len(szukane) + self.liczba_trigramow[pozycja])
+            if dice >= MIN_PODOBIENSTWO_TRIGRAMOW:
+                oceny.append((dice, pozycja))
+        oceny.sort(reverse=True)
+        return [pozycja for _, pozycja in oceny[:MAKS_KANDYDATOW]]
+
+    def dopasuj(self, tytul: str) -> Tuple[Optional[int], float, List[Tuple[int, float]]]:
+        """
+        Szuka tytułu w indeksie.
+
+        Returns:
+            Krotka (pozycja, pewność, kandydaci). Pozycja jest ustawiona tylko dla dopasowania pewnego;
+            dla dopasowań niepewnych lub niejednoznacznych jest None, a kandydaci [(pozycja, podobieństwo)]
+            nadają się do listy przeglądu. Pusta lista kandydatów oznacza nowy tytuł.
+        """
+        tytul = tytul.strip()
+        if tytul in self.dokladne:
+            return self.dokladne[tytul], 1.0, [(self.dokladne[tytul], 1.0)]
+
+        klucz = normalizuj_tytul(tytul)
+        pozycje = self.po_kluczu.get(klucz, [])
+        if len(pozycje) == 1:
+            return pozycje[0], 1.0, [(pozycje[0], 1.0)]
+        if len(pozycje) > 1:
+            return None, 1.0, [(p, 1.0) for p in pozycje]
+
+        oceny = []
+        for pozycja in self.kandydaci(klucz):
+            if wariant(self.klucze[pozycja]) != wariant(klucz):
+                continue
+            wynik = podobienstwo(klucz, self.klucze[pozycja], PROG_DO_PRZEGLADU)
+            if wynik >= PROG_DO_PRZEGLADU:
+                oceny.append((pozycja, wynik))
+        if not oceny:
+            return None, 0.0, []
+        oceny.sort(key=lambda para: para[1], reverse=True)
+        najlepszy, pewnosc = oceny[0]
+        jednoznaczny = len(oceny) == 1 or pewnosc - oceny[1][1] >= MIN_PRZEWAGA
+        if pewnosc >= PROG_PEWNY and jednoznaczny:
+            return najlepszy, pewnosc, oceny
+        return None, pewnosc, oceny
+
+    def wpis_przegladu(self, tytul: str, zrodlo: str, kandydaci: List[Tuple[int, float]]) -> dict:
+        """Tworzy wpis listy przeglądu dla tytułu, którego nie dopasowano automatycznie."""
+        return {
+            'tytul': tytul.strip(),
+            'zrodlo': zrodlo,
+            'kandydaci': [{'tytul': self.tytuly[p], 'podobienstwo': round(w, 3)} for p, w in kandydaci],
+        }
+
+
+def zapisz_przeglad(sciezka: str, wpisy: List[dict]):
+    """Zapisuje listę dopasowań do ręcznego przejrzenia."""
+    with open(sciezka, 'w', encoding='utf-8') as f:
+        json.dump(wpisy, f, ensure_ascii=False, indent=4)
+
+
+def main():
+    """Dopasowuje podane tytuły do tytułów z pliku JSON z pieśniami i wypisuje wynik."""
+    parser = argparse.ArgumentParser(description="Dopasowanie tytułów pieśni do bazy pieśni.")
+    parser.add_argument('plik', help="plik JSON z listą pieśni (pole 'tytul')")
+    parser.add_argument('tytuly', nargs='+', help="tytuły do dopasowania")
+    args = parser.parse_args()
+
+    with open(args.plik, 'r', encoding='utf-8') as f:
+        indeks = IndeksTytulow([piesn.get('tytul', '') for piesn in json.load(f)])
+    for tytul in args.tytuly:
+        pozycja, pewnosc, kandydaci = indeks.dopasuj(tytul)
+        if pozycja is not None:
+            print(f"'{tytul}' -> '{indeks.tytuly[pozycja]}' (pewność {pewnosc:.2f})")
+        elif kandydaci:
+            print(f"'{tytul}' -> do przeglądu: {[(indeks.tytuly[p], round(w, 2)) for p, w in kandydaci]}")
+        else:
+            print(f"'{tytul}' -> brak dopasowania (nowa pieśń)")
+
+
+if __name__ == '__main__':
+    main()
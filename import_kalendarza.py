@@ -0,0 +1,262 @@
+import os
+import re
+import glob
+import argparse
+import datetime
+import urllib.error
+import urllib.request
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from manifest import FOLDER_MANIFESTOW, wczytaj_json, zapisz_json_atomowo
+from rok_liturgiczny import FOLDER_KALENDARZA, PLIK_MAPY_NAZW, WSPOMNIENIE_SOBOTNIE, cykle
+
+# Import kalendarzy liturgicznych z plików ICS gcatholic.org do Kalendarz/<rok>.json - odpowiednik
+# parseIcsToJsonAdvanced z PobieranieKalendarza/PobierzKalendarz.kt, ale bez wczytywania całego pliku do pamięci
+# i dla wielu lat naraz. Pliki są czytane strumieniowo, wiersz po wierszu, z rozwijaniem wierszy złamanych
+# (RFC 5545: wiersz zaczynający się spacją lub tabulatorem jest ciągiem poprzedniego). Każde zdarzenie trafia
+# do kalendarza roku ze swojej daty, więc jeden plik może obejmować kilka lat, a kilka plików - jeden rok.
+# Nazwa, kolor, rodzaj obchodu i rok A/B/C, I/II są ustalane tak samo jak w narzędziu Kotlin, łącznie z jego
+# osobliwościami (patrz TRYB_KOTLIN), więc wynik jest taki sam jak pliki, które ono zapisuje.
+
+# --- Konfiguracja ---
+# Adres pliku ICS danego roku (jak baseUrl w PobierzKalendarz.kt) i nazwa pliku w folderze pobranych
+ADRES_ICS = 'https://gcatholic.org/calendar/ics/{rok}-pl-PL.ics?v=3'
+NAZWA_PLIKU_ICS = '{rok}-pl-PL.ics'
+
+# Folder na pobrane pliki ICS (względem głównego folderu projektu)
+FOLDER_ICS = os.path.join(FOLDER_MANIFESTOW, 'ics')
+
+# Zgodność z narzędziem Kotlin: ciąg złamanego wiersza traci wszystkie początkowe białe znaki (trimStart),
+# a nazwa jest tłumaczona przed usunięciem ukośników ucieczki, więc nazwy z przecinkiem ('\,' w ICS) zostają
+# w brzmieniu gcatholic.org - tak jak w istniejących plikach kalendarza (zbuduj_plan w plan_dni.py tłumaczy
+# je przy wyszukiwaniu). False - ścisłe RFC 5545: usuwany jest jeden znak, a sekwencje ucieczki są rozwijane
+# przed tłumaczeniem.
+TRYB_KOTLIN = True
+
+# Kolory szat według ikon w SUMMARY (kolejność sprawdzania jak w parseColor)
+KOLORY = [('⚪', 'Biały'), ('🔴', 'Czerwony'), ('🟢', 'Zielony'), ('🟣', 'Fioletowy'), ('💗', 'Różowy'), ('🩷', 'Różowy')]
+
+# Kody rodzajów obchodów w nawiasach kwadratowych SUMMARY
+RODZAJE = {'U': 'Uroczystość', 'Ś': 'Święto', 'W': 'Wspomnienie obowiązkowe', 'w': 'Wspomnienie dowolne',
+           'w*': 'Wspomnienie dowolne'}
+# --- Koniec Konfiguracji ---
+
+_KOD_RODZAJU = re.compile(r'\[(.*?)\]')
+_KOD_Z_ODSTEPEM = re.compile(r'\[.*?\]\s*')
+_BIALE_ZNAKI = re.compile(r'\s+')
+_SEKWENCJE_UCIECZKI = re.compile(r'\\([\\;,nN])')
+_DATA_ICS = re.compile(r'[0-9]{8}')
+
+
+def wiersze_logiczne(wiersze: Iterable[str], tryb_kotlin: bool = TRYB_KOTLIN) -> Iterator[str]:
+    """
+    Rozwija wiersze złamane: zwraca kolejne wiersze logiczne, czytając wejście tylko o jeden wiersz naprzód.
+
+    Args:
+        wiersze (Iterable[str]): Wiersze pliku (z końcami wierszy lub bez).
+        tryb_kotlin (bool): Jak TRYB_KOTLIN - ciągiem są tylko wiersze zaczynające się spacją i tylko dla SUMMARY,
+            a z ciągu usuwane są wszystkie początkowe białe znaki.
+    """
+    biezacy = None
+    for wiersz in wiersze:
+        wiersz = wiersz.rstrip('\r\n')
+        if biezacy is not None:
+            if tryb_kotlin and wiersz.startswith(' ') and biezacy.startswith('SUMMARY:'):
+                biezacy += wiersz.lstrip()
+                continue
+            if not tryb_kotlin and wiersz[:1] in (' ', '\t'):
+                biezacy += wiersz[1:]
+                continue
+            yield biezacy
+        biezacy = wiersz
+    if biezacy is not None:
+        yield biezacy
+
+
+def zdarzenia(wiersze: Iterable[str], tryb_kotlin: bool = TRYB_KOTLIN) -> Iterator[Tuple[str, str]]:
+    """Pary (DTSTART w postaci RRRRMMDD, SUMMARY) kolejnych bloków VEVENT z niepustymi obydwoma polami."""
+    w_zdarzeniu, podsumowanie, poczatek = False, '', ''
+    for wiersz in wiersze_logiczne(wiersze, tryb_kotlin):
+        if wiersz == 'BEGIN:VEVENT':
+            w_zdarzeniu, podsumowanie, poczatek = True, '', ''
+        elif wiersz == 'END:VEVENT':
+            w_zdarzeniu = False
+            if poczatek and podsumowanie:
+                yield poczatek, podsumowanie
+        elif w_zdarzeniu:
+            if wiersz.startswith('DTSTART;VALUE=DATE:'):
+                poczatek = wiersz[len('DTSTART;VALUE=DATE:'):]
+            elif wiersz.startswith('SUMMARY:'):
+                podsumowanie = wiersz[len('SUMMARY:'):]
+
+
+def nazwa_obchodu(podsumowanie: str) -> str:
+    """Nazwa z SUMMARY bez kodu rodzaju, ikon koloru i znaków zapytania, ze zwiniętymi odstępami (parseName)."""
+    nazwa = _KOD_Z_ODSTEPEM.sub('', podsumowanie)
+    for ikona, _ in KOLORY:
+        nazwa = nazwa.replace(ikona, '')
+    return _BIALE_ZNAKI.sub(' ', nazwa.replace('?', '').strip())
+
+
+def kolor_obchodu(podsumowanie: str) -> str:
+    """Kolor szat według pierwszej rozpoznanej ikony (parseColor)."""
+    if not podsumowanie.strip():
+        return 'Nieznany'
+    return next((kolor for ikona, kolor in KOLORY if ikona in podsumowanie), 'Nieznany')
+
+
+def rodzaj_obchodu(podsumowanie: str) -> str:
+    """Rodzaj obchodu według kodu w pierwszej parze nawiasów kwadratowych (parseType)."""
+    kod = _KOD_RODZAJU.search(podsumowanie)
+    return RODZAJE.get(kod.group(1), '') if kod else ''
+
+
+def rozwin_ucieczki(tekst: str) -> str:
+    """Rozwija sekwencje ucieczki wartości TEXT z RFC 5545 (\\, \\; \\\\ \\n)."""
+    return _SEKWENCJE_UCIECZKI.sub(lambda m: ' ' if m.group(1) in 'nN' else m.group(1), tekst)
+
+
+def wpis_kalendarza(poczatek: str, podsumowanie: str, mapa_nazw: Dict[str, str],
+                    tryb_kotlin: bool = TRYB_KOTLIN) -> Tuple[str, dict]:
+    """
+    Nazwa i wpis kalendarza dla jednego zdarzenia, tak jak w pętli parseIcsToJsonAdvanced i buildJson.
+
+    Raises:
+        ValueError: jeśli DTSTART nie jest poprawną datą RRRRMMDD (dokładnie 8 cyfr).
+    """
+    # strptime przyjmuje też daty bez zer wiodących ('2026013' -> 3 stycznia), więc długość jest sprawdzana osobno
+    if not _DATA_ICS.fullmatch(poczatek):
+        raise ValueError(f"DTSTART '{poczatek}' nie ma postaci RRRRMMDD")
+    data = datetime.datetime.strptime(poczatek, '%Y%m%d').date()
+    nazwa = nazwa_obchodu(podsumowanie)
+    if tryb_kotlin:
+        nazwa = mapa_nazw.get(nazwa, nazwa).replace('\\', '')
+    else:
+        nazwa = rozwin_ucieczki(nazwa)
+        nazwa = mapa_nazw.get(nazwa, nazwa)
+    if nazwa == WSPOMNIENIE_SOBOTNIE:
+        nazwa = f"{nazwa} ({poczatek[6:8]}-{poczatek[4:6]})"
+    rok_litera, rok_cyfra = cykle(data)
+    return nazwa, {
+        'data': f"{poczatek[6:8]}-{poczatek[4:6]}-{poczatek[:4]}",
+        'rok_litera': rok_litera,
+        'rok_cyfra': rok_cyfra,
+        'typ': rodzaj_obchodu(podsumowanie),
+        'kolor': kolor_obchodu(podsumowanie),
+    }
+
+
+def importuj_pliki(sciezki: List[str], mapa_nazw: Dict[str, str], tryb_kotlin: bool = TRYB_KOTLIN
+                   ) -> Tuple[Dict[int, Dict[str, dict]], List[str]]:
+    """
+    Czyta pliki ICS po kolei i rozdziela zdarzenia na kalendarze lat. Powtórzona nazwa w roku zachowuje
+    pierwsze miejsce i ostatni wpis - tak samo, jak przy wczytaniu pliku z Kotlina z powtórzonym kluczem.
+
+    Returns:
+        Krotka (rok -> kalendarz w postaci Kalendarz/<rok>.json, komunikaty o pominiętych zdarzeniach).
+    """
+    kalendarze: Dict[int, Dict[str, dict]] = {}
+    bledy = []
+    for sciezka in sciezki:
+        with open(sciezka, 'r', encoding='utf-8') as f:
+            for poczatek, podsumowanie in zdarzenia(f, tryb_kotlin):
+                try:
+                    nazwa, wpis = wpis_kalendarza(poczatek, podsumowanie, mapa_nazw, tryb_kotlin)
+                except ValueError:
+                    bledy.append(f"{os.path.basename(sciezka)}: niepoprawna data '{poczatek}' ({podsumowanie})")
+                    continue
+                if nazwa.strip():
+                    kalendarze.setdefault(int(poczatek[:4]), {})[nazwa] = wpis
+    return kalendarze, bledy
+
+
+def pliki_ics(wejscia: List[str]) -> List[str]:
+    """Pliki .ics z podanych ścieżek; z folderów - wszystkie pliki .ics w kolejności nazw."""
+    pliki = []
+    for wejscie in wejscia:
+        if os.path.isdir(wejscie):
+            pliki += sorted(glob.glob(os.path.join(wejscie, '*.ics')))
+        else:
+            pliki.append(wejscie)
+    return pliki
+
+
+def pobierz_ics(rok: int, folder: str, nadpisz: bool = False) -> str:
+    """
+    Pobiera plik ICS roku do folderu pobranych (jeśli go tam jeszcze nie ma) i zwraca ścieżkę.
+
+    Raises:
+        urllib.error.URLError: przy błędzie sieci lub odpowiedzi innej niż 200 (HTTPError z kodem).
+    """
+    sciezka = os.path.join(folder, NAZWA_PLIKU_ICS.format(rok=rok))
+    if os.path.exists(sciezka) and not nadpisz:
+        return sciezka
+    os.makedirs(folder, exist_ok=True)
+    sciezka_tymczasowa = f"{sciezka}.tmp"
+    with urllib.request.urlopen(ADRES_ICS.format(rok=rok)) as odpowiedz, open(sciezka_tymczasowa, 'wb') as f:
+        while blok := odpowiedz.read(1 << 16):
+            f.write(blok)
+    os.replace(sciezka_tymczasowa, sciezka)
+    return sciezka
+
+
+def main():
+    """Importuje pliki ICS (podane lub pobrane) do plików Kalendarz/<rok>.json."""
+    parser = argparse.ArgumentParser(description="Import kalendarzy liturgicznych z plików ICS gcatholic.org do Kalendarz/<rok>.json.")
+    parser.add_argument('wejscia', nargs='*', help="pliki .ics lub foldery z plikami .ics")
+    parser.add_argument('--pobierz', nargs='+', type=int, default=[], metavar='ROK',
+                        help="pobierz brakujące pliki ICS tych lat do --ics i zaimportuj je")
+    parser.add_argument('--ics', default=FOLDER_ICS, help=f"folder pobranych plików ICS (domyślnie {FOLDER_ICS})")
+    parser.add_argument('--folder', default=FOLDER_KALENDARZA, help=f"folder wynikowy (domyślnie {FOLDER_KALENDARZA})")
+    parser.add_argument('--nadpisz', action='store_true', help="nadpisz istniejące pliki kalendarza")
+    parser.add_argument('--rfc', action='store_true', help="ścisłe RFC 5545 zamiast zgodności z PobierzKalendarz.kt")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    wejscia = list(args.wejscia)
+    for rok in args.pobierz:
+        try:
+            wejscia.append(pobierz_ics(rok, os.path.join(biezacy_folder, args.ics)))
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                print(f"Informacja: Dane kalendarza dla roku '{rok}' nie są jeszcze dostępne (Błąd 404).")
+            else:
+                print(f"BŁĄD: Serwer odpowiedział nieoczekiwanym kodem dla roku {rok}: {e.code}")
+        except (urllib.error.URLError, OSError) as e:
+            print(f"BŁĄD: Nie udało się pobrać kalendarza roku {rok}: {e}")
+    pliki = pliki_ics(wejscia)
+    if not pliki:
+        parser.error("podaj pliki .ics, folder z plikami .ics albo --pobierz")
+
+    mapa_nazw = wczytaj_json(os.path.join(biezacy_folder, FOLDER_KALENDARZA, PLIK_MAPY_NAZW), None)
+    if mapa_nazw is None:
+        print(f"Ostrzeżenie: Brak mapy nazw '{PLIK_MAPY_NAZW}' - nazwy zostaną w brzmieniu gcatholic.org.")
+        mapa_nazw = {}
+    try:
+        kalendarze, bledy = importuj_pliki(pliki, mapa_nazw, not args.rfc)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"BŁĄD: Nie udało się odczytać pliku ICS: {e}")
+        return
+    for blad in bledy:
+        print(f"Ostrzeżenie: Pominięto zdarzenie - {blad}")
+
+    folder = os.path.join(biezacy_folder, args.folder)
+    zapisane, pominiete = [], []
+    for rok, kalendarz in sorted(kalendarze.items()):
+        sciezka = os.path.join(folder, f"{rok}.json")
+        if os.path.exists(sciezka) and not args.nadpisz:
+            pominiete.append(rok)
+            continue
+        zapisz_json_atomowo(sciezka, kalendarz, wciecie=2)
+        zapisane.append(f"{rok} ({len(kalendarz)} obchodów)")
+
+    print("\n--- Podsumowanie ---")
+    print(f"Przeczytane pliki ICS: {len(pliki)}, lata w plikach: {len(kalendarze)}.")
+    if zapisane:
+        print(f"Zapisane kalendarze w folderze '{folder}': {', '.join(zapisane)}.")
+    if pominiete:
+        print(f"Pominięto istniejące pliki (użyj --nadpisz): {', '.join(map(str, pominiete))}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import os
+import re
+import bisect
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+# Wspólny indeks kategorii pieśni z pliku Kategorie.txt. Linie z zakresem numerów
+# ('1-29 - Adwent {Adw}', '426 - 584 - Pieśni o Świętych {o Św.}') trafiają do posortowanej tablicy
+# przedziałów przeszukiwanej przez bisect, linie z samą nazwą ('Boże Narodzenie {B. N.}') do słownika.
+# Nakładające się zakresy są zgłaszane jako błąd. Skompilowany indeks jest zapamiętywany dla danego
+# pliku (ścieżka + rozmiar + czas modyfikacji), więc kolejne wywołania w tym samym procesie nie parsują go ponownie.
+
+_LINIA_ZAKRESU = re.compile(r'^(\d+)\s*-\s*(\d+)\s*-\s*(.+?)\s*\{(.+?)\}')
+_LINIA_NAZWY = re.compile(r'^([^{\d][^{]*?)\s*\{(.+?)\}')
+
+_skompilowane: Dict[Tuple[str, int, int], 'IndeksKategorii'] = {}
+
+
+def numer_piesni(wartosc) -> Optional[int]:
+    """Numer Siedleckiego z pola pieśni (int lub napis z samych cyfr) albo None - także dla liczb ujemnych."""
+    if isinstance(wartosc, int):
+        return wartosc if wartosc >= 0 else None
+    tekst = str(wartosc or '').strip()
+    return int(tekst) if tekst.isascii() and tekst.isdigit() else None
+
+
+class IndeksKategorii:
+    """
+    Indeks przedziałów numerów Siedleckiego i kategorii nazwanych. Wpisy mają postać
+    {'start', 'end', 'name', 'abbr'} (kategorie nazwane bez 'start'/'end') - tak jak dotąd
+    zwracały funkcje find_category_by_siedl / find_category_by_name.
+    """
+
+    def __init__(self, zakresy: List[dict], nazwane: Dict[str, dict]):
+        self.zakresy = sorted(zakresy, key=lambda k: (k['start'], k['end']))
+        for poprzedni, nastepny in zip(self.zakresy, self.zakresy[1:]):
+            if nastepny['start'] <= poprzedni['end']:
+                raise ValueError(
+                    f"Nakładające się zakresy kategorii: {poprzedni['start']}-{poprzedni['end']} '{poprzedni['name']}' "
+                    f"i {nastepny['start']}-{nastepny['end']} '{nastepny['name']}'"
+                )
+        self.poczatki = [k['start'] for k in self.zakresy]
+        self.nazwane = nazwane
+        self.po_nazwie_zakresu = {k['name']: k for k in self.zakresy}
+
+    def po_numerze(self, numer) -> Optional[dict]:
+        """Zwraca kategorię dla numeru Siedleckiego (int lub napis) albo None."""
+        numer = numer_piesni(numer)
+        if numer is None:
+            return None
+        i = bisect.bisect_right(self.poczatki, numer) - 1
+        if i >= 0 and numer <= self.zakresy[i]['end']:
+            return self.zakresy[i]
+        return None
+
+    def po_nazwie(self, nazwa: str) -> Optional[dict]:
+        """Zwraca kategorię o podanej pełnej nazwie (najpierw kategorie nazwane, potem zakresy) albo None."""
+        return self.nazwane.get(nazwa) or self.po_nazwie_zakresu.get(nazwa)
+
+    def kategoryzuj(self, piesni: List[dict], pole_numeru: str = 'numerSiedl', tylko_puste: bool = False,
+                    niepoprawne: Optional[List[dict]] = None) -> Tuple[List[dict], List[dict]]:
+        """
+        Przypisuje 'kategoria' i 'kategoriaSkr' całej liście pieśni jednym przejściem: pieśni są
+        sortowane po numerze i przechodzone równolegle z posortowanymi przedziałami.
+
+        Args:
+            piesni (list): Lista pieśni (modyfikowana w miejscu).
+            pole_numeru (str): Pole z numerem Siedleckiego.
+            tylko_puste (bool): Aktualizuj tylko pieśni bez kategorii.
+            niepoprawne (list): Jeśli podana, trafiają do niej pieśni z niepustym polem numeru, które
+                nie jest numerem (numer_piesni) - każda wartość jest parsowana tylko raz.
+
+        Returns:
+            Krotka (zaktualizowane pieśni, pieśni z numerem, dla których nie znaleziono kategorii).
+        """
+        z_numerem = []
+        for piesn in piesni:
+            if tylko_puste and piesn.get('kategoria'):
+                continue
+            numer = numer_piesni(piesn.get(pole_numeru))
+            if numer is not None:
+                z_numerem.append((numer, piesn))
+            elif niepoprawne is not None and str(piesn.get(pole_numeru) or '').strip():
+                niepoprawne.append(piesn)
+        z_numerem.sort(key=lambda para: para[0])
+
+        zaktualizowane, bez_kategorii = [], []
+        i = 0
+        for numer, piesn in z_numerem:
+            while i < len(self.zakresy) and self.zakresy[i]['end'] < numer:
+                i += 1
+            if i < len(self.zakresy) and self.zakresy[i]['start'] <= numer:
+                piesn['kategoria'] = self.zakresy[i]['name']
+                piesn['kategoriaSkr'] = self.zakresy[i]['abbr']
+                zaktualizowane.append(piesn)
+            else:
+                bez_kategorii.append(piesn)
+        return zaktualizowane, bez_kategorii
+
+
+def parsuj_kategorie(tresc: str) -> IndeksKategorii:
+    """
+    Parsuje treść pliku Kategorie.txt.
+
+    Raises:
+        ValueError: jeśli zakresy kategorii się nakładają.
+    """
+    zakresy, nazwane = [], {}
+    for linia in tresc.splitlines():
+        linia = linia.strip()
+        if not linia:
+            continue
+        dopasowanie = _LINIA_ZAKRESU.match(linia)
+        if dopasowanie:
+            start, end, nazwa, skrot = dopasowanie.groups()
+            zakresy.append({'start': int(start), 'end': int(end), 'name': nazwa.strip(), 'abbr': skrot.strip()})
+            continue
+        dopasowanie = _LINIA_NAZWY.match(linia)
+        if dopasowanie:
+            nazwa, skrot = dopasowanie.groups()
+            nazwane[nazwa.strip()] = {'name': nazwa.strip(), 'abbr': skrot.strip()}
+    return IndeksKategorii(zakresy, nazwane)
+
+
+def wczytaj_kategorie(sciezka: str) -> IndeksKategorii:
+    """
+    Zwraca skompilowany indeks kategorii dla pliku, parsując go tylko przy pierwszym użyciu
+    lub po zmianie pliku.
+
+    Raises:
+        OSError: jeśli pliku nie da się odczytać.
+        ValueError: jeśli zakresy kategorii się nakładają.
+    """
+    stat = os.stat(sciezka)
+    klucz = (os.path.abspath(sciezka), stat.st_size, stat.st_mtime_ns)
+    if klucz not in _skompilowane:
+        with open(sciezka, 'r', encoding='utf-8') as f:
+            _skompilowane[klucz] = parsuj_kategorie(f.read())
+    return _skompilowane[klucz]
+
+
+def main():
+    """Wypisuje skompilowany indeks lub kategorię podanych numerów."""
+    parser = argparse.ArgumentParser(description="Indeks kategorii pieśni z pliku Kategorie.txt.")
+    parser.add_argument('plik', help="ścieżka do pliku Kategorie.txt")
+    parser.add_argument('numery', nargs='*', help="numery Siedleckiego do sprawdzenia")
+    args = parser.parse_args()
+
+    try:
+        indeks = wczytaj_kategorie(args.plik)
+    except (OSError, ValueError) as e:
+        print(f"BŁĄD: {e}")
+        return
+
+    if not args.numery:
+        for kategoria in indeks.zakresy:
+            print(f"{kategoria['start']:>4}-{kategoria['end']:<4} {kategoria['name']} {{{kategoria['abbr']}}}")
+        for kategoria in indeks.nazwane.values():
+            print(f"{'':>9} {kategoria['name']} {{{kategoria['abbr']}}}")
+        return
+    for numer in args.numery:
+        kategoria = indeks.po_numerze(numer)
+        print(f"{numer}: {kategoria['name'] + ' {' + kategoria['abbr'] + '}' if kategoria else 'brak kategorii'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+import os
+import json
+import argparse
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest, zapisz_json_atomowo
+
+# Konkordancja śpiewników: numeracja Siedleckiego, SAK i DN dla każdej pieśni z bazy. Pieśni są
+# trzymane jako zwarte krotki (numerSiedl, numerSAK, numerDN, tytuł), a każdy śpiewnik ma własny
+# słownik numer -> pozycja, więc przeliczenie numeru to dwa odczyty ze słowników. Skompilowana
+# konkordancja jest zapamiętywana dla pliku bazy (ścieżka + rozmiar + czas modyfikacji), jak indeks
+# kategorii w kategorie.py. Na niej opiera się jednoprzebiegowe przeliczenie piesniSugerowane całego
+# korpusu (numery w dniach są numerami Siedleckiego) na numerację wybranego śpiewnika.
+
+# --- Konfiguracja ---
+# Baza pieśni z kompletem numeracji (względem głównego folderu projektu); piesni_ostateczne.json
+# nie ma jeszcze numerów DN, dlatego domyślnie używany jest wynik dopisania numerów DN
+PLIK_BAZY = os.path.join('PiesniDN', 'piesni_zaktualizowany.json')
+
+# Drzewo z dniami (względem głównego folderu projektu)
+FOLDER_DNI = 'Lekcjonarz_JSON2'
+
+# Śpiewniki: skrót -> pole numeru w bazie pieśni
+SPIEWNIKI = {'siedl': 'numerSiedl', 'sak': 'numerSAK', 'dn': 'numerDN'}
+
+# Śpiewnik, w którego numeracji zapisane są piesniSugerowane
+SPIEWNIK_DNI = 'siedl'
+
+_skompilowane: Dict[Tuple[str, int, int], 'Konkordancja'] = {}
+
+
+class Konkordancja:
+    """
+    Tablica numeracji pieśni w śpiewnikach z osobnym indeksem dla każdego śpiewnika.
+    Numer powtórzony w bazie wskazuje na pierwszą pieśń; powtórzenia trafiają do listy 'konflikty'.
+    """
+
+    def __init__(self, piesni: List[Dict[str, Any]]):
+        self.piesni: List[Tuple[str, ...]] = []
+        self.indeksy: Dict[str, Dict[str, int]] = {spiewnik: {} for spiewnik in SPIEWNIKI}
+        self.konflikty: List[Tuple[str, str]] = []
+        for piesn in piesni:
+            numery = tuple(str(piesn.get(pole) or '').strip() for pole in SPIEWNIKI.values())
+            if not any(numery):
+                continue
+            pozycja = len(self.piesni)
+            self.piesni.append(numery + (piesn.get('tytul', '').strip(),))
+            for spiewnik, numer in zip(SPIEWNIKI, numery):
+                if not numer:
+                    continue
+                if numer in self.indeksy[spiewnik]:
+                    self.konflikty.append((spiewnik, numer))
+                else:
+                    self.indeksy[spiewnik][numer] = pozycja
+
+    def pozycja(self, numer: str, spiewnik: str) -> Optional[int]:
+        """Pozycja pieśni o danym numerze w śpiewniku lub None."""
+        return self.indeksy[spiewnik].get(str(numer).strip())
+
+    def przelicz(self, numer: str, z: str, na: str) -> Optional[str]:
+        """Numer pieśni w śpiewniku docelowym lub None, jeśli pieśni tam nie ma."""
+        pozycja = self.pozycja(numer, z)
+        if pozycja is None:
+            return None
+        return self.piesni[pozycja][list(SPIEWNIKI).index(na)] or None
+
+    def tytul(self, numer: str, spiewnik: str) -> Optional[str]:
+        """Tytuł pieśni o danym numerze w śpiewniku lub None."""
+        pozycja = self.pozycja(numer, spiewnik)
+        return None if pozycja is None else self.piesni[pozycja][-1]
+
+
+def wczytaj_konkordancje(sciezka: str) -> Konkordancja:
+    """
+    Zwraca konkordancję dla pliku bazy pieśni, budując ją tylko przy pierwszym użyciu
+    lub po zmianie pliku.
+
+    Raises:
+        OSError: jeśli pliku nie da się odczytać.
+        json.JSONDecodeError: jeśli plik nie jest poprawnym JSON-em.
+    """
+    stat = os.stat(sciezka)
+    klucz = (os.path.abspath(sciezka), stat.st_size, stat.st_mtime_ns)
+    if klucz not in _skompilowane:
+        with open(sciezka, 'r', encoding='utf-8') as f:
+            _skompilowane[klucz] = Konkordancja(json.load(f))
+    return _skompilowane[klucz]
+
+
+def przelicz_piesni(piesni: List[Dict[str, Any]], konkordancja: Konkordancja, na: str, tryb: str,
+                    brakujace: Counter) -> bool:
+    """
+    Przelicza (w miejscu) listę piesniSugerowane jednego dnia na numerację śpiewnika docelowego.
+
+    Args:
+        piesni (list): Lista piesniSugerowane.
+        konkordancja (Konkordancja): Konkordancja śpiewników.
+        na (str): Śpiewnik docelowy (klucz SPIEWNIKI).
+        tryb (str): 'adnotuj' - dopisuje pole z numerem docelowym (np. 'numerDN'), numer zostaje bez zmian;
+            'zamien' - podmienia 'numer' na numer docelowy (pusty, gdy pieśni nie ma w śpiewniku).
+        brakujace (Counter): Licznik numerów bez odpowiednika w śpiewniku docelowym (uzupełniany).
+
+    Returns:
+        True, jeśli lista została zmieniona.
+    """
+    pole = SPIEWNIKI[na]
+    zmieniona = False
+    for piesn in piesni:
+        if not isinstance(piesn, dict) or not piesn.get('numer'):
+            continue
+        numer = str(piesn['numer'])
+        docelowy = konkordancja.przelicz(numer, SPIEWNIK_DNI, na)
+        if docelowy is None:
+            brakujace[numer] += 1
+        if tryb == 'zamien':
+            piesn['numer'] = docelowy or ''
+            zmieniona = True
+        elif docelowy is not None and piesn.get(pole) != docelowy:
+            piesn[pole] = docelowy
+            zmieniona = True
+        elif docelowy is None and pole in piesn:
+            del piesn[pole]
+            zmieniona = True
+    return zmieniona
+
+
+def przelicz_korpus(folder_dni: str, manifest: dict, konkordancja: Konkordancja, na: str, tryb: str,
+                    folder_wyjsciowy: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Jednym przebiegiem po dniach z piesniSugerowane przelicza korpus na numerację śpiewnika docelowego.
+    W trybie 'adnotuj' pliki są uzupełniane w miejscu (tylko zmienione, zapis atomowy); w trybie 'zamien'
+    przeliczone kopie dni trafiają do folderu wyjściowego z tą samą strukturą podfolderów.
+
+    Returns:
+        Słownik {'dni', 'zapisane', 'wpisy', 'brakujace': Counter numerów bez odpowiednika}.
+    """
+    wynik = {'dni': 0, 'zapisane': 0, 'wpisy': 0, 'brakujace': Counter()}
+    for sciezka in sorted(manifest['pliki']):
+        if 'piesniSugerowane' not in manifest['pliki'][sciezka].get('sekcje', []):
+            continue
+        with open(os.path.join(folder_dni, sciezka), 'r', encoding='utf-8') as f:
+            dane = json.load(f)
+        piesni = dane.get('piesniSugerowane')
+        if not isinstance(piesni, list):
+            continue
+        wynik['dni'] += 1
+        wynik['wpisy'] += len(piesni)
+        zmieniona = przelicz_piesni(piesni, konkordancja, na, tryb, wynik['brakujace'])
+        if tryb == 'zamien':
+            zapisz_json_atomowo(os.path.join(folder_wyjsciowy, sciezka), dane, wciecie=2)
+            wynik['zapisane'] += 1
+        elif zmieniona:
+            zapisz_json_atomowo(os.path.join(folder_dni, sciezka), dane, wciecie=2)
+            wynik['zapisane'] += 1
+    return wynik
+
+
+def main():
+    """Przelicza numery pieśni między śpiewnikami: pojedyncze numery albo cały korpus dni."""
+    parser = argparse.ArgumentParser(description="Konkordancja numeracji pieśni: Siedlecki, SAK, DN.")
+    parser.add_argument('numery', nargs='*', help="numery do przeliczenia (w śpiewniku --z)")
+    parser.add_argument('--z', dest='z', choices=list(SPIEWNIKI), default=SPIEWNIK_DNI, help="śpiewnik źródłowy numerów")
+    parser.add_argument('--na', choices=list(SPIEWNIKI), default='sak', help="śpiewnik docelowy (domyślnie sak)")
+    parser.add_argument('--korpus', choices=['adnotuj', 'zamien'],
+                        help="przelicz piesniSugerowane całego korpusu: adnotuj - dopisz numery w plikach dni; "
+                             "zamien - zapisz kopie dni z numerami śpiewnika docelowego do --wyjscie")
+    parser.add_argument('--wyjscie', help="folder na przeliczone kopie dni (dla --korpus zamien)")
+    parser.add_argument('--baza', default=PLIK_BAZY, help=f"baza pieśni (domyślnie {PLIK_BAZY})")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    try:
+        konkordancja = wczytaj_konkordancje(os.path.join(biezacy_folder, args.baza))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"BŁĄD: Nie udało się wczytać bazy pieśni: {e}")
+        return
+    if konkordancja.konflikty:
+        print(f"Ostrzeżenie: Powtórzone numery w bazie (używana jest pierwsza pieśń): "
+              + ", ".join(f"{spiewnik} {numer}" for spiewnik, numer in konkordancja.konflikty))
+
+    for numer in args.numery:
+        docelowy = konkordancja.przelicz(numer, args.z, args.na)
+        tytul = konkordancja.tytul(numer, args.z) or '?'
+        print(f"{args.z} {numer} ({tytul}) -> {args.na} {docelowy if docelowy else 'brak'}")
+
+    if args.korpus:
+        if args.korpus == 'zamien' and not args.wyjscie:
+            print("BŁĄD: Tryb 'zamien' wymaga folderu --wyjscie (numery w Lekcjonarz_JSON2 muszą zostać numerami Siedleckiego).")
+            return
+        folder_dni = os.path.join(biezacy_folder, FOLDER_DNI)
+        manifest = odswiez_manifest(folder_dni, os.path.join(biezacy_folder, FOLDER_MANIFESTOW))
+        wynik = przelicz_korpus(folder_dni, manifest, konkordancja, args.na, args.korpus,
+                                os.path.join(biezacy_folder, args.wyjscie) if args.wyjscie else None)
+
+        print("\n--- Podsumowanie ---")
+        print(f"Dni z pieśniami: {wynik['dni']}, wpisy: {wynik['wpisy']}, zapisane pliki: {wynik['zapisane']}.")
+        brakujace = wynik['brakujace']
+        print(f"Pieśni bez odpowiednika w śpiewniku {args.na}: {len(brakujace)} ({sum(brakujace.values())} wpisów).")
+        for numer, liczba in brakujace.most_common():
+            print(f"  {numer:>4}  {konkordancja.tytul(numer, SPIEWNIK_DNI) or '?'}  ({liczba}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import os
+import sys
+
+# Jedno wejście do wszystkich narzędzi projektu: laudate KOMENDA [NARZĘDZIE] [argumenty narzędzia].
+# Narzędzia pozostają osobnymi skryptami; ten plik importuje tylko os i sys, a moduł narzędzia (razem z jego
+# ciężkimi zależnościami: requests, bs4, pypdf, numpy) jest wczytywany dopiero przy uruchomieniu komendy,
+# więc pomoc i lekkie komendy (np. zapytania o manifest) startują w kilkadziesiąt milisekund.
+# Narzędzie działa tak, jakby uruchomiono je z jego folderu (część skryptów używa ścieżek względnych, np.
+# '../Lekcjonarz_JSON2', 'gotowe.json'); folder roboczy można zmienić opcją --katalog. Działa ona tylko na
+# narzędzia, które czytają bieżący folder (np. ścieżka pliku w argumentach kategorie.py) - skrypty liczące
+# ścieżki od własnego pliku (os.path.dirname(__file__)) jej nie widzą. Stałe z sekcji konfiguracji skryptu
+# zmienia opcja --ustaw NAZWA=WARTOŚĆ (nadpisywane po wczytaniu modułu, przed wywołaniem main).
+# Opcja --profile (w dowolnym miejscu wywołania) uruchamia narzędzie pod profilem z profilowanie.py.
+
+# --- Konfiguracja ---
+# Komendy: nazwa -> (opis, [(narzędzie, ścieżka skryptu względem głównego folderu projektu, opis)]);
+# pierwsze narzędzie na liście jest domyślne
+KOMENDY = {
+    'scrape': ("Pobieranie danych ze stron", [
+        ('czytania', 'czytania/skrypt.py', "czytania ze stron z listy jobs.json do Lekcjonarz_JSON_Finalny"),
+        ('linki-piesni', 'piesni/linki_piesni.py', "linki do tekstów pieśni"),
+    ]),
+    'discover': ("Wyszukiwanie stron do pobrania", [
+        ('czytania', 'czytania/discover_links.py', "lista stron z czytaniami (jobs.json) z nawigatora liturgia.wiara.pl"),
+    ]),
+    'validate': ("Sprawdzanie propozycji pieśni", [
+        ('sugestie', 'piesni/walidator_sugestii.py', "walidacja odpowiedzi modelu i plików dni"),
+        ('niezgodnosci', 'piesni/szukanie_niezgodnosci.py', "niedozwolone tytuły w Lekcjonarz_JSON2"),
+        ('pojedyncze', 'piesni/niezgodnosci2.py', "momenty z tylko jedną propozycją w NiesprawdzoneDni"),
+    ]),
+    'patch': ("Nanoszenie zmian na pliki dni", [
+        ('wsad', 'piesni/przetwarzanie_wsadowe.py', "zapytania wsadowe i wczytywanie odpowiedzi modelu"),
+        ('poprawki', 'piesni/aktualizuj_piesni_w_plikach.py', "piesniSugerowane z pliku poprawek"),
+        ('brakujace', 'piesni/brakuje.py', "kopiowanie dni jeszcze nieprzetworzonych"),
+        ('json', 'piesni/usuwanie_apostrofuf.py', "naprawa uszkodzonego JSON-a z odpowiedzią modelu"),
+        ('synchronizacja', 'synchronizacja.py', "synchronizacja Lekcjonarz_JSON2 <-> NiesprawdzoneDni"),
+        ('nazwy-plikow', 'koryguj_nazwy_plikow.py', "nazwy plików dni według tytul_dnia"),
+    ]),
+    'songs': ("Baza pieśni i dobór pieśni", [
+        ('statystyki', 'piesni/statystyki_piesni.py', "statystyki użycia pieśni w korpusie"),
+        ('baza', 'budowanie_bazy.py', "przyrostowe budowanie bazy pieśni"),
+        ('numery', 'piesni/zmiana_numerow.py', "zmiana numerów i tytułów pieśni w plikach dni"),
+        ('konkordancja', 'konkordancja.py', "numeracja Siedleckiego, SAK i DN"),
+        ('dopasowanie', 'dopasowanie_tytulow.py', "dopasowanie tytułów do bazy pieśni"),
+        ('plan', 'piesni/plan_roku.py', "lokalny dobór pieśni na cały rok"),
+        ('trafnosc', 'piesni/trafnosc_czytan.py', "ranking pieśni względem czytań (BM25)"),
+        ('prompty', 'piesni/skladanie_promptu.py', "minimalne prompty dla dni"),
+        ('paczki', 'piesni/pakowanie_paczek.py', "paczki dni dla modelu według budżetu tokenów"),
+        ('model', 'piesni/klient_modelu.py', "równoległy klient modelu"),
+        ('cache', 'piesni/cache_odpowiedzi.py', "pamięć podręczna odpowiedzi modelu"),
+        ('analiza-cache', 'piesni/analiza_cache.py', "wspólne prefiksy zapytań"),
+    ]),
+    'pdf': ("Skany śpiewników", [
+        ('ciecie', 'Piesni2/ciachanie.py', "podział na kolumny i przycinanie stron"),
+        ('sak', 'Piesni2/ekstrakcja_sak.py', "spis pieśni SAK z przyciętego skanu"),
+    ]),
+    'calendar': ("Kalendarz liturgiczny", [
+        ('generuj', 'rok_liturgiczny.py', "kalendarz liczony lokalnie"),
+        ('import', 'import_kalendarza.py', "import plików ICS z gcatholic.org"),
+        ('plan', 'plan_dni.py', "data -> obchód i plik dnia"),
+    ]),
+    'index': ("Manifesty i indeksy", [
+        ('manifest', 'manifest.py', "manifest drzew dni i zapytania na nim"),
+        ('kategorie', 'kategorie.py', "indeks kategorii pieśni"),
+        ('lista', 'piesni/lista_plikow.py', "lista plików dni"),
+    ]),
+}
+# --- Koniec Konfiguracji ---
+
+UZYCIE = "laudate [--katalog FOLDER] [--ustaw NAZWA=WARTOŚĆ ...] [--profile[=PREFIKS]] KOMENDA [NARZĘDZIE] [argumenty narzędzia]"
+
+
+def pomoc(komenda=None) -> str:
+    """Tekst pomocy: lista komend albo narzędzia jednej komendy."""
+    if komenda is None:
+        wiersze = [f"użycie: {UZYCIE}", "", "komendy:"]
+        wiersze += [f"  {nazwa:<10} {opis} ({', '.join(n for n, _, _ in narzedzia)})"
+                    for nazwa, (opis, narzedzia) in KOMENDY.items()]
+        wiersze += ["", "opcje:",
+                    "  --katalog FOLDER        folder roboczy narzędzia (domyślnie folder jego skryptu); zmienia",
+                    "                          tylko ścieżki względne narzędzi czytających bieżący folder, np.",
+                    "                          laudate --katalog Piesni2 index kategorie Kategorie.txt - skrypty",
+                    "                          liczące ścieżki od własnego pliku (większość piesni/*) je pomijają",
+                    "  --ustaw NAZWA=WARTOŚĆ   nadpisz stałą konfiguracji skryptu (wartość jako JSON lub tekst)",
+                    "  --profile[=PREFIKS]     profil narzędzia: zrzut pstats, raport alokacji i czasy odcinków",
+                    "                          (domyślnie w manifesty/profile)",
+                    "", "Pomoc narzędzia: laudate KOMENDA NARZĘDZIE --help"]
+    else:
+        opis, narzedzia = KOMENDY[komenda]
+        wiersze = [f"użycie: laudate {komenda} [NARZĘDZIE] [argumenty narzędzia]", "", f"{opis}. Narzędzia:"]
+        wiersze += [f"  {nazwa:<15} {opis_narzedzia} ({sciezka}){' - domyślne' if i == 0 else ''}"
+                    for i, (nazwa, sciezka, opis_narzedzia) in enumerate(narzedzia)]
+    return '\n'.join(wiersze)
+
+
+def parsuj_ustawienie(tekst: str):
+    """
+    Para (nazwa, wartość) z 'NAZWA=WARTOŚĆ'; wartość jest czytana jako JSON (liczby, listy, true/false),
+    a gdy nie jest poprawnym JSON-em - jako tekst.
+
+    Raises:
+        ValueError: jeśli w tekście nie ma '='.
+    """
+    import json
+    nazwa, rowna_sie, wartosc = tekst.partition('=')
+    if not rowna_sie or not nazwa.strip():
+        raise ValueError(f"ustawienie '{tekst}' nie ma postaci NAZWA=WARTOŚĆ")
+    try:
+        return nazwa.strip(), json.loads(wartosc)
+    except ValueError:
+        return nazwa.strip(), wartosc
+
+
+def uruchom(sciezka: str, nazwa_wywolania: str, argumenty: list, ustawienia: list, katalog=None):
+    """
+    Uruchamia skrypt narzędzia z podanymi argumentami. Skrypt z funkcją main() jest importowany jako moduł
+    (pod własną nazwą, więc działa też pula procesów), nadpisywane są stałe z --ustaw i wywoływane jest main();
+    pozostałe skrypty są wykonywane jak przy uruchomieniu bezpośrednim. Ustawienie dla skryptu bez main()
+    albo nieznanej stałej kończy program z kodem 2, zanim narzędzie zacznie działać.
+    """
+    plik = os.path.join(os.path.dirname(os.path.abspath(__file__)), sciezka)
+    folder = os.path.dirname(plik)
+    with open(plik, 'r', encoding='utf-8') as f:
+        ma_main = '\ndef main(' in f.read()
+    if ustawienia and not ma_main:
+        print(f"BŁĄD: Skrypt '{sciezka}' nie ma funkcji main() - --ustaw nie jest dostępne.")
+        sys.exit(2)
+
+    sys.argv = [nazwa_wywolania] + argumenty
+    sys.path.insert(0, folder)
+    os.chdir(katalog or folder)
+    if not ma_main:
+        import runpy
+        runpy.run_path(plik, run_name='__main__')
+        return
+
+    import importlib.util
+    nazwa_modulu = os.path.splitext(os.path.basename(plik))[0]
+    specyfikacja = importlib.util.spec_from_file_location(nazwa_modulu, plik)
+    modul = importlib.util.module_from_spec(specyfikacja)
+    sys.modules[nazwa_modulu] = modul
+    specyfikacja.loader.exec_module(modul)
+    for nazwa, wartosc in ustawienia:
+        if not hasattr(modul, nazwa):
+            print(f"BŁĄD: Skrypt '{sciezka}' nie ma stałej '{nazwa}'.")
+            sys.exit(2)
+        setattr(modul, nazwa, wartosc)
+    modul.main()
+
+
+def main():
+    """Rozpoznaje komendę i narzędzie, a resztę argumentów przekazuje narzędziu."""
+    argumenty = sys.argv[1:]
+    katalog, ustawienia, prefiks_profilu = None, [], None
+    if any(a == '--profile' or a.startswith('--profile=') for a in argumenty):
+        from profilowanie import wyciagnij_opcje
+        argumenty, prefiks_profilu = wyciagnij_opcje(argumenty)
+    try:
+        while argumenty and argumenty[0].startswith('-'):
+            opcja = argumenty.pop(0)
+            if opcja in ('-h', '--help'):
+                print(pomoc())
+                return
+            if opcja not in ('--katalog', '--ustaw') or not argumenty:
+                raise ValueError(f"nieznana opcja lub brak wartości: {opcja}")
+            if opcja == '--katalog':
+                katalog = os.path.abspath(argumenty.pop(0))
+            else:
+                ustawienia.append(parsuj_ustawienie(argumenty.pop(0)))
+    except ValueError as e:
+        print(f"BŁĄD: {e}\n\n{pomoc()}")
+        sys.exit(2)
+
+    if not argumenty:
+        print(pomoc())
+        sys.exit(2)
+    komenda = argumenty.pop(0)
+    if komenda not in KOMENDY:
+        print(f"BŁĄD: Nieznana komenda '{komenda}'.\n\n{pomoc()}")
+        sys.exit(2)
+    if argumenty[:1] in (['-h'], ['--help']):
+        print(pomoc(komenda))
+        return
+    narzedzia = KOMENDY[komenda][1]
+    narzedzie = next((n for n in narzedzia if argumenty[:1] == [n[0]]), None)
+    if narzedzie:
+        argumenty.pop(0)
+    else:
+        narzedzie = narzedzia[0]
+
+    if prefiks_profilu is None:
+        uruchom(narzedzie[1], f"laudate {komenda} {narzedzie[0]}", argumenty, ustawienia, katalog)
+        return
+    from profilowanie import profil
+    with profil(f"{komenda}-{narzedzie[0]}", prefiks_profilu):
+        uruchom(narzedzie[1], f"laudate {komenda} {narzedzie[0]}", argumenty, ustawienia, katalog)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import os
+import json
+import hashlib
+import argparse
+from typing import Dict, Optional, Set
+
+from profilowanie import licz, odcinek, uruchom_z_profilem
+
+# Manifest drzewa z plikami dni: ścieżka względna -> rozmiar, czas modyfikacji, skrót treści,
+# tytul_dnia i lista obecnych sekcji. Pozwala wykryć zmienione pliki samym wywołaniem stat(),
+# bez ponownego czytania i parsowania plików, które od ostatniego skanu się nie zmieniły,
+# a zapytania (brakujące pliki, zmiany od wersji N, dni bez pieśni) odpowiadają z samego manifestu.
+
+# --- Konfiguracja ---
+# Folder (względem lokalizacji skryptu), w którym zapisywane są manifesty drzew
+FOLDER_MANIFESTOW = 'manifesty'
+
+# Drzewa z dniami obsługiwane domyślnie przez zapytania z linii poleceń
+DRZEWA = ['Lekcjonarz_JSON2', 'NiesprawdzoneDni']
+
+# Rozmiar bloku odczytu przy liczeniu skrótu pliku
+ROZMIAR_BLOKU = 1 << 16
+
+
+def oblicz_skrot(sciezka: str) -> str:
+    """
+    Liczy skrót SHA-256 zawartości pliku, czytając go blokami.
+
+    Args:
+        sciezka (str): Ścieżka do pliku.
+
+    Returns:
+        Skrót w postaci szesnastkowej.
+    """
+    skrot = hashlib.sha256()
+    with open(sciezka, 'rb') as f:
+        for blok in iter(lambda: f.read(ROZMIAR_BLOKU), b''):
+            skrot.update(blok)
+    return skrot.hexdigest()
+
+
+def _opisz_tresc(tresc: bytes) -> dict:
+    """Wyciąga z treści pliku dnia tytul_dnia i listę niepustych sekcji."""
+    try:
+        with odcinek('dekodowanie JSON'):
+            dane = json.loads(tresc.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return {'tytul_dnia': None, 'sekcje': [], 'blad': True}
+    if not isinstance(dane, dict):
+        return {'tytul_dnia': None, 'sekcje': [], 'blad': True}
+    sekcje = [klucz for klucz, wartosc in dane.items() if wartosc not in (None, '', [], {})]
+    return {'tytul_dnia': dane.get('tytul_dnia'), 'sekcje': sekcje}
+
+
+def _przejdz_drzewo(katalog: str, prefiks: str = ''):
+    """Zwraca pary (ścieżka względna, wpis os.DirEntry) dla wszystkich plików .json w drzewie."""
+    with os.scandir(katalog) as wpisy:
+        for wpis in wpisy:
+            sciezka_wzgledna = f"{prefiks}{wpis.name}"
+            if wpis.is_dir(follow_symlinks=False):
+                yield from _przejdz_drzewo(wpis.path, sciezka_wzgledna + '/')
+            elif wpis.name.endswith('.json') and wpis.is_file():
+                yield sciezka_wzgledna, wpis
+
+
+@odcinek('manifest: skan drzewa')
+def skanuj_drzewo(katalog: str, poprzedni: Optional[Dict[str, dict]] = None, wersja: int = 0) -> Dict[str, dict]:
+    """
+    Buduje manifest drzewa. Pliki, których rozmiar i czas modyfikacji zgadzają się
+    z poprzednim manifestem, przejmują zapisany wpis bez ponownego odczytu. Pozostałe
+    pliki są czytane raz: z tej samej treści liczony jest skrót i wyciągane metadane.
+
+    Args:
+        katalog (str): Ścieżka do głównego folderu drzewa (np. 'Lekcjonarz_JSON2').
+        poprzedni (dict): Poprzedni słownik plików tego drzewa lub None.
+        wersja (int): Numer wersji manifestu, zapisywany w zmienionych wpisach jako 'wersja_zmiany'.
+
+    Returns:
+        Słownik: ścieżka względna (z '/') -> {'rozmiar', 'mtime', 'skrot', 'tytul_dnia', 'sekcje', 'wersja_zmiany'}.
+    """
+    poprzedni = poprzedni or {}
+    pliki = {}
+    for sciezka_wzgledna, wpis in _przejdz_drzewo(katalog):
+        stat = wpis.stat()
+        stary = poprzedni.get(sciezka_wzgledna)
+        if stary and stary['rozmiar'] == stat.st_size and stary['mtime'] == stat.st_mtime_ns:
+            pliki[sciezka_wzgledna] = stary
+            continue
+
+        with open(wpis.path, 'rb') as f:
+            tresc = f.read()
+        licz('manifest: przeczytane pliki')
+        skrot = hashlib.sha256(tresc).hexdigest()
+        if stary and stary['skrot'] == skrot:
+            # Zmienił się tylko czas modyfikacji - treść i metadane pozostają aktualne
+            pliki[sciezka_wzgledna] = dict(stary, mtime=stat.st_mtime_ns)
+            continue
+
+        nowy = {'rozmiar': stat.st_size, 'mtime': stat.st_mtime_ns, 'skrot': skrot}
+        nowy.update(_opisz_tresc(tresc))
+        nowy['wersja_zmiany'] = wersja
+        pliki[sciezka_wzgledna] = nowy
+    return pliki
+
+
+def sciezka_manifestu(katalog: str, folder_manifestow: str) -> str:
+    """Zwraca ścieżkę pliku manifestu dla danego drzewa (nazwa pliku = nazwa folderu drzewa)."""
+    nazwa_drzewa = os.path.basename(os.path.normpath(katalog))
+    return os.path.join(folder_manifestow, f"{nazwa_drzewa}.json")
+
+
+def wczytaj_json(sciezka: str, domyslnie=None):
+    """Wczytuje plik JSON; jeśli plik nie istnieje, zwraca wartość domyślną."""
+    try:
+        with open(sciezka, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return domyslnie
+
+
+@odcinek('zapis JSON')
+def zapisz_json_atomowo(sciezka: str, dane, wciecie: Optional[int] = None):
+    """
+    Zapisuje dane do pliku tymczasowego obok docelowego i podmienia go przez os.replace,
+    dzięki czemu przerwany zapis nigdy nie zostawia uszkodzonego pliku.
+    """
+    folder = os.path.dirname(sciezka)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    sciezka_tymczasowa = f"{sciezka}.tmp"
+    with open(sciezka_tymczasowa, 'w', encoding='utf-8') as f:
+        json.dump(dane, f, indent=wciecie, ensure_ascii=False)
+    os.replace(sciezka_tymczasowa, sciezka)
+
+
+def wczytaj_manifest(katalog: str, folder_manifestow: str) -> dict:
+    """
+    Wczytuje zapisany manifest drzewa bez skanowania dysku.
+
+    Returns:
+        Słownik {'wersja': int, 'pliki': {...}, 'usuniete': {ścieżka: wersja usunięcia}}.
+    """
+    manifest = wczytaj_json(sciezka_manifestu(katalog, folder_manifestow), {})
+    return {
+        'wersja': manifest.get('wersja', 0),
+        'pliki': manifest.get('pliki', {}),
+        'usuniete': manifest.get('usuniete', {})
+    }
+
+
+def zapisz_manifest(katalog: str, folder_manifestow: str, manifest: dict):
+    """Zapisuje manifest drzewa (atomowo)."""
+    zapisz_json_atomowo(sciezka_manifestu(katalog, folder_manifestow), manifest)
+
+
+def odswiez_manifest(katalog: str, folder_manifestow: str) -> dict:
+    """
+    Wczytuje zapisany manifest drzewa, odświeża go względem dysku i zapisuje z powrotem.
+    Jeśli cokolwiek się zmieniło, numer wersji manifestu jest zwiększany o jeden.
+
+    Args:
+        katalog (str): Ścieżka do głównego folderu drzewa.
+        folder_manifestow (str): Folder z plikami manifestów.
+
+    Returns:
+        Pełny, aktualny manifest drzewa (jak w wczytaj_manifest).
+    """
+    manifest = wczytaj_manifest(katalog, folder_manifestow)
+    nowa_wersja = manifest['wersja'] + 1
+    pliki = skanuj_drzewo(katalog, manifest['pliki'], nowa_wersja)
+
+    usuniete = manifest['pliki'].keys() - pliki.keys()
+    zmienione = any(wpis.get('wersja_zmiany') == nowa_wersja for wpis in pliki.values())
+    if zmienione or usuniete:
+        for sciezka in usuniete:
+            manifest['usuniete'][sciezka] = nowa_wersja
+        for sciezka in pliki.keys() & manifest['usuniete'].keys():
+            del manifest['usuniete'][sciezka]
+        manifest['wersja'] = nowa_wersja
+        manifest['pliki'] = pliki
+        zapisz_manifest(katalog, folder_manifestow, manifest)
+    elif pliki != manifest['pliki']:
+        # Zmiany wyłącznie w czasach modyfikacji - zapisujemy bez podbijania wersji
+        manifest['pliki'] = pliki
+        zapisz_manifest(katalog, folder_manifestow, manifest)
+    return manifest
+
+
+def aktualizuj_manifest(katalog: str, folder_manifestow: str) -> Dict[str, dict]:
+    """Odświeża manifest drzewa i zwraca sam słownik plików (ścieżka względna -> wpis)."""
+    return odswiez_manifest(katalog, folder_manifestow)['pliki']
+
+
+# --- Zapytania ---
+
+def brakujace(manifest_a: dict, manifest_b: dict) -> Set[str]:
+    """Ścieżki obecne w drzewie A, których brakuje w drzewie B."""
+    return manifest_a['pliki'].keys() - manifest_b['pliki'].keys()
+
+
+def zmienione_od(manifest: dict, wersja: int) -> Set[str]:
+    """Ścieżki dodane lub zmienione po wersji manifestu o podanym numerze."""
+    return {sciezka for sciezka, wpis in manifest['pliki'].items() if wpis.get('wersja_zmiany', 0) > wersja}
+
+
+def usuniete_od(manifest: dict, wersja: int) -> Set[str]:
+    """Ścieżki usunięte po wersji manifestu o podanym numerze."""
+    return {sciezka for sciezka, wersja_usuniecia in manifest['usuniete'].items() if wersja_usuniecia > wersja}
+
+
+def bez_sekcji(manifest: dict, sekcja: str = 'piesniSugerowane') -> Set[str]:
+    """Ścieżki dni, w których brakuje danej sekcji (lub jest pusta)."""
+    return {sciezka for sciezka, wpis in manifest['pliki'].items() if sekcja not in wpis.get('sekcje', [])}
+
+
+def main():
+    """Odświeża manifesty drzew z dniami i odpowiada na zapytania z linii poleceń."""
+    parser = argparse.ArgumentParser(description="Manifest korpusu dni liturgicznych i zapytania na nim.")
+    parser.add_argument('zapytanie', nargs='?', default='stan',
+                        choices=['stan', 'brakujace', 'zmienione', 'bez-piesni'],
+                        help="stan: podsumowanie; brakujace: pliki z A nieobecne w B; "
+                             "zmienione: zmiany od wersji --od; bez-piesni: dni bez piesniSugerowane")
+    parser.add_argument('--drzewo', default=DRZEWA[0], help=f"drzewo A / drzewo zapytania (domyślnie {DRZEWA[0]})")
+    parser.add_argument('--drugie', default=DRZEWA[1], help=f"drzewo B dla zapytania 'brakujace' (domyślnie {DRZEWA[1]})")
+    parser.add_argument('--od', type=int, default=0, help="numer wersji manifestu dla zapytania 'zmienione'")
+    parser.add_argument('--bez-skanu', action='store_true', help="użyj zapisanego manifestu bez sprawdzania dysku")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_manifestow = os.path.join(biezacy_folder, FOLDER_MANIFESTOW)
+
+    def pobierz(nazwa_drzewa):
+        katalog = os.path.join(biezacy_folder, nazwa_drzewa)
+        if args.bez_skanu:
+            return wczytaj_manifest(katalog, folder_manifestow)
+        if not os.path.isdir(katalog):
+            print(f"BŁĄD: Folder '{katalog}' nie istnieje.")
+            return None
+        return odswiez_manifest(katalog, folder_manifestow)
+
+    if args.zapytanie == 'stan':
+        for nazwa_drzewa in DRZEWA:
+            manifest = pobierz(nazwa_drzewa)
+            if manifest is not None:
+                print(f"Manifest '{nazwa_drzewa}': wersja {manifest['wersja']}, {len(manifest['pliki'])} plików .json, "
+                      f"{len(bez_sekcji(manifest))} bez piesniSugerowane.")
+        return
+
+    manifest = pobierz(args.drzewo)
+    if manifest is None:
+        return
+
+    if args.zapytanie == 'brakujace':
+        drugi = pobierz(args.drugie)
+        if drugi is None:
+            return
+        wynik = brakujace(manifest, drugi)
+        print(f"Pliki z '{args.drzewo}' nieobecne w '{args.drugie}': {len(wynik)}")
+    elif args.zapytanie == 'zmienione':
+        wynik = zmienione_od(manifest, args.od)
+        for sciezka in sorted(usuniete_od(manifest, args.od)):
+            print(f"USUNIĘTO: {sciezka}")
+        print(f"Pliki zmienione w '{args.drzewo}' od wersji {args.od} (aktualna: {manifest['wersja']}): {len(wynik)}")
+    else:
+        wynik = bez_sekcji(manifest)
+        print(f"Dni bez piesniSugerowane w '{args.drzewo}': {len(wynik)}")
+
+    for sciezka in sorted(wynik):
+        print(f"  {sciezka}")
+
+
+if __name__ == '__main__':
+    uruchom_z_profilem(main)
@@ -0,0 +1,236 @@
+import os
+import json
+import bisect
+import hashlib
+import argparse
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Set
+
+from pakowanie_paczek import PLIK_WYJSCIOWY, ZNAKOW_NA_TOKEN, szacuj_tokeny
+
+# Analizuje plik zapytań (requests.jsonl) pod kątem pamięci podręcznej prefiksów po stronie dostawcy:
+# dzieli tekst każdego zapytania (instrukcja systemowa, potem treść) na bloki, liczy skróty kolejnych
+# prefiksów i sprawdza, jaka część zapytania powtarza się bajt w bajt względem zapytań wcześniejszych.
+#   raport   - przewidywany udział tokenów z pamięci podręcznej i koszt z nią / bez niej,
+#   serwer   - lokalny serwer udający endpoint generateContent, który zlicza trafienia tak samo,
+#   sprawdz  - wysyła zapytania do serwera (lub innego endpointu) i porównuje zgłoszone trafienia z raportem.
+
+# --- Konfiguracja ---
+# Rozmiar bloku w tokenach, z jakim dostawca zapamiętuje prefiksy
+BLOK_TOKENOW = 256
+
+# Minimalna długość wspólnego prefiksu (w tokenach), od której dostawca w ogóle korzysta z pamięci podręcznej
+MIN_TOKENOW_CACHE = 2048
+
+# Ceny za milion tokenów wejściowych (USD): zwykłych i odczytanych z pamięci podręcznej
+CENA_WEJSCIA_ZA_MILION = 1.25
+CENA_CACHE_ZA_MILION = 0.31
+
+# Adres lokalnego serwera testowego
+HOST_SERWERA = '127.0.0.1'
+PORT_SERWERA = 8765
+
+_ZNAKOW_W_BLOKU = int(BLOK_TOKENOW * ZNAKOW_NA_TOKEN)
+
+
+def tekst_zapytania(zapytanie: Dict[str, Any]) -> str:
+    """
+    Zwraca tekst zapytania w kolejności, w jakiej widzi go model: instrukcja systemowa, potem
+    kolejne części treści. Przyjmuje zarówno linię pliku wsadowego ({'key', 'request'}), jak i samo 'request'.
+    """
+    zapytanie = zapytanie.get('request', zapytanie)
+    czesci = [p.get('text', '') for p in zapytanie.get('system_instruction', {}).get('parts', [])]
+    for wiadomosc in zapytanie.get('contents', []):
+        czesci += [p.get('text', '') for p in wiadomosc.get('parts', [])]
+    return '\x1e'.join(czesci)
+
+
+def skroty_prefiksow(tekst: str) -> List[str]:
+    """
+    Liczy skróty SHA-256 kolejnych prefiksów tekstu kończących się na granicy pełnego bloku.
+    Skrót k-tego prefiksu obejmuje wszystkie bloki od 1 do k, więc równość skrótów oznacza równość prefiksów.
+    """
+    skrot = hashlib.sha256()
+    wynik = []
+    for poczatek in range(0, len(tekst) - _ZNAKOW_W_BLOKU + 1, _ZNAKOW_W_BLOKU):
+        skrot.update(tekst[poczatek:poczatek + _ZNAKOW_W_BLOKU].encode('utf-8'))
+        wynik.append(skrot.copy().hexdigest())
+    return wynik
+
+
+def dopasuj_prefiks(skroty: List[str], znane: Set[str]) -> int:
+    """
+    Zwraca liczbę początkowych bloków, których prefiks był już widziany. Ponieważ zapisujemy skróty
+    wszystkich prefiksów każdego zapytania, zbiór znanych prefiksów jest domknięty w dół
+    i wystarczy wyszukiwanie binarne.
+    """
+    return bisect.bisect_left(range(len(skroty)), True, key=lambda i: skroty[i] not in znane)
+
+
+def tokeny_z_cache(bloki: int) -> int:
+    """Przelicza liczbę trafionych bloków na tokeny, uwzględniając minimalny rozmiar prefiksu."""
+    tokeny = bloki * BLOK_TOKENOW
+    return tokeny if tokeny >= MIN_TOKENOW_CACHE else 0
+
+
+def czytaj_zapytania(sciezka: str) -> Iterator[Dict[str, Any]]:
+    """Czyta plik JSONL z zapytaniami, pomijając puste linie."""
+    with open(sciezka, 'r', encoding='utf-8') as f:
+        for linia in f:
+            if linia.strip():
+                yield json.loads(linia)
+
+
+def symuluj(sciezka: str) -> List[Dict[str, Any]]:
+    """
+    Przechodzi po zapytaniach w kolejności z pliku i dla każdego wyznacza liczbę tokenów,
+    które dostawca może odczytać z pamięci podręcznej.
+
+    Returns:
+        Lista słowników {'key', 'tokeny', 'z_cache', 'skrot_prefiksu'} dla kolejnych zapytań.
+    """
+    znane: Set[str] = set()
+    wyniki = []
+    for numer, zapytanie in enumerate(czytaj_zapytania(sciezka), 1):
+        tekst = tekst_zapytania(zapytanie)
+        skroty = skroty_prefiksow(tekst)
+        trafione = dopasuj_prefiks(skroty, znane)
+        znane.update(skroty)
+        wyniki.append({
+            'key': zapytanie.get('key', f"linia-{numer}"),
+            'tokeny': szacuj_tokeny(tekst),
+            'z_cache': tokeny_z_cache(trafione),
+            'skrot_prefiksu': skroty[trafione - 1][:12] if trafione else None,
+        })
+    return wyniki
+
+
+def koszt(tokeny: int, z_cache: int) -> float:
+    """Koszt wejścia w USD dla danej liczby tokenów, z których część pochodzi z pamięci podręcznej."""
+    return ((tokeny - z_cache) * CENA_WEJSCIA_ZA_MILION + z_cache * CENA_CACHE_ZA_MILION) / 1_000_000
+
+
+def wypisz_raport(wyniki: List[Dict[str, Any]], szczegoly: bool = False):
+    """Wypisuje udział trafień w pamięci podręcznej, koszt oraz liczbę różnych wspólnych prefiksów."""
+    if szczegoly:
+        for w in wyniki:
+            print(f"{w['key']}: {w['tokeny']} tokenów, z pamięci podręcznej {w['z_cache']} (prefiks {w['skrot_prefiksu']})")
+    tokeny = sum(w['tokeny'] for w in wyniki)
+    z_cache = sum(w['z_cache'] for w in wyniki)
+    prefiksy = {w['skrot_prefiksu'] for w in wyniki if w['skrot_prefiksu']}
+
+    print("\n--- Podsumowanie ---")
+    print(f"Zapytań: {len(wyniki)}, szacowane tokeny wejściowe: {tokeny}")
+    print(f"Tokeny z pamięci podręcznej: {z_cache} ({z_cache / tokeny if tokeny else 0:.1%}), różnych wspólnych prefiksów: {len(prefiksy)}")
+    print(f"Koszt wejścia bez pamięci podręcznej: {koszt(tokeny, 0):.2f} USD, z pamięcią podręczną: {koszt(tokeny, z_cache):.2f} USD")
+
+
+def uruchom_serwer(host: str, port: int):
+    """
+    Uruchamia lokalny serwer udający endpoint generateContent. Każde zapytanie POST jest
+    dopasowywane do prefiksów zapamiętanych z wcześniejszych zapytań, a w odpowiedzi zwracane jest
+    usageMetadata z polem cachedContentTokenCount - tak jak robi to dostawca.
+    """
+    znane: Set[str] = set()
+    blokada = threading.Lock()
+
+    class Obsluga(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                zapytanie = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            except json.JSONDecodeError:
+                self.send_error(400, "niepoprawny JSON")
+                return
+            tekst = tekst_zapytania(zapytanie)
+            skroty = skroty_prefiksow(tekst)
+            with blokada:
+                trafione = dopasuj_prefiks(skroty, znane)
+                znane.update(skroty)
+            tokeny = szacuj_tokeny(tekst)
+            odpowiedz = {
+                'candidates': [{'content': {'role': 'model', 'parts': [{'text': ','}]}, 'finishReason': 'STOP'}],
+                'usageMetadata': {'promptTokenCount': tokeny, 'cachedContentTokenCount': tokeny_z_cache(trafione),
+                                  'candidatesTokenCount': 1, 'totalTokenCount': tokeny + 1},
+            }
+            dane = json.dumps(odpowiedz).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(dane)))
+            self.end_headers()
+            self.wfile.write(dane)
+
+        def log_message(self, format, *args):
+            pass
+
+    serwer = ThreadingHTTPServer((host, port), Obsluga)
+    print(f"Serwer testowy nasłuchuje na http://{host}:{port}/ (Ctrl+C kończy).")
+    try:
+        serwer.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serwer.server_close()
+
+
+def sprawdz(sciezka: str, adres: str) -> List[Dict[str, Any]]:
+    """
+    Wysyła kolejne zapytania z pliku do endpointu i zbiera zgłoszone w usageMetadata liczby tokenów.
+
+    Returns:
+        Lista słowników {'key', 'tokeny', 'z_cache', 'skrot_prefiksu'} zgodna z wynikiem symuluj().
+    """
+    wyniki = []
+    for numer, zapytanie in enumerate(czytaj_zapytania(sciezka), 1):
+        dane = json.dumps(zapytanie.get('request', zapytanie), ensure_ascii=False).encode('utf-8')
+        zadanie = urllib.request.Request(adres, data=dane, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(zadanie) as odpowiedz:
+            metadane = json.loads(odpowiedz.read()).get('usageMetadata', {})
+        wyniki.append({'key': zapytanie.get('key', f"linia-{numer}"), 'tokeny': metadane.get('promptTokenCount', 0),
+                       'z_cache': metadane.get('cachedContentTokenCount', 0), 'skrot_prefiksu': None})
+    return wyniki
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Analiza wspólnych prefiksów zapytań i pamięci podręcznej dostawcy.")
+    podpolecenia = parser.add_subparsers(dest='polecenie', required=True)
+
+    raport = podpolecenia.add_parser('raport', help="przewidywane trafienia w pamięci podręcznej i koszt")
+    raport.add_argument('plik', nargs='?', default=PLIK_WYJSCIOWY, help="plik JSONL z zapytaniami")
+    raport.add_argument('--szczegoly', action='store_true', help="wypisz wynik dla każdego zapytania")
+
+    serwer = podpolecenia.add_parser('serwer', help="uruchom lokalny serwer testowy")
+    serwer.add_argument('--port', type=int, default=PORT_SERWERA)
+
+    sprawdzanie = podpolecenia.add_parser('sprawdz', help="porównaj raport z trafieniami zgłoszonymi przez endpoint")
+    sprawdzanie.add_argument('plik', nargs='?', default=PLIK_WYJSCIOWY, help="plik JSONL z zapytaniami")
+    sprawdzanie.add_argument('--adres', default=f"http://{HOST_SERWERA}:{PORT_SERWERA}/v1beta/models/test:generateContent")
+    args = parser.parse_args()
+
+    if args.polecenie == 'serwer':
+        uruchom_serwer(HOST_SERWERA, args.port)
+        return
+
+    sciezka = os.path.join(os.path.dirname(os.path.abspath(__file__)), args.plik)
+    if not os.path.exists(sciezka):
+        print(f"BŁĄD: Nie znaleziono pliku z zapytaniami: '{sciezka}'.")
+        return
+
+    przewidywane = symuluj(sciezka)
+    if args.polecenie == 'raport':
+        wypisz_raport(przewidywane, args.szczegoly)
+        return
+
+    zmierzone = sprawdz(sciezka, args.adres)
+    rozbiezne = [(p['key'], p['z_cache'], z['z_cache']) for p, z in zip(przewidywane, zmierzone) if p['z_cache'] != z['z_cache']]
+    wypisz_raport(zmierzone)
+    if rozbiezne:
+        print(f"Ostrzeżenie: {len(rozbiezne)} zapytań z trafieniami innymi niż przewidywane, np.: {rozbiezne[:3]}")
+    else:
+        print("Trafienia zgłoszone przez endpoint są zgodne z przewidywaniami.")
+
+
+if __name__ == '__main__':
+    main()
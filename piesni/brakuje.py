@@ -1,7 +1,12 @@
 import os
+import sys
 import json
 from collections import OrderedDict
 
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, aktualizuj_manifest
+
 # --- Konfiguracja ---
 # Nazwa folderu źródłowego (o jeden poziom wyżej niż skrypt)
 FOLDER_ZRODLOWY = '../Lekcjonarz_JSON2'
@@ -36,19 +41,16 @@ def znajdz_i_kopiuj_brakujace(folder_zrodlowy: str, plik_z_poprawkami: str, fold
         print(f"BŁĄD podczas odczytu pliku '{plik_z_poprawkami}': {e}. Przerwanie operacji.")
         return
 
-    # 2. Zbierz listę wszystkich plików .json z folderu źródłowego
-    sciezki_zrodlowe = []
+    # 2. Pobierz listę wszystkich plików .json z manifestu folderu źródłowego
+    #    (manifest odświeżany jest przyrostowo - czytane są tylko zmienione pliki)
     if not os.path.isdir(folder_zrodlowy):
         print(f"BŁĄD: Folder źródłowy '{folder_zrodlowy}' nie istnieje.")
         return
-        
-    for root, _, files in os.walk(folder_zrodlowy):
-        for file in files:
-            if file.endswith('.json'):
-                pelna_sciezka = os.path.join(root, file)
-                # Utwórz ścieżkę względną w formacie 'Lekcjonarz_JSON2/...'
-                sciezka_wzgledna = os.path.relpath(pelna_sciezka, os.path.dirname(folder_zrodlowy))
-                sciezki_zrodlowe.append(sciezka_wzgledna.replace('\\', '/'))
+
+    folder_manifestow = os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW)
+    nazwa_drzewa = os.path.basename(os.path.normpath(folder_zrodlowy))
+    # Ścieżki względne w formacie 'Lekcjonarz_JSON2/...'
+    sciezki_zrodlowe = [f"{nazwa_drzewa}/{sciezka}" for sciezka in sorted(aktualizuj_manifest(folder_zrodlowy, folder_manifestow))]
 
     print(f"Znaleziono {len(sciezki_zrodlowe)} wszystkich plików .json w '{folder_zrodlowy}'.")
 
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import Any, Dict, Optional
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW
+from analiza_cache import czytaj_zapytania, tekst_zapytania
+from przetwarzanie_wsadowe import PLIK_ODPOWIEDZI, wyciagnij_tekst
+from skladanie_promptu import PLIK_WYJSCIOWY
+
+# Lokalna pamięć podręczna odpowiedzi modelu w jednym pliku SQLite. Kluczem jest skrót
+# znormalizowanego promptu jednego dnia (instrukcja + pieśni kandydujące + treść dnia), dlatego domyślnym
+# wejściem są zapytania dzienne ze skladanie_promptu.py (requests_dzienne.jsonl): zmiana czytań w jednym dniu,
+# wersji instrukcji lub bazy pieśni zmienia klucz tylko dni, których dotyczy. Paczki z pakowanie_paczek.py
+# nie nadają się na klucze - zmiana jednego dnia przetasowuje dni między paczkami i zmienia prawie wszystkie.
+#   filtruj    - dzieli plik zapytań na trafienia (od razu zapisywane jako odpowiedzi) i zapytania do wysłania,
+#   zapamietaj - zapisuje w pamięci odpowiedzi z pliku wsadowego, dopasowane do zapytań po polu 'key',
+#   stan       - liczba wpisów i rozmiar pamięci.
+# Po przekroczeniu limitu rozmiaru usuwane są najdawniej używane wpisy (LRU) - raz, na końcu uruchomienia.
+
+# --- Konfiguracja ---
+# Plik bazy (w folderze manifestów, poza drzewami dni)
+NAZWA_PLIKU_CACHE = 'cache_odpowiedzi.sqlite'
+
+# Maksymalny łączny rozmiar zapamiętanych odpowiedzi w bajtach
+MAKS_ROZMIAR_CACHE = 200 * 1024 * 1024
+
+# Zapytania, których nie ma w pamięci, i odpowiedzi odczytane z pamięci
+PLIK_DO_WYSLANIA = 'requests_do_wyslania.jsonl'
+PLIK_ODPOWIEDZI_Z_CACHE = 'responses_cache.jsonl'
+
+
+def klucz_zapytania(zapytanie: Dict[str, Any], model: str = '') -> str:
+    """
+    Liczy klucz pamięci podręcznej: SHA-256 z nazwy modelu i tekstu zapytania dziennego w kolejności,
+    w jakiej widzi go model. Instrukcja jest już w postaci kanonicznej (normalizuj_tekst), a dzień
+    w zwartym JSON-ie, więc ten sam prompt dnia daje zawsze ten sam klucz.
+    """
+    skrot = hashlib.sha256()
+    skrot.update(model.encode('utf-8') + b'\x1f')
+    skrot.update(tekst_zapytania(zapytanie).encode('utf-8'))
+    return skrot.hexdigest()
+
+
+def otworz_cache(sciezka: str) -> sqlite3.Connection:
+    """Otwiera (i w razie potrzeby tworzy) bazę pamięci podręcznej."""
+    os.makedirs(os.path.dirname(sciezka) or '.', exist_ok=True)
+    polaczenie = sqlite3.connect(sciezka)
+    polaczenie.execute('PRAGMA journal_mode=WAL')
+    polaczenie.execute(
+        'CREATE TABLE IF NOT EXISTS odpowiedzi ('
+        ' klucz TEXT PRIMARY KEY, odpowiedz TEXT NOT NULL, rozmiar INTEGER NOT NULL,'
+        ' utworzono REAL NOT NULL, uzyto REAL NOT NULL)'
+    )
+    polaczenie.execute('CREATE INDEX IF NOT EXISTS odpowiedzi_uzyto ON odpowiedzi (uzyto)')
+    return polaczenie
+
+
+def pobierz(polaczenie: sqlite3.Connection, klucz: str) -> Optional[Dict[str, Any]]:
+    """Zwraca zapamiętaną odpowiedź (obiekt 'response') i oznacza ją jako użytą, albo None."""
+    wiersz = polaczenie.execute('SELECT odpowiedz FROM odpowiedzi WHERE klucz = ?', (klucz,)).fetchone()
+    if wiersz is None:
+        return None
+    with polaczenie:
+        polaczenie.execute('UPDATE odpowiedzi SET uzyto = ? WHERE klucz = ?', (time.time(), klucz))
+    return json.loads(wiersz[0])
+
+
+def zapisz(polaczenie: sqlite3.Connection, klucz: str, odpowiedz: Dict[str, Any]):
+    """Zapisuje odpowiedź pod kluczem (limit rozmiaru pilnuje przytnij, wołane raz na uruchomienie)."""
+    tekst = json.dumps(odpowiedz, ensure_ascii=False)
+    teraz = time.time()
+    with polaczenie:
+        polaczenie.execute(
+            'INSERT OR REPLACE INTO odpowiedzi (klucz, odpowiedz, rozmiar, utworzono, uzyto) VALUES (?, ?, ?, ?, ?)',
+            (klucz, tekst, len(tekst.encode('utf-8')), teraz, teraz)
+        )
+
+
+def przytnij(polaczenie: sqlite3.Connection, maks_rozmiar: int) -> int:
+    """
+    Usuwa najdawniej używane wpisy, aż łączny rozmiar zmieści się w limicie.
+
+    Returns:
+        Liczba usuniętych wpisów.
+    """
+    rozmiar = polaczenie.execute('SELECT COALESCE(SUM(rozmiar), 0) FROM odpowiedzi').fetchone()[0]
+    if rozmiar <= maks_rozmiar:
+        return 0
+    do_usuniecia = []
+    for klucz, rozmiar_wpisu in polaczenie.execute('SELECT klucz, rozmiar FROM odpowiedzi ORDER BY uzyto'):
+        if rozmiar <= maks_rozmiar:
+            break
+        do_usuniecia.append((klucz,))
+        rozmiar -= rozmiar_wpisu
+    with polaczenie:
+        polaczenie.executemany('DELETE FROM odpowiedzi WHERE klucz = ?', do_usuniecia)
+    return len(do_usuniecia)
+
+
+def filtruj(polaczenie: sqlite3.Connection, plik_zapytan: str, plik_do_wyslania: str,
+            plik_odpowiedzi: str, model: str = '') -> Dict[str, int]:
+    """
+    Dzieli plik zapytań: dla trafień zapisuje gotową odpowiedź w formacie pliku wsadowego
+    ({'key', 'response'}), pozostałe zapytania przepisuje bez zmian do pliku do wysłania.
+    """
+    liczniki = {'trafienia': 0, 'do_wyslania': 0}
+    with open(plik_do_wyslania, 'w', encoding='utf-8') as do_wyslania, \
+         open(plik_odpowiedzi, 'w', encoding='utf-8') as odpowiedzi:
+        for zapytanie in czytaj_zapytania(plik_zapytan):
+            odpowiedz = pobierz(polaczenie, klucz_zapytania(zapytanie, model))
+            if odpowiedz is not None:
+                odpowiedzi.write(json.dumps({'key': zapytanie.get('key'), 'response': odpowiedz}, ensure_ascii=False) + '\n')
+                liczniki['trafienia'] += 1
+            else:
+                do_wyslania.write(json.dumps(zapytanie, ensure_ascii=False) + '\n')
+                liczniki['do_wyslania'] += 1
+    return liczniki
+
+
+def zapamietaj(polaczenie: sqlite3.Connection, plik_zapytan: str, plik_odpowiedzi: str,
+               model: str = '') -> Dict[str, int]:
+    """
+    Zapisuje w pamięci poprawne odpowiedzi z pliku wsadowego. Odpowiedź jest dopasowywana
+    do zapytania po polu 'key'; odpowiedzi z błędem lub bez tekstu są pomijane.
+    """
+    klucze = {z.get('key'): klucz_zapytania(z, model) for z in czytaj_zapytania(plik_zapytan)}
+    liczniki = {'zapisane': 0, 'pominiete': 0}
+    for linia in czytaj_zapytania(plik_odpowiedzi):
+        klucz = klucze.get(linia.get('key'))
+        if klucz is None or wyciagnij_tekst(linia) is None:
+            liczniki['pominiete'] += 1
+            continue
+        zapisz(polaczenie, klucz, linia['response'])
+        liczniki['zapisane'] += 1
+    return liczniki
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Lokalna pamięć podręczna odpowiedzi modelu.")
+    parser.add_argument('--model', default='', help="nazwa modelu wliczana do klucza (różne modele = różne wpisy)")
+    parser.add_argument('--maks-mb', type=int, default=MAKS_ROZMIAR_CACHE // (1024 * 1024), help="limit rozmiaru pamięci w MB")
+    podpolecenia = parser.add_subparsers(dest='polecenie', required=True)
+
+    filtrowanie = podpolecenia.add_parser('filtruj', help="oddziel zapytania obsłużone z pamięci od zapytań do wysłania")
+    filtrowanie.add_argument('zapytania', nargs='?', default=PLIK_WYJSCIOWY)
+    filtrowanie.add_argument('--do-wyslania', default=PLIK_DO_WYSLANIA)
+    filtrowanie.add_argument('--odpowiedzi', default=PLIK_ODPOWIEDZI_Z_CACHE)
+
+    zapamietywanie = podpolecenia.add_parser('zapamietaj', help="zapisz odpowiedzi z pliku wsadowego w pamięci")
+    zapamietywanie.add_argument('zapytania', nargs='?', default=PLIK_WYJSCIOWY)
+    zapamietywanie.add_argument('odpowiedzi', nargs='?', default=PLIK_ODPOWIEDZI)
+
+    podpolecenia.add_parser('stan', help="pokaż liczbę wpisów i rozmiar pamięci")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    sciezka_cache = os.path.join(biezacy_folder, '..', FOLDER_MANIFESTOW, NAZWA_PLIKU_CACHE)
+    polaczenie = otworz_cache(sciezka_cache)
+    maks_rozmiar = args.maks_mb * 1024 * 1024
+
+    try:
+        if args.polecenie == 'stan':
+            wpisy, rozmiar = polaczenie.execute('SELECT COUNT(*), COALESCE(SUM(rozmiar), 0) FROM odpowiedzi').fetchone()
+            print(f"Pamięć '{os.path.normpath(sciezka_cache)}': {wpisy} odpowiedzi, {rozmiar / (1024 * 1024):.1f} MB z {args.maks_mb} MB.")
+            return
+
+        plik_zapytan = os.path.join(biezacy_folder, args.zapytania)
+        if not os.path.exists(plik_zapytan):
+            print(f"BŁĄD: Nie znaleziono pliku z zapytaniami: '{plik_zapytan}'.")
+            return
+
+        if args.polecenie == 'filtruj':
+            liczniki = filtruj(polaczenie, plik_zapytan, os.path.join(biezacy_folder, args.do_wyslania),
+                               os.path.join(biezacy_folder, args.odpowiedzi), args.model)
+            print(f"Z pamięci: {liczniki['trafienia']}, do wysłania: {liczniki['do_wyslania']}.")
+            print(f"Zapytania do wysłania: '{args.do_wyslania}', odpowiedzi z pamięci: '{args.odpowiedzi}'.")
+        else:
+            plik_odpowiedzi = os.path.join(biezacy_folder, args.odpowiedzi)
+            if not os.path.exists(plik_odpowiedzi):
+                print(f"BŁĄD: Nie znaleziono pliku z odpowiedziami: '{plik_odpowiedzi}'.")
+                return
+            liczniki = zapamietaj(polaczenie, plik_zapytan, plik_odpowiedzi, args.model)
+            print(f"Zapamiętano odpowiedzi: {liczniki['zapisane']}, pominięto: {liczniki['pominiete']}.")
+        usuniete = przytnij(polaczenie, maks_rozmiar)
+        if usuniete:
+            print(f"Usunięto {usuniete} najdawniej używanych wpisów (limit {args.maks_mb} MB).")
+    finally:
+        polaczenie.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW
+from analiza_cache import HOST_SERWERA, czytaj_zapytania, dopasuj_prefiks, skroty_prefiksow, tekst_zapytania, tokeny_z_cache
+from cache_odpowiedzi import MAKS_ROZMIAR_CACHE, NAZWA_PLIKU_CACHE, klucz_zapytania, otworz_cache, pobierz, przytnij, zapisz
+from pakowanie_paczek import PLIK_WYJSCIOWY, szacuj_tokeny
+from przetwarzanie_wsadowe import (KATALOG_BAZOWY_LEKCJONARZA, PLIK_BLEDOW, PLIK_ODPOWIEDZI,
+                                   parsuj_wynik_modelu, waliduj_dzien, wczytaj_odpowiedzi, wyciagnij_tekst)
+from skladanie_promptu import PLIK_PIESNI
+from szukanie_niezgodnosci import PIESNI_SOURCE_FILE_NAME
+from walidator_sugestii import skompiluj_walidator
+
+# Wysyła zapytania z pliku requests.jsonl (paczki z pakowanie_paczek.py albo pojedyncze dni
+# ze skladanie_promptu.py) bezpośrednio do modelu, równolegle, z limitami zapytań i tokenów na minutę,
+# ponawianiem z wykładniczym opóźnieniem i odbiorem odpowiedzi strumieniowej (SSE).
+# Odpowiedzi zapisywane są w formacie pliku wsadowego ({'key', 'response'}), więc można je od razu
+# wczytać do plików dni (przetwarzanie_wsadowe.py wczytaj lub opcja --zastosuj). Pamięć podręczna
+# (cache_odpowiedzi.py) odzyskuje odpowiedzi pojedynczych dni tylko przy zapytaniach dziennych
+# (requests_dzienne.jsonl) - klucz paczki zmienia się przy każdej zmianie jej składu. Do pamięci
+# trafiają tylko odpowiedzi zakończone (finishReason STOP), które przechodzą walidację.
+#   wyslij - wysyła zapytania,
+#   serwer - lokalny serwer testowy z opóźnieniem, limitami i losowymi błędami.
+
+# --- Konfiguracja ---
+# Endpoint strumieniowy; {model} jest podmieniany na nazwę modelu
+ADRES_API = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse'
+MODEL = 'gemini-2.5-pro'
+
+# Zmienna środowiskowa z kluczem API
+ZMIENNA_KLUCZA_API = 'GEMINI_API_KEY'
+
+# Limity po stronie klienta (na minutę) i liczba równoległych połączeń
+LIMIT_RPM = 60
+LIMIT_TPM = 2_000_000
+LICZBA_WATKOW = 8
+
+# Ponawianie: liczba prób, opóźnienie bazowe i maksymalne (w sekundach)
+MAKS_PROB = 6
+OPOZNIENIE_BAZOWE = 2.0
+MAKS_OPOZNIENIE = 120.0
+LIMIT_CZASU_ZAPYTANIA = 600
+
+# Kody HTTP, po których warto ponowić zapytanie
+KODY_DO_PONOWIENIA = {408, 429, 500, 502, 503, 504}
+
+# Domyślne ustawienia serwera testowego
+PORT_SERWERA_TESTOWEGO = 8766
+
+
+class LimitNaMinute:
+    """Okno przesuwne 60 s ograniczające liczbę zapytań i tokenów; bezpieczne dla wątków."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.okno = deque()  # (czas, tokeny)
+        self.tokeny = 0
+        self.blokada = threading.Lock()
+
+    def _wyczysc(self, teraz: float):
+        while self.okno and teraz - self.okno[0][0] >= 60:
+            self.tokeny -= self.okno.popleft()[1]
+
+    def sprobuj(self, tokeny: int) -> float:
+        """
+        Rezerwuje miejsce na zapytanie, jeśli mieści się w limitach.
+
+        Returns:
+            0, jeśli zapytanie można wysłać od razu, albo liczba sekund do zwolnienia miejsca.
+        """
+        with self.blokada:
+            teraz = time.monotonic()
+            self._wyczysc(teraz)
+            # Zapytanie większe niż cały limit TPM przechodzi, gdy okno jest puste
+            miesci_sie = len(self.okno) < self.rpm and (self.tokeny + tokeny <= self.tpm or not self.okno)
+            if miesci_sie:
+                self.okno.append((teraz, tokeny))
+                self.tokeny += tokeny
+                return 0.0
+            return max(0.05, 60 - (teraz - self.okno[0][0]))
+
+    def czekaj(self, tokeny: int):
+        """Blokuje wątek do chwili, gdy zapytanie zmieści się w limitach."""
+        while True:
+            przerwa = self.sprobuj(tokeny)
+            if not przerwa:
+                return
+            time.sleep(min(przerwa, 1.0))
+
+
+def czytaj_strumien_sse(odpowiedz) -> Dict[str, Any]:
+    """
+    Czyta odpowiedź strumieniową (linie 'data: {...}') i skleja ją w jedną odpowiedź
+    o kształcie generateContent: tekst wszystkich fragmentów, ostatni finishReason i usageMetadata.
+    """
+    teksty, powod, metadane = [], None, {}
+    for surowa in odpowiedz:
+        linia = surowa.decode('utf-8').strip()
+        if not linia.startswith('data:'):
+            continue
+        fragment = json.loads(linia[5:])
+        for kandydat in fragment.get('candidates', [])[:1]:
+            teksty += [p.get('text', '') for p in kandydat.get('content', {}).get('parts', [])]
+            powod = kandydat.get('finishReason', powod)
+        metadane = fragment.get('usageMetadata', metadane)
+    return {
+        'candidates': [{'content': {'role': 'model', 'parts': [{'text': ''.join(teksty)}]}, 'finishReason': powod}],
+        'usageMetadata': metadane,
+    }
+
+
+def wyslij_zapytanie(adres: str, klucz_api: Optional[str], zapytanie: Dict[str, Any], tokeny: int,
+                     limit: LimitNaMinute) -> Tuple[Optional[Dict[str, Any]], Optional[str], int]:
+    """
+    Wysyła jedno zapytanie z ponawianiem. Przed każdą próbą czeka na miejsce w limitach;
+    po błędzie 429/5xx czeka wykładniczo dłużej (z losowym rozrzutem) lub tyle, ile każe Retry-After.
+
+    Returns:
+        Krotka (odpowiedź, opis błędu, liczba prób) - dokładnie jedno z dwóch pierwszych pól jest ustawione.
+    """
+    dane = json.dumps(zapytanie.get('request', zapytanie), ensure_ascii=False).encode('utf-8')
+    naglowki = {'Content-Type': 'application/json'}
+    if klucz_api:
+        naglowki['x-goog-api-key'] = klucz_api
+
+    blad = None
+    for proba in range(1, MAKS_PROB + 1):
+        limit.czekaj(tokeny)
+        przerwa = None
+        try:
+            zadanie = urllib.request.Request(adres, data=dane, headers=naglowki)
+            with urllib.request.urlopen(zadanie, timeout=LIMIT_CZASU_ZAPYTANIA) as odpowiedz:
+                wynik = czytaj_strumien_sse(odpowiedz)
+            if wyciagnij_tekst({'response': wynik}):
+                return wynik, None, proba
+            blad = f"pusta odpowiedź (finishReason: {wynik['candidates'][0]['finishReason']})"
+        except urllib.error.HTTPError as e:
+            blad = f"HTTP {e.code}: {e.read()[:200].decode('utf-8', 'replace')}"
+            if e.code not in KODY_DO_PONOWIENIA:
+                return None, blad, proba
+            if e.headers.get('Retry-After', '').replace('.', '', 1).isdigit():
+                przerwa = float(e.headers['Retry-After'])
+        except (urllib.error.URLError, TimeoutError, ConnectionError, json.JSONDecodeError) as e:
+            blad = f"błąd połączenia: {e}"
+
+        if proba < MAKS_PROB:
+            if przerwa is None:
+                przerwa = min(MAKS_OPOZNIENIE, OPOZNIENIE_BAZOWE * 2 ** (proba - 1)) * random.uniform(0.5, 1.0)
+            time.sleep(przerwa)
+    return None, blad, MAKS_PROB
+
+
+def odpowiedz_poprawna(odpowiedz: Dict[str, Any],
+                       walidator: Optional[Callable[[Any], Tuple[List[str], List[str]]]] = None) -> bool:
+    """
+    Sprawdza, czy odpowiedź modelu nadaje się do pamięci podręcznej: zakończona normalnie
+    (finishReason STOP), z poprawnym JSON-em i dniami bez błędów walidacji.
+    """
+    try:
+        if odpowiedz['candidates'][0].get('finishReason') != 'STOP':
+            return False
+        dni = parsuj_wynik_modelu(wyciagnij_tekst({'response': odpowiedz}) or '')
+    except (KeyError, IndexError, TypeError, AttributeError, json.JSONDecodeError):
+        return False
+    return all(not (walidator(dzien)[0] if walidator else waliduj_dzien(dzien)) for dzien in dni)
+
+
+def wyslij_wszystkie(plik_zapytan: str, plik_odpowiedzi: str, adres: str, klucz_api: Optional[str],
+                     rpm: int, tpm: int, watki: int, sciezka_cache: Optional[str], model: str,
+                     walidator: Optional[Callable[[Any], Tuple[List[str], List[str]]]] = None) -> Dict[str, Any]:
+    """
+    Wysyła wszystkie zapytania z pliku równolegle i dopisuje odpowiedzi do pliku JSONL.
+    Plik zapytań jest czytany strumieniowo - w locie jest najwyżej 2 * watki zapytań.
+    Zapytania z odpowiedzią w lokalnej pamięci podręcznej (cache_odpowiedzi.py) nie są wysyłane;
+    zapisywane i odczytywane są tylko odpowiedzi, które przechodzą odpowiedz_poprawna (z walidatorem
+    z walidator_sugestii.py, a bez niego - ze sprawdzeniem samej struktury dni).
+
+    Returns:
+        Liczniki: wysłane, z_cache, bledy, proby, tokeny, tokeny_z_cache, sekundy.
+    """
+    limit = LimitNaMinute(rpm, tpm)
+    cache = otworz_cache(sciezka_cache) if sciezka_cache else None
+    liczniki = {'wyslane': 0, 'z_cache': 0, 'bledy': 0, 'proby': 0, 'tokeny': 0, 'tokeny_z_cache': 0}
+    start = time.monotonic()
+
+    def zapisz_wynik(plik, zapytanie, klucz_cache, wynik):
+        odpowiedz, blad, proby = wynik
+        liczniki['proby'] += proby
+        if odpowiedz is None:
+            liczniki['bledy'] += 1
+            print(f"  [BŁĄD] {zapytanie.get('key')}: {blad}")
+            plik.write(json.dumps({'key': zapytanie.get('key'), 'error': blad}, ensure_ascii=False) + '\n')
+        else:
+            liczniki['wyslane'] += 1
+            liczniki['tokeny_z_cache'] += odpowiedz['usageMetadata'].get('cachedContentTokenCount', 0)
+            plik.write(json.dumps({'key': zapytanie.get('key'), 'response': odpowiedz}, ensure_ascii=False) + '\n')
+            if cache is not None and odpowiedz_poprawna(odpowiedz, walidator):
+                zapisz(cache, klucz_cache, odpowiedz)
+        plik.flush()
+
+    with open(plik_odpowiedzi, 'a', encoding='utf-8') as plik, ThreadPoolExecutor(max_workers=watki) as pula:
+        w_locie = {}
+        for zapytanie in czytaj_zapytania(plik_zapytan):
+            klucz_cache = klucz_zapytania(zapytanie, model) if cache is not None else None
+            zapamietana = pobierz(cache, klucz_cache) if cache is not None else None
+            # Wpisy sprzed walidacji przy zapisie (obcięte lub błędne) są pomijane i wysyłane ponownie
+            if zapamietana is not None and odpowiedz_poprawna(zapamietana, walidator):
+                liczniki['z_cache'] += 1
+                plik.write(json.dumps({'key': zapytanie.get('key'), 'response': zapamietana}, ensure_ascii=False) + '\n')
+                continue
+
+            tokeny = szacuj_tokeny(tekst_zapytania(zapytanie))
+            liczniki['tokeny'] += tokeny
+            przyszle = pula.submit(wyslij_zapytanie, adres, klucz_api, zapytanie, tokeny, limit)
+            w_locie[przyszle] = (zapytanie, klucz_cache)
+            while len(w_locie) >= 2 * watki:
+                gotowe, _ = wait(w_locie, return_when=FIRST_COMPLETED)
+                for przyszle in gotowe:
+                    zapisz_wynik(plik, *w_locie.pop(przyszle), przyszle.result())
+
+        for przyszle in list(w_locie):
+            zapisz_wynik(plik, *w_locie.pop(przyszle), przyszle.result())
+
+    if cache is not None:
+        przytnij(cache, MAKS_ROZMIAR_CACHE)
+        cache.close()
+    liczniki['sekundy'] = time.monotonic() - start
+    return liczniki
+
+
+def tekst_odpowiedzi_testowej(zapytanie: Dict[str, Any]) -> str:
+    """
+    Buduje odpowiedź serwera testowego w formacie z instrukcji: sekwencję obiektów zaczynającą się
+    od przecinka, z przepisaną ścieżką i dotychczasowymi piesniSugerowane każdego dnia.
+    """
+    zawartosc = zapytanie.get('contents', [{}])[-1].get('parts', [{}])[0].get('text', '[]')
+    try:
+        dni = parsuj_wynik_modelu(zawartosc)
+    except json.JSONDecodeError:
+        dni = []
+    obiekty = [json.dumps({'sciezka': d.get('sciezka'), 'piesniSugerowane': d.get('piesniSugerowane', [])},
+                          ensure_ascii=False, indent=2) for d in dni if isinstance(d, dict)]
+    return ',\n' + ',\n'.join(obiekty)
+
+
+def uruchom_serwer_testowy(port: int, rpm: int, tpm: int, opoznienie: float, bledy: float, fragmenty: int):
+    """
+    Uruchamia lokalny serwer udający endpoint streamGenerateContent. Symuluje opóźnienie
+    (czas do pierwszego fragmentu), limity RPM/TPM (odpowiedź 429 z Retry-After), losowe błędy 503
+    i pamięć podręczną prefiksów (cachedContentTokenCount, jak w analiza_cache.py).
+    """
+    limit = LimitNaMinute(rpm, tpm)
+    znane = set()
+    blokada = threading.Lock()
+
+    class Obsluga(BaseHTTPRequestHandler):
+        def _blad(self, kod: int, status: str, naglowki: Dict[str, str] = None):
+            dane = json.dumps({'error': {'code': kod, 'status': status}}).encode('utf-8')
+            self.send_response(kod)
+            for nazwa, wartosc in (naglowki or {}).items():
+                self.send_header(nazwa, wartosc)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(dane)))
+            self.end_headers()
+            self.wfile.write(dane)
+
+        def do_POST(self):
+            try:
+                zapytanie = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            except json.JSONDecodeError:
+                self._blad(400, 'INVALID_ARGUMENT')
+                return
+            tekst = tekst_zapytania(zapytanie)
+            tokeny = szacuj_tokeny(tekst)
+            przerwa = limit.sprobuj(tokeny)
+            if przerwa:
+                self._blad(429, 'RESOURCE_EXHAUSTED', {'Retry-After': f"{przerwa:.1f}"})
+                return
+            if random.random() < bledy:
+                self._blad(503, 'UNAVAILABLE')
+                return
+
+            skroty = skroty_prefiksow(tekst)
+            with blokada:
+                trafione = dopasuj_prefiks(skroty, znane)
+                znane.update(skroty)
+            wynik = tekst_odpowiedzi_testowej(zapytanie)
+            time.sleep(opoznienie)
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            dlugosc = max(1, -(-len(wynik) // fragmenty))
+            czesci = [wynik[i:i + dlugosc] for i in range(0, len(wynik), dlugosc)]
+            for numer, czesc in enumerate(czesci, 1):
+                fragment = {'candidates': [{'content': {'role': 'model', 'parts': [{'text': czesc}]}}]}
+                if numer == len(czesci):
+                    fragment['candidates'][0]['finishReason'] = 'STOP'
+                    fragment['usageMetadata'] = {'promptTokenCount': tokeny, 'cachedContentTokenCount': tokeny_z_cache(trafione),
+                                                 'candidatesTokenCount': szacuj_tokeny(wynik)}
+                self.wfile.write(f"data: {json.dumps(fragment, ensure_ascii=False)}\r\n\r\n".encode('utf-8'))
+                self.wfile.flush()
+                time.sleep(opoznienie / (4 * fragmenty))
+
+        def log_message(self, format, *args):
+            pass
+
+    serwer = ThreadingHTTPServer((HOST_SERWERA, port), Obsluga)
+    print(f"Serwer testowy nasłuchuje na http://{HOST_SERWERA}:{port}/ "
+          f"(RPM {rpm}, TPM {tpm}, opóźnienie {opoznienie} s, błędy {bledy:.0%}). Ctrl+C kończy.")
+    try:
+        serwer.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serwer.server_close()
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Równoległy klient modelu z limitami i lokalny serwer testowy.")
+    podpolecenia = parser.add_subparsers(dest='polecenie', required=True)
+
+    wysylanie = podpolecenia.add_parser('wyslij', help="wyślij zapytania z pliku JSONL")
+    wysylanie.add_argument('zapytania', nargs='?', default=PLIK_WYJSCIOWY, help="plik JSONL z zapytaniami")
+    wysylanie.add_argument('--wyjscie', default=PLIK_ODPOWIEDZI, help="plik JSONL z odpowiedziami (dopisywany)")
+    wysylanie.add_argument('--model', default=MODEL)
+    wysylanie.add_argument('--adres', default=None, help="adres endpointu (domyślnie API modelu)")
+    wysylanie.add_argument('--rpm', type=int, default=LIMIT_RPM)
+    wysylanie.add_argument('--tpm', type=int, default=LIMIT_TPM)
+    wysylanie.add_argument('--watki', type=int, default=LICZBA_WATKOW)
+    wysylanie.add_argument('--bez-cache', action='store_true', help="nie korzystaj z lokalnej pamięci odpowiedzi")
+    wysylanie.add_argument('--zastosuj', action='store_true', help="po wysłaniu wczytaj odpowiedzi do plików dni")
+
+    serwer = podpolecenia.add_parser('serwer', help="uruchom lokalny serwer testowy")
+    serwer.add_argument('--port', type=int, default=PORT_SERWERA_TESTOWEGO)
+    serwer.add_argument('--rpm', type=int, default=LIMIT_RPM)
+    serwer.add_argument('--tpm', type=int, default=LIMIT_TPM)
+    serwer.add_argument('--opoznienie', type=float, default=1.0, help="czas odpowiedzi w sekundach")
+    serwer.add_argument('--bledy', type=float, default=0.05, help="odsetek losowych błędów 503")
+    serwer.add_argument('--fragmenty', type=int, default=8, help="liczba fragmentów odpowiedzi strumieniowej")
+    args = parser.parse_args()
+
+    if args.polecenie == 'serwer':
+        uruchom_serwer_testowy(args.port, args.rpm, args.tpm, args.opoznienie, args.bledy, args.fragmenty)
+        return
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    plik_zapytan = os.path.join(biezacy_folder, args.zapytania)
+    plik_odpowiedzi = os.path.join(biezacy_folder, args.wyjscie)
+    if not os.path.exists(plik_zapytan):
+        print(f"BŁĄD: Nie znaleziono pliku z zapytaniami: '{plik_zapytan}'.")
+        return
+    adres = args.adres or ADRES_API.format(model=args.model)
+    klucz_api = os.environ.get(ZMIENNA_KLUCZA_API)
+    if args.adres is None and not klucz_api:
+        print(f"BŁĄD: Brak klucza API w zmiennej środowiskowej {ZMIENNA_KLUCZA_API}.")
+        return
+    sciezka_cache = None if args.bez_cache else os.path.join(biezacy_folder, '..', FOLDER_MANIFESTOW, NAZWA_PLIKU_CACHE)
+    try:
+        walidator = skompiluj_walidator(os.path.join(biezacy_folder, PIESNI_SOURCE_FILE_NAME),
+                                        os.path.join(biezacy_folder, PLIK_PIESNI))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ostrzeżenie: Nie udało się wczytać bazy pieśni ({e}) - sprawdzam tylko strukturę odpowiedzi.")
+        walidator = None
+
+    liczniki = wyslij_wszystkie(plik_zapytan, plik_odpowiedzi, adres, klucz_api, args.rpm, args.tpm,
+                                args.watki, sciezka_cache, args.model, walidator)
+
+    print("\n--- Podsumowanie ---")
+    print(f"Wysłane: {liczniki['wyslane']} (prób: {liczniki['proby']}), z pamięci podręcznej: {liczniki['z_cache']}, błędy: {liczniki['bledy']}")
+    print(f"Czas: {liczniki['sekundy']:.1f} s, przepustowość: {liczniki['tokeny'] / max(liczniki['sekundy'], 1e-9) * 60:.0f} tokenów/min")
+    print(f"Tokeny wejściowe: {liczniki['tokeny']}, z pamięci podręcznej dostawcy: {liczniki['tokeny_z_cache']}")
+    print(f"Odpowiedzi dopisano do pliku '{plik_odpowiedzi}'.")
+
+    if args.zastosuj:
+        wynik = wczytaj_odpowiedzi(plik_odpowiedzi, os.path.join(biezacy_folder, KATALOG_BAZOWY_LEKCJONARZA),
+                                   os.path.join(biezacy_folder, PLIK_BLEDOW), walidator=walidator)
+        print(f"Zastosowano dni: {wynik['zastosowane']}, odrzucono: {wynik['odrzucone']}, błędne odpowiedzi: {wynik['bledne_odpowiedzi']}")
+
+
+if __name__ == '__main__':
+    main()
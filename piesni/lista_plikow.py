@@ -1,6 +1,11 @@
 import os
+import sys
 import json
 
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, aktualizuj_manifest
+
 # robi listę plików w folderze źródłowym i zapisuje ją do pliku .json
 
 def stworz_liste_plikow_json(folder_zrodlowy: str, plik_docelowy: str):
@@ -22,15 +27,13 @@ def stworz_liste_plikow_json(folder_zrodlowy: str, plik_docelowy: str):
 
     print(f"Przeszukiwanie folderu '{folder_zrodlowy}'...")
 
-    # Przechodzenie przez wszystkie pliki i podfoldery
-    for root, _, files in os.walk(folder_zrodlowy):
-        for file in files:
-            # Sprawdzanie, czy plik ma rozszerzenie .json
-            if file.endswith('.json'):
-                # Pobieranie nazwy pliku bez rozszerzenia
-                nazwa_klucza = os.path.splitext(file)[0]
-                # Dodawanie klucza z pustą wartością do słownika
-                wyniki[nazwa_klucza] = ""
+    # Lista plików pochodzi z manifestu drzewa, odświeżanego przyrostowo (stat zamiast ponownego czytania)
+    folder_manifestow = os.path.join(os.path.dirname(os.path.abspath(folder_zrodlowy)), FOLDER_MANIFESTOW)
+    for sciezka_wzgledna in aktualizuj_manifest(folder_zrodlowy, folder_manifestow):
+        # Pobieranie nazwy pliku bez rozszerzenia
+        nazwa_klucza = os.path.splitext(os.path.basename(sciezka_wzgledna))[0]
+        # Dodawanie klucza z pustą wartością do słownika
+        wyniki[nazwa_klucza] = ""
 
     # Sprawdzenie, czy znaleziono jakiekolwiek pliki
     if not wyniki:
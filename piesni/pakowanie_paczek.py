@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import argparse
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest, bez_sekcji
+
+# Pakuje dni do paczek dla modelu według szacowanej liczby tokenów (zamiast stałej liczby plików
+# na folder) algorytmem first-fit-decreasing i zapisuje każdą paczkę jako jedną linię requests.jsonl.
+
+# --- Konfiguracja ---
+# Folder źródłowy z dniami (o jeden poziom wyżej niż skrypt)
+FOLDER_ZRODLOWY = '../Lekcjonarz_JSON2'
+
+# Plik z instrukcją dla modelu, dołączaną do każdego zapytania
+PLIK_INSTRUKCJI = '../instrukcje.txt'
+
+# Plik wyjściowy z zapytaniami (jedna paczka = jedna linia JSON)
+PLIK_WYJSCIOWY = 'requests.jsonl'
+
+# Maksymalna szacowana liczba tokenów danych dni w jednym zapytaniu (bez instrukcji)
+BUDZET_TOKENOW = 30000
+
+# Średnia liczba znaków na token dla polskiego tekstu - wystarczająca do szacowania rozmiaru
+ZNAKOW_NA_TOKEN = 3.5
+
+
+def normalizuj_tekst(tekst: str) -> str:
+    """
+    Sprowadza tekst instrukcji do postaci kanonicznej (bez BOM, końce linii '\\n', bez białych znaków
+    na końcach linii), żeby wspólny początek zapytań był identyczny bajt w bajt i trafiał
+    w pamięć podręczną prefiksów po stronie dostawcy modelu.
+    """
+    tekst = tekst.lstrip('\ufeff').replace('\r\n', '\n').replace('\r', '\n')
+    return '\n'.join(linia.rstrip() for linia in tekst.split('\n')).strip()
+
+
+def wczytaj_instrukcje(sciezka: str) -> str:
+    """Wczytuje plik z instrukcją dla modelu w postaci kanonicznej (patrz normalizuj_tekst)."""
+    with open(sciezka, 'r', encoding='utf-8') as f:
+        return normalizuj_tekst(f.read())
+
+
+def szacuj_tokeny(tekst: str) -> int:
+    """Szacuje liczbę tokenów tekstu na podstawie liczby znaków."""
+    return int(len(tekst) / ZNAKOW_NA_TOKEN) + 1
+
+
+def przygotuj_dzien(folder_zrodlowy: str, sciezka_w_drzewie: str) -> Tuple[str, int]:
+    """
+    Wczytuje plik dnia, dopisuje na początku klucz 'sciezka' (jak kopiowanie_plikow.py)
+    i zwraca jego zwartą postać JSON wraz z szacowaną liczbą tokenów.
+
+    Args:
+        folder_zrodlowy (str): Ścieżka do folderu Lekcjonarz_JSON2.
+        sciezka_w_drzewie (str): Ścieżka pliku względem folderu źródłowego.
+
+    Returns:
+        Krotka (tekst JSON dnia, szacowana liczba tokenów).
+    """
+    with open(os.path.join(folder_zrodlowy, sciezka_w_drzewie), 'r', encoding='utf-8') as f:
+        dane_pliku = json.load(f, object_pairs_hook=OrderedDict)
+
+    nazwa_drzewa = os.path.basename(os.path.normpath(folder_zrodlowy))
+    dane = OrderedDict()
+    dane['sciezka'] = f"{nazwa_drzewa}/{sciezka_w_drzewie}"
+    # Pozostałość 'sciezka' w samym pliku (np. po ręcznym wklejeniu odpowiedzi) nie może nadpisać prawdziwej ścieżki
+    dane.update((klucz, wartosc) for klucz, wartosc in dane_pliku.items() if klucz != 'sciezka')
+
+    tekst = json.dumps(dane, ensure_ascii=False)
+    return tekst, szacuj_tokeny(tekst)
+
+
+def pakuj_ffd(rozmiary: Dict[str, int], budzet: int) -> List[List[str]]:
+    """
+    Pakuje elementy do paczek algorytmem first-fit-decreasing: elementy od największego
+    trafiają do pierwszej paczki, w której jest jeszcze miejsce. Element większy niż budżet
+    dostaje własną paczkę.
+
+    Args:
+        rozmiary (dict): Klucz elementu -> rozmiar w tokenach.
+        budzet (int): Maksymalny łączny rozmiar paczki.
+
+    Returns:
+        Lista paczek (list kluczy elementów).
+    """
+    paczki: List[List[str]] = []
+    wolne: List[int] = []
+
+    for klucz in sorted(rozmiary, key=lambda k: (-rozmiary[k], k)):
+        rozmiar = rozmiary[klucz]
+        for i, miejsce in enumerate(wolne):
+            if rozmiar <= miejsce:
+                paczki[i].append(klucz)
+                wolne[i] -= rozmiar
+                break
+        else:
+            paczki.append([klucz])
+            wolne.append(budzet - rozmiar)
+
+    # Wewnątrz paczki zachowujemy kolejność alfabetyczną, której oczekuje instrukcja
+    return [sorted(paczka) for paczka in paczki]
+
+
+def zbuduj_zapytanie(klucz: str, instrukcja: str, dni_json: List[str]) -> dict:
+    """
+    Buduje jedną linię pliku wsadowego: instrukcja systemowa + tablica JSON z dniami paczki.
+
+    Args:
+        klucz (str): Identyfikator zapytania (np. 'paczka-001').
+        instrukcja (str): Treść instrukcji systemowej.
+        dni_json (list): Zwarte teksty JSON kolejnych dni.
+
+    Returns:
+        Słownik gotowy do zapisania jako linia JSONL.
+    """
+    return {
+        'key': klucz,
+        'request': {
+            'system_instruction': {'parts': [{'text': instrukcja}]},
+            'contents': [{'role': 'user', 'parts': [{'text': '[' + ',\n'.join(dni_json) + ']'}]}]
+        }
+    }
+
+
+def zapisz_paczki(folder_zrodlowy: str, sciezki: List[str], instrukcja: str,
+                  plik_wyjsciowy: str, budzet: int) -> Tuple[List[Tuple[str, int]], int]:
+    """
+    Szacuje rozmiar każdego dnia, pakuje dni pod budżet tokenów i zapisuje zapytania do pliku JSONL.
+
+    Args:
+        folder_zrodlowy (str): Ścieżka do folderu z dniami.
+        sciezki (list): Ścieżki dni względem folderu źródłowego.
+        instrukcja (str): Treść instrukcji systemowej.
+        plik_wyjsciowy (str): Ścieżka do pliku requests.jsonl.
+        budzet (int): Budżet tokenów danych na jedno zapytanie.
+
+    Returns:
+        Krotka (lista (klucz paczki, szacowana liczba tokenów danych) dla każdej zapisanej paczki,
+        liczba spakowanych dni - bez plików pominiętych z powodu błędu odczytu).
+    """
+    teksty, rozmiary = {}, {}
+    for sciezka in sciezki:
+        try:
+            teksty[sciezka], rozmiary[sciezka] = przygotuj_dzien(folder_zrodlowy, sciezka)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ostrzeżenie: Pomijam plik '{sciezka}' z powodu błędu odczytu: {e}")
+            continue
+        if rozmiary[sciezka] > budzet:
+            print(f"Ostrzeżenie: Dzień '{sciezka}' ({rozmiary[sciezka]} tokenów) przekracza budżet - trafi do osobnej paczki.")
+
+    paczki = pakuj_ffd(rozmiary, budzet)
+    podsumowanie = []
+    with open(plik_wyjsciowy, 'w', encoding='utf-8') as f:
+        for numer, paczka in enumerate(paczki, 1):
+            klucz = f"paczka-{numer:03d}"
+            zapytanie = zbuduj_zapytanie(klucz, instrukcja, [teksty[s] for s in paczka])
+            f.write(json.dumps(zapytanie, ensure_ascii=False) + '\n')
+            podsumowanie.append((klucz, sum(rozmiary[s] for s in paczka)))
+    return podsumowanie, len(rozmiary)
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Pakowanie dni do zapytań dla modelu według budżetu tokenów.")
+    parser.add_argument('--budzet', type=int, default=BUDZET_TOKENOW, help=f"budżet tokenów danych na zapytanie (domyślnie {BUDZET_TOKENOW})")
+    parser.add_argument('--wyjscie', default=PLIK_WYJSCIOWY, help=f"plik wyjściowy JSONL (domyślnie {PLIK_WYJSCIOWY})")
+    parser.add_argument('--tylko-bez-piesni', action='store_true', help="pakuj tylko dni bez piesniSugerowane")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+    sciezka_instrukcji = os.path.join(biezacy_folder, PLIK_INSTRUKCJI)
+    plik_wyjsciowy = os.path.join(biezacy_folder, args.wyjscie)
+
+    if not os.path.isdir(folder_zrodlowy):
+        print(f"BŁĄD: Folder źródłowy '{folder_zrodlowy}' nie istnieje.")
+        return
+    try:
+        instrukcja = wczytaj_instrukcje(sciezka_instrukcji)
+    except FileNotFoundError:
+        print(f"BŁĄD: Nie znaleziono pliku z instrukcją: '{sciezka_instrukcji}'.")
+        return
+
+    manifest = odswiez_manifest(folder_zrodlowy, os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW))
+    sciezki = sorted(bez_sekcji(manifest) if args.tylko_bez_piesni else manifest['pliki'])
+    if not sciezki:
+        print("Brak dni do spakowania.")
+        return
+
+    podsumowanie, spakowane = zapisz_paczki(folder_zrodlowy, sciezki, instrukcja, plik_wyjsciowy, args.budzet)
+    if not podsumowanie:
+        print(f"Nie spakowano żadnego dnia - wszystkie {len(sciezki)} pliki pominięto.")
+        return
+    lacznie = sum(tokeny for _, tokeny in podsumowanie)
+    print(f"Spakowano {spakowane} dni do {len(podsumowanie)} zapytań (budżet {args.budzet} tokenów).")
+    print(f"Szacowane tokeny danych: {lacznie}, średnie wykorzystanie budżetu: {lacznie / (len(podsumowanie) * args.budzet):.1%}.")
+    print(f"Instrukcja dołączana do każdego zapytania: ~{szacuj_tokeny(instrukcja)} tokenów.")
+    print(f"Zapytania zapisano w pliku '{plik_wyjsciowy}'.")
+
+
+if __name__ == '__main__':
+    main()
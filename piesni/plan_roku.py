@@ -0,0 +1,341 @@
+import os
+import re
+import sys
+import json
+import bisect
+import argparse
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest, wczytaj_json, zapisz_json_atomowo
+from plan_dni import PlanDni, zbuduj_plan
+from pakowanie_paczek import FOLDER_ZRODLOWY, PLIK_INSTRUKCJI
+from przetwarzanie_wsadowe import KATALOG_BAZOWY_LEKCJONARZA, zastosuj_dzien
+from skladanie_promptu import (PLIK_PIESNI, numery_swietych, parsuj_opis, wczytaj_piesni,
+                               wczytaj_sekcje_instrukcji, wybierz_kandydatow)
+from szukanie_niezgodnosci import PIESNI_SOURCE_FILE_NAME
+from walidator_sugestii import REGULY_MOMENTOW, skompiluj_walidator
+
+# Lokalny, deterministyczny dobór pieśni na cały rok bez wywołań modelu. Dni są brane w kolejności
+# z kalendarza (Kalendarz/<rok>.json), dla każdego dnia kandydaci i dozwolone momenty pochodzą z tych samych
+# reguł co minimalne prompty (skladanie_promptu.py: najpierw okres, eucharystyczne na ofiarowanie i komunię,
+# bez zakazanych hymnów), a liczba pieśni na moment - z reguł walidatora (minimum z REGULY_MOMENTOW).
+# Ocena pieśni w dniu to trafność względem czytań (ranking z trafnosc_czytan.py, jeśli jest) plus premie
+# za okres i świętego dnia. Kary za powtórzenia zależą od odległości w kalendarzu, a ta sama pieśń na wejście
+# w dwie kolejne niedziele jest zabroniona. Najpierw działa zachłanny dobór w kolejności kalendarza,
+# potem przeszukiwanie lokalne wymienia pojedyncze pieśni, dopóki poprawia to wynik całego roku.
+# Warianty jednej pieśni (np. 349a-d) liczą się przy powtórzeniach jako ta sama pieśń, a plan, który przypisuje
+# jeden plik dnia kilku datom, nie jest nanoszony na pliki dni (--zastosuj zapisałoby plik dwa razy).
+
+# --- Konfiguracja ---
+# Folder z kalendarzami (względem lokalizacji skryptu) i domyślny rok
+FOLDER_KALENDARZA = '../Kalendarz'
+ROK = 2025
+
+# Mapa nazw z kalendarza na nazwy plików dni
+PLIK_NAZW_KALENDARZA = 'slownik_poprawiony_i_odwrocony.json'
+
+# Plik z planem (w folderze manifestów); {rok} jest podmieniany
+NAZWA_PLIKU_PLANU = 'plan_piesni_{rok}.json'
+
+# Wagi oceny: trafność względem czytań (po normalizacji do 0-1 w obrębie dnia) i premie grup
+WAGA_TRAFNOSCI = 1.0
+PREMIA_OKRESU = 0.6
+PREMIA_SWIETYCH = 0.6
+
+# Kara za użycie tej samej pieśni w dniach odległych o d <= ODSTEP_POWTORZEN: KARA_POWTORZENIA * (1 - (d - 1) / ODSTEP_POWTORZEN)
+ODSTEP_POWTORZEN = 14
+KARA_POWTORZENIA = 0.8
+
+# Kara za tę samą pieśń w tym samym momencie w dwie kolejne niedziele (dla 'wejscie' - zakaz)
+KARA_KOLEJNYCH_NIEDZIEL = 1.0
+
+# Przeszukiwanie lokalne: ilu najlepszych kandydatów rozważać na miejsce i maksymalna liczba przejść
+KANDYDACI_ZAMIANY = 30
+MAKS_PRZEJSC = 10
+
+# Przedrostek wariantu w tytule pieśni ('349a. ', '349b. ' ...) - warianty jednej pieśni liczą się jako ta sama pieśń
+PRZEDROSTEK_WARIANTU = re.compile(r'^\d+[a-z]\.\s*')
+
+# Kolejność wypełniania momentów (najbardziej ograniczone najpierw) i kolejność w wyniku
+KOLEJNOSC_DOBORU = ['ofiarowanie', 'komunia', 'wejscie', 'rozeslanie', 'uwielbienie', 'ogolne']
+KOLEJNOSC_MOMENTOW = ['wejscie', 'ofiarowanie', 'komunia', 'uwielbienie', 'rozeslanie', 'ogolne']
+
+
+def dni_roku(kalendarz: Dict[str, dict], nazwy: Dict[str, str], pliki: List[str]) -> Tuple[List[dict], List[str]]:
+    """
+    Przypisuje datom z kalendarza pliki dni (złączenie z plan_dni.py).
+
+    Returns:
+        Krotka (lista {'data', 'sciezka', 'niedziela'} w kolejności dat, daty bez pliku).
+    """
+    plan = PlanDni(zbuduj_plan(kalendarz, nazwy, pliki))
+    dni = [{'data': dzien['data'], 'sciezka': dzien['sciezka'], 'niedziela': dzien['niedziela']} for dzien in plan.rozwiazane()]
+    return dni, plan.nierozwiazane()
+
+
+def powtorzone_pliki(dni: List[dict]) -> Dict[str, List[str]]:
+    """Pliki dni przypisane więcej niż jednej dacie: ścieżka -> daty."""
+    daty = defaultdict(list)
+    for dzien in dni:
+        daty[dzien['sciezka']].append(dzien['data'])
+    return {sciezka: lista for sciezka, lista in daty.items() if len(lista) > 1}
+
+
+def grupy_piesni(piesni: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Numer pieśni -> tytuł bez przedrostka wariantu (warianty jednej pieśni mają wspólną grupę)."""
+    return {p['numerSiedl']: PRZEDROSTEK_WARIANTU.sub('', p.get('tytul', '').strip()) or p['numerSiedl'] for p in piesni}
+
+
+def kara_odleglosci(odleglosc: int) -> float:
+    """Kara za tę samą pieśń w dwóch dniach odległych o podaną liczbę pozycji w kalendarzu."""
+    if odleglosc == 0 or odleglosc > ODSTEP_POWTORZEN:
+        return 0.0
+    return KARA_POWTORZENIA * (1 - (odleglosc - 1) / ODSTEP_POWTORZEN)
+
+
+class Plan:
+    """
+    Stan przydziału pieśni: dla każdego dnia lista miejsc (moment, numer), oceny bazowe kandydatów
+    i indeks użyć pieśni (grupa -> posortowane pozycje dni), z którego liczone są kary. Powtórzenia są liczone
+    po grupach (grupy_piesni), więc warianty jednej pieśni nie trafią do jednego dnia jako różne pieśni.
+    """
+
+    def __init__(self, dni: List[dict], oceny: List[Dict[str, Dict[str, float]]], grupy: Optional[Dict[str, str]] = None):
+        self.dni = dni
+        self.oceny = oceny
+        self.grupy = grupy or {}
+        self.miejsca: List[List[List]] = [[] for _ in dni]
+        self.uzycia: Dict[str, List[int]] = defaultdict(list)
+        self.niedziele = [i for i, d in enumerate(dni) if d['niedziela']]
+        self.sasiednie_niedziele: Dict[int, List[int]] = {}
+        for k, i in enumerate(self.niedziele):
+            self.sasiednie_niedziele[i] = self.niedziele[max(k - 1, 0):k] + self.niedziele[k + 1:k + 2]
+
+    def grupa(self, numer: str) -> str:
+        """Grupa pieśni (numer, jeśli pieśń nie ma wariantów w bazie)."""
+        return self.grupy.get(numer, numer)
+
+    def kara(self, numer: str, dzien: int, moment: str) -> float:
+        """Suma kar za użycie pieśni (lub jej wariantu) w danym dniu względem użyć w pozostałych dniach."""
+        grupa = self.grupa(numer)
+        uzycia = self.uzycia[grupa]
+        od = bisect.bisect_left(uzycia, dzien - ODSTEP_POWTORZEN)
+        do = bisect.bisect_right(uzycia, dzien + ODSTEP_POWTORZEN)
+        suma = sum(kara_odleglosci(abs(j - dzien)) for j in uzycia[od:do])
+        for j in self.sasiednie_niedziele.get(dzien, ()):
+            if any(m == moment and n is not None and self.grupa(n) == grupa for m, n in self.miejsca[j]):
+                suma += KARA_KOLEJNYCH_NIEDZIEL
+        return suma
+
+    def dozwolona(self, numer: str, dzien: int, moment: str, miejsce: Optional[int] = None) -> bool:
+        """Ograniczenia twarde: pieśń (z wariantami) najwyżej raz w dniu i inne wejście w kolejne niedziele."""
+        grupa = self.grupa(numer)
+        if any(n is not None and self.grupa(n) == grupa for k, (_, n) in enumerate(self.miejsca[dzien]) if k != miejsce):
+            return False
+        if moment == 'wejscie':
+            for j in self.sasiednie_niedziele.get(dzien, ()):
+                if any(m == 'wejscie' and n is not None and self.grupa(n) == grupa for m, n in self.miejsca[j]):
+                    return False
+        return True
+
+    def przypisz(self, dzien: int, miejsce: int, numer: str):
+        """Wstawia pieśń na miejsce (podmieniając poprzednią) i aktualizuje indeks użyć."""
+        moment, stary = self.miejsca[dzien][miejsce]
+        if stary is not None:
+            self.uzycia[self.grupa(stary)].remove(dzien)
+        self.miejsca[dzien][miejsce] = [moment, numer]
+        bisect.insort(self.uzycia[self.grupa(numer)], dzien)
+
+    def wynik(self) -> float:
+        """Łączna ocena planu: suma ocen bazowych minus kary (każda para dni liczona raz)."""
+        suma = 0.0
+        for dzien, miejsca in enumerate(self.miejsca):
+            for moment, numer in miejsca:
+                if numer is not None:
+                    suma += self.oceny[dzien][moment][numer] - self.kara(numer, dzien, moment) / 2
+        return suma
+
+
+def oceny_dnia(kandydaci: List[Dict[str, Any]], okres: List[str], swieci: set,
+               trafnosc: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+    """Ocena bazowa każdej dozwolonej pary (moment, pieśń) w dniu."""
+    oceny = {moment: {} for moment in KOLEJNOSC_DOBORU}
+    for kandydat in kandydaci:
+        ocena = WAGA_TRAFNOSCI * trafnosc.get(kandydat['numer'], 0.0)
+        if kandydat['kategoria'] in okres:
+            ocena += PREMIA_OKRESU
+        if int(kandydat['numer']) in swieci:
+            ocena += PREMIA_SWIETYCH
+        for moment in kandydat['momenty']:
+            if kandydat['kategoria'] not in REGULY_MOMENTOW[moment][3]:
+                oceny[moment][kandydat['numer']] = ocena
+    return oceny
+
+
+def rozwiaz(plan: Plan) -> Tuple[float, float, int]:
+    """
+    Wypełnia plan zachłannie w kolejności kalendarza, a następnie poprawia go przeszukiwaniem lokalnym
+    (zamiana jednej pieśni na inną z najlepszych kandydatów, jeśli zwiększa wynik całego planu).
+
+    Returns:
+        Krotka (wynik po doborze zachłannym, wynik końcowy, liczba wykonanych zamian).
+    """
+    for dzien, oceny in enumerate(plan.oceny):
+        for moment in KOLEJNOSC_DOBORU:
+            for _ in range(REGULY_MOMENTOW[moment][0]):
+                plan.miejsca[dzien].append([moment, None])
+                miejsce = len(plan.miejsca[dzien]) - 1
+                najlepsza = None
+                for numer, ocena in sorted(oceny[moment].items(), key=lambda para: (-para[1], int(para[0]))):
+                    if najlepsza is not None and ocena <= najlepsza[0]:
+                        break
+                    if plan.dozwolona(numer, dzien, moment, miejsce):
+                        wartosc = ocena - plan.kara(numer, dzien, moment)
+                        if najlepsza is None or wartosc > najlepsza[0]:
+                            najlepsza = (wartosc, numer)
+                if najlepsza is not None:
+                    plan.przypisz(dzien, miejsce, najlepsza[1])
+    po_zachlannym = plan.wynik()
+
+    najlepsi = [{m: sorted(o, key=lambda n: (-o[n], int(n)))[:KANDYDACI_ZAMIANY] for m, o in oceny.items()}
+                for oceny in plan.oceny]
+    zamiany = 0
+    for _ in range(MAKS_PRZEJSC):
+        poprawa = False
+        for dzien, miejsca in enumerate(plan.miejsca):
+            for miejsce, (moment, obecny) in enumerate(miejsca):
+                if obecny is None:
+                    continue
+                oceny = plan.oceny[dzien][moment]
+                plan.uzycia[plan.grupa(obecny)].remove(dzien)
+                biezaca = oceny[obecny] - plan.kara(obecny, dzien, moment)
+                najlepsza = (biezaca, obecny)
+                for numer in najlepsi[dzien][moment]:
+                    if numer != obecny and oceny[numer] > najlepsza[0] and plan.dozwolona(numer, dzien, moment, miejsce):
+                        wartosc = oceny[numer] - plan.kara(numer, dzien, moment)
+                        if wartosc > najlepsza[0] + 1e-9:
+                            najlepsza = (wartosc, numer)
+                bisect.insort(plan.uzycia[plan.grupa(obecny)], dzien)
+                if najlepsza[1] != obecny:
+                    plan.przypisz(dzien, miejsce, najlepsza[1])
+                    zamiany += 1
+                    poprawa = True
+        if not poprawa:
+            break
+    return po_zachlannym, plan.wynik(), zamiany
+
+
+def opis_wpisu(kandydat: Dict[str, Any], okres: List[str], swieci: set, trafnosc: float, moment: str) -> str:
+    """Krótkie, jawne uzasadnienie doboru (plan powstaje bez modelu, więc opis mówi tylko, skąd pieśń się wzięła)."""
+    if int(kandydat['numer']) in swieci:
+        powod = "Pieśń o świętym obchodzonym w tym dniu"
+    elif kandydat['kategoria'] in okres:
+        powod = f"Pieśń okresu ({kandydat['kategoria']})"
+    elif moment in ('ofiarowanie', 'komunia'):
+        powod = "Pieśń eucharystyczna"
+    else:
+        powod = f"Pieśń z kategorii {kandydat['kategoria']}"
+    if trafnosc >= 0.5:
+        powod += ", tematycznie bliska czytaniom dnia"
+    return powod + "."
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Lokalny dobór pieśni na cały rok liturgiczny (bez modelu).")
+    parser.add_argument('--rok', type=int, default=ROK, help=f"rok kalendarza z folderu Kalendarz (domyślnie {ROK})")
+    parser.add_argument('--zastosuj', action='store_true', help="zapisz plan w plikach dni bez piesniSugerowane")
+    parser.add_argument('--nadpisz', action='store_true', help="razem z --zastosuj: nadpisz także istniejące propozycje")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+    folder_manifestow = os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW)
+    plik_kalendarza = os.path.join(biezacy_folder, FOLDER_KALENDARZA, f"{args.rok}.json")
+    plik_piesni = os.path.join(biezacy_folder, PLIK_PIESNI)
+
+    try:
+        with open(plik_kalendarza, 'r', encoding='utf-8') as f:
+            kalendarz = json.load(f)
+        with open(os.path.join(biezacy_folder, FOLDER_KALENDARZA, PLIK_NAZW_KALENDARZA), 'r', encoding='utf-8') as f:
+            nazwy = json.load(f)
+        _, linie_opisu = wczytaj_sekcje_instrukcji(os.path.join(biezacy_folder, PLIK_INSTRUKCJI))
+        piesni = wczytaj_piesni(plik_piesni)
+    except (OSError, ValueError) as e:
+        print(f"BŁĄD: Nie udało się wczytać kalendarza, instrukcji lub bazy pieśni: {e}")
+        return
+    opis = parsuj_opis(linie_opisu)
+
+    manifest = odswiez_manifest(folder_zrodlowy, folder_manifestow)
+    dni, bez_pliku = dni_roku(kalendarz, nazwy, sorted(manifest['pliki']))
+    if not dni:
+        print("Brak dni kalendarza, którym udało się przypisać pliki.")
+        return
+
+    # Trafność względem czytań z rankingu trafnosc_czytan.py (bez rankingu liczą się tylko premie)
+    ranking = wczytaj_json(os.path.join(folder_manifestow, 'trafnosc_czytan.json'), {'dni': {}})['dni']
+    if not ranking:
+        print("Ostrzeżenie: Brak rankingu trafności (trafnosc_czytan.py) - dobór tylko według okresu i świętych.")
+
+    oceny, konteksty = [], []
+    for dzien in dni:
+        tytul = manifest['pliki'][dzien['sciezka']].get('tytul_dnia') or ''
+        kandydaci, okres = wybierz_kandydatow(dzien['sciezka'], tytul, piesni, opis)
+        swieci = numery_swietych(tytul, opis)
+        lista = ranking.get(dzien['sciezka'], {}).get('kandydaci', [])
+        maksimum = lista[0][1] if lista else 1.0
+        trafnosc = {numer: wynik / maksimum for numer, wynik in lista}
+        oceny.append(oceny_dnia(kandydaci, okres, swieci, trafnosc))
+        konteksty.append(({k['numer']: k for k in kandydaci}, okres, swieci, trafnosc))
+
+    plan = Plan(dni, oceny, grupy_piesni(piesni))
+    po_zachlannym, wynik, zamiany = rozwiaz(plan)
+
+    wynikowe = []
+    for dzien, miejsca, (kandydaci, okres, swieci, trafnosc) in zip(dni, plan.miejsca, konteksty):
+        wpisy = []
+        for moment, numer in sorted(miejsca, key=lambda m: KOLEJNOSC_MOMENTOW.index(m[0])):
+            if numer is None:
+                continue
+            kandydat = kandydaci[numer]
+            wpisy.append({'numer': numer, 'piesn': kandydat['tytul'],
+                          'opis': opis_wpisu(kandydat, okres, swieci, trafnosc.get(numer, 0.0), moment), 'moment': moment})
+        wynikowe.append({'sciezka': f"{os.path.basename(folder_zrodlowy)}/{dzien['sciezka']}", 'data': dzien['data'],
+                         'piesniSugerowane': wpisy})
+    plik_planu = os.path.join(folder_manifestow, NAZWA_PLIKU_PLANU.format(rok=args.rok))
+    zapisz_json_atomowo(plik_planu, wynikowe, wciecie=2)
+
+    print("\n--- Podsumowanie ---")
+    print(f"Dni w planie: {len(dni)}, dat bez pliku dnia: {len(bez_pliku)}.")
+    print(f"Wynik planu: po doborze zachłannym {po_zachlannym:.1f}, po przeszukiwaniu lokalnym {wynik:.1f} ({zamiany} zamian).")
+    print(f"Plan zapisano w pliku '{os.path.normpath(plik_planu)}'.")
+
+    if args.zastosuj:
+        powtorzone = powtorzone_pliki(dni)
+        if powtorzone:
+            print("BŁĄD: Plan przypisuje ten sam plik dnia kilku datom - nie zastosowano go w plikach dni:")
+            for sciezka, daty in sorted(powtorzone.items()):
+                print(f"  {sciezka}: {', '.join(daty)}")
+            return
+        waliduj = skompiluj_walidator(os.path.join(biezacy_folder, PIESNI_SOURCE_FILE_NAME), plik_piesni)
+        katalog_bazowy = os.path.join(biezacy_folder, KATALOG_BAZOWY_LEKCJONARZA)
+        zastosowane, pominiete, odrzucone = 0, 0, 0
+        for dzien in wynikowe:
+            if not args.nadpisz and 'piesniSugerowane' in manifest['pliki'][dzien['sciezka'].split('/', 1)[1]]['sekcje']:
+                pominiete += 1
+                continue
+            bledy, _ = waliduj(dzien)
+            if bledy:
+                odrzucone += 1
+                print(f"Ostrzeżenie: Plan dla '{dzien['sciezka']}' nie przeszedł walidacji: {bledy[0]}")
+                continue
+            zastosuj_dzien(katalog_bazowy, dzien)
+            zastosowane += 1
+        print(f"Zastosowano plan w {zastosowane} plikach dni, pominięto {pominiete} z istniejącymi propozycjami, odrzucono {odrzucone}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+import os
+import re
+import sys
+import json
+import argparse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import DRZEWA, FOLDER_MANIFESTOW, odswiez_manifest, bez_sekcji, wczytaj_json, zapisz_json_atomowo
+from pakowanie_paczek import BUDZET_TOKENOW, PLIK_INSTRUKCJI, PLIK_WYJSCIOWY, wczytaj_instrukcje, zapisz_paczki
+from tolerancyjny_json import parsuj_tekst
+
+# Łączy cały obieg pracy z modelem w dwa kroki:
+#   zbuduj  - tworzy plik z zapytaniami wsadowymi (requests.jsonl) z korpusu dni,
+#   wczytaj - strumieniowo czyta plik z odpowiedziami linia po linii, waliduje wynik
+#             i od razu podmienia 'piesniSugerowane' w plikach dni.
+# Postęp wczytywania (pozycja w pliku odpowiedzi) zapisywany jest po każdej linii,
+# więc przerwane wczytywanie można wznowić od miejsca, w którym się zatrzymało.
+
+# --- Konfiguracja ---
+# Folder źródłowy z dniami (o jeden poziom wyżej niż skrypt)
+FOLDER_ZRODLOWY = '../Lekcjonarz_JSON2'
+
+# Katalog, względem którego rozwiązywane są ścieżki 'sciezka' z odpowiedzi modelu;
+# zapis dozwolony jest tylko w drzewach dni z manifest.DRZEWA
+KATALOG_BAZOWY_LEKCJONARZA = '../'
+
+# Domyślny plik z odpowiedziami modelu (jedna odpowiedź na linię)
+PLIK_ODPOWIEDZI = 'responses.jsonl'
+
+# Plik, do którego trafiają klucze zapytań z błędną odpowiedzią (do ponownego wysłania)
+PLIK_BLEDOW = 'bledy_wsadu.json'
+
+# Dozwolone wartości pola 'moment'
+DOZWOLONE_MOMENTY = {'wejscie', 'ofiarowanie', 'komunia', 'uwielbienie', 'rozeslanie', 'ogolne'}
+
+WYMAGANE_POLA_PIESNI = ('numer', 'piesn', 'opis', 'moment')
+
+
+def czytaj_linie_od(sciezka: str, pozycja: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    Czyta plik linia po linii od zadanej pozycji bajtowej, nie ładując go w całości do pamięci.
+
+    Yields:
+        Pary (pozycja końca linii, treść linii).
+    """
+    with open(sciezka, 'rb') as f:
+        f.seek(pozycja)
+        for linia in iter(f.readline, b''):
+            yield f.tell(), linia
+
+
+def wyciagnij_tekst(odpowiedz: Dict[str, Any]) -> Optional[str]:
+    """Wyciąga tekst wygenerowany przez model z jednej linii pliku odpowiedzi."""
+    try:
+        czesci = odpowiedz['response']['candidates'][0]['content']['parts']
+    except (KeyError, IndexError, TypeError):
+        return None
+    return ''.join(czesc.get('text', '') for czesc in czesci)
+
+
+def domknij_tablice(tekst: str) -> str:
+    """
+    Instrukcja każe zwrócić sekwencję obiektów zaczynającą się od przecinka, bez nawiasów
+    kwadratowych - tu usuwany jest blok kodu Markdown i tekst jest domykany do tablicy JSON.
+    """
+    tekst = tekst.strip()
+    if tekst.startswith('```'):
+        tekst = tekst.split('\n', 1)[1] if '\n' in tekst else ''
+        tekst = tekst.rsplit('```', 1)[0]
+    tekst = tekst.strip().lstrip(',').strip()
+    return tekst if tekst.startswith('[') else f"[{tekst}]"
+
+
+def parsuj_wynik_modelu(tekst: str) -> List[Dict[str, Any]]:
+    """
+    Zamienia odpowiedź modelu na listę obiektów dni (domkniętą przez domknij_tablice).
+    Jeśli tak domknięty tekst nie jest poprawnym JSON-em, odpowiedź przechodzi przez parser
+    tolerancyjny (tolerancyjny_json.py), który naprawia cudzysłowy, przecinki i obcięty koniec.
+
+    Raises:
+        json.JSONDecodeError: jeśli z tekstu nie udało się odzyskać żadnego obiektu.
+    """
+    tekst = domknij_tablice(tekst)
+    try:
+        wynik = json.loads(tekst)
+    except json.JSONDecodeError:
+        wyniki = list(parsuj_tekst(tekst))
+        dni = [w['obiekt'] for w in wyniki if w['obiekt'] is not None]
+        if not dni:
+            raise
+        naprawy = sum(len(w['naprawy']) for w in wyniki)
+        print(f"  Naprawiono odpowiedź modelu: {naprawy} poprawek, odzyskano {len(dni)} obiektów.")
+        return dni
+    return wynik if isinstance(wynik, list) else [wynik]
+
+
+def waliduj_dzien(dzien: Any) -> List[str]:
+    """
+    Sprawdza strukturę obiektu dnia zwróconego przez model.
+
+    Returns:
+        Lista opisów błędów (pusta, jeśli obiekt jest poprawny).
+    """
+    if not isinstance(dzien, dict):
+        return ["obiekt dnia nie jest słownikiem"]
+    bledy = []
+    sciezka = dzien.get('sciezka')
+    if (not isinstance(sciezka, str) or not sciezka.endswith('.json') or os.path.isabs(sciezka)
+            or sciezka.startswith(('/', '\\')) or re.match(r'^[A-Za-z]:', sciezka)
+            or '..' in re.split(r'[/\\]', sciezka)):
+        bledy.append(f"nieprawidłowa ścieżka: {sciezka!r}")
+    piesni = dzien.get('piesniSugerowane')
+    if not isinstance(piesni, list) or not piesni:
+        bledy.append("brak listy piesniSugerowane")
+        return bledy
+    for i, piesn in enumerate(piesni):
+        if not isinstance(piesn, dict):
+            bledy.append(f"piesniSugerowane[{i}] nie jest obiektem")
+            continue
+        brakujace = [pole for pole in WYMAGANE_POLA_PIESNI if not piesn.get(pole)]
+        if brakujace:
+            bledy.append(f"piesniSugerowane[{i}] bez pól: {', '.join(brakujace)}")
+        if piesn.get('moment') and piesn['moment'] not in DOZWOLONE_MOMENTY:
+            bledy.append(f"piesniSugerowane[{i}] ma nieznany moment {piesn['moment']!r}")
+    return bledy
+
+
+def zastosuj_dzien(katalog_bazowy: str, dzien: Dict[str, Any]):
+    """
+    Podmienia sekcję 'piesniSugerowane' w pliku dnia (zapis atomowy).
+
+    Raises:
+        ValueError: jeśli ścieżka dnia wskazuje plik spoza drzew dni (manifest.DRZEWA)
+            albo plik dnia nie zawiera obiektu JSON.
+    """
+    katalog_bazowy = os.path.realpath(katalog_bazowy)
+    sciezka_pliku = os.path.realpath(os.path.join(katalog_bazowy, dzien['sciezka']))
+    drzewa = [os.path.join(katalog_bazowy, drzewo) for drzewo in DRZEWA]
+    if not any(os.path.commonpath([drzewo, sciezka_pliku]) == drzewo for drzewo in drzewa):
+        raise ValueError(f"ścieżka {dzien['sciezka']!r} nie wskazuje pliku w {' ani '.join(DRZEWA)}")
+    with open(sciezka_pliku, 'r', encoding='utf-8') as f:
+        dane_pliku = json.load(f)
+    if not isinstance(dane_pliku, dict):
+        raise ValueError(f"plik {dzien['sciezka']!r} nie zawiera obiektu dnia")
+    dane_pliku['piesniSugerowane'] = dzien['piesniSugerowane']
+    zapisz_json_atomowo(sciezka_pliku, dane_pliku, wciecie=2)
+
+
+def wczytaj_odpowiedzi(plik_odpowiedzi: str, katalog_bazowy: str, plik_bledow: str, od_nowa: bool = False,
+                       walidator: Optional[Callable[[Any], Tuple[List[str], List[str]]]] = None) -> Dict[str, int]:
+    """
+    Strumieniowo wczytuje plik odpowiedzi i stosuje poprawne wyniki do plików dni.
+
+    Args:
+        plik_odpowiedzi (str): Ścieżka do pliku JSONL z odpowiedziami modelu.
+        katalog_bazowy (str): Katalog, względem którego rozwiązywane są ścieżki dni.
+        plik_bledow (str): Plik z listą kluczy zapytań do ponownego wysłania.
+        od_nowa (bool): Ignoruje zapisany postęp i zaczyna od początku pliku.
+        walidator: Skompilowany walidator z walidator_sugestii.py (numery, tytuły, hymny, momenty);
+            bez niego sprawdzana jest tylko struktura dni.
+
+    Returns:
+        Liczniki: przetworzone linie, zastosowane dni, odrzucone dni, błędne odpowiedzi.
+    """
+    plik_postepu = f"{plik_odpowiedzi}.postep.json"
+    postep = {} if od_nowa else wczytaj_json(plik_postepu, {})
+    rozmiar = os.path.getsize(plik_odpowiedzi)
+    pozycja = postep.get('pozycja', 0)
+    if postep.get('rozmiar', rozmiar) > rozmiar:
+        print("Ostrzeżenie: Plik odpowiedzi jest mniejszy niż przy poprzednim wczytywaniu - zaczynam od początku.")
+        pozycja = 0
+    elif pozycja:
+        print(f"Wznawiam wczytywanie od bajtu {pozycja} z {rozmiar}.")
+
+    bledy = wczytaj_json(plik_bledow, {}) if pozycja else {}
+    liczniki = {'linie': 0, 'zastosowane': 0, 'odrzucone': 0, 'bledne_odpowiedzi': 0}
+
+    # Błędy zapisywane są raz, po zakończeniu pętli (także przerwanej) - postęp nadal po każdej linii
+    try:
+        for koniec_linii, linia in czytaj_linie_od(plik_odpowiedzi, pozycja):
+            przetworz_linie(linia, koniec_linii - len(linia), katalog_bazowy, walidator, bledy, liczniki)
+            zapisz_json_atomowo(plik_postepu, {'pozycja': koniec_linii, 'rozmiar': rozmiar})
+    finally:
+        if bledy:
+            zapisz_json_atomowo(plik_bledow, bledy, wciecie=2)
+
+    return liczniki
+
+
+def przetworz_linie(linia: bytes, poczatek_linii: int, katalog_bazowy: str,
+                    walidator: Optional[Callable[[Any], Tuple[List[str], List[str]]]],
+                    bledy: Dict[str, Any], liczniki: Dict[str, int]):
+    """Waliduje jedną linię pliku odpowiedzi i stosuje poprawne dni; błędy dopisuje do 'bledy'."""
+    if not linia.strip():
+        return
+
+    liczniki['linie'] += 1
+    klucz_linii = f"bajt-{poczatek_linii}"
+    try:
+        odpowiedz = json.loads(linia)
+    except ValueError as e:
+        odpowiedz = {'key': klucz_linii, 'error': f"niepoprawna linia JSON: {e}"}
+    if not isinstance(odpowiedz, dict):
+        odpowiedz = {'key': klucz_linii, 'error': "linia JSON nie jest obiektem"}
+    klucz = str(odpowiedz.get('key', klucz_linii))
+
+    tekst = wyciagnij_tekst(odpowiedz)
+    if tekst is None:
+        bledy[klucz] = str(odpowiedz.get('error', 'brak tekstu odpowiedzi'))
+        liczniki['bledne_odpowiedzi'] += 1
+    else:
+        try:
+            dni = parsuj_wynik_modelu(tekst)
+        except json.JSONDecodeError as e:
+            bledy[klucz] = f"niepoprawny JSON w odpowiedzi modelu: {e}"
+            liczniki['bledne_odpowiedzi'] += 1
+            dni = []
+        for dzien in dni:
+            problemy = walidator(dzien)[0] if walidator else waliduj_dzien(dzien)
+            if not problemy:
+                try:
+                    zastosuj_dzien(katalog_bazowy, dzien)
+                    liczniki['zastosowane'] += 1
+                    continue
+                except (OSError, ValueError) as e:
+                    problemy = [f"błąd zapisu: {e}"]
+            sciezka = dzien.get('sciezka') if isinstance(dzien, dict) else None
+            print(f"  [ODRZUCONO] {klucz} / {sciezka}: {'; '.join(problemy)}")
+            bledy.setdefault(klucz, [])
+            if isinstance(bledy[klucz], list):
+                bledy[klucz].append({'sciezka': sciezka, 'bledy': problemy})
+            liczniki['odrzucone'] += 1
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Budowanie zapytań wsadowych i wczytywanie odpowiedzi modelu.")
+    podpolecenia = parser.add_subparsers(dest='polecenie', required=True)
+
+    zbuduj = podpolecenia.add_parser('zbuduj', help="utwórz plik zapytań z korpusu dni")
+    zbuduj.add_argument('--budzet', type=int, default=BUDZET_TOKENOW, help="budżet tokenów danych na zapytanie")
+    zbuduj.add_argument('--wyjscie', default=PLIK_WYJSCIOWY, help="plik wyjściowy JSONL")
+    zbuduj.add_argument('--tylko-bez-piesni', action='store_true', help="tylko dni bez piesniSugerowane")
+
+    wczytaj = podpolecenia.add_parser('wczytaj', help="wczytaj plik odpowiedzi i zaktualizuj pliki dni")
+    wczytaj.add_argument('plik', nargs='?', default=PLIK_ODPOWIEDZI, help="plik JSONL z odpowiedziami modelu")
+    wczytaj.add_argument('--od-nowa', action='store_true', help="zignoruj zapisany postęp i zacznij od początku")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+
+    if args.polecenie == 'zbuduj':
+        folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+        try:
+            instrukcja = wczytaj_instrukcje(os.path.join(biezacy_folder, PLIK_INSTRUKCJI))
+        except FileNotFoundError:
+            print(f"BŁĄD: Nie znaleziono pliku z instrukcją: '{PLIK_INSTRUKCJI}'.")
+            return
+        manifest = odswiez_manifest(folder_zrodlowy, os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW))
+        sciezki = sorted(bez_sekcji(manifest) if args.tylko_bez_piesni else manifest['pliki'])
+        plik_wyjsciowy = os.path.join(biezacy_folder, args.wyjscie)
+        podsumowanie, spakowane = zapisz_paczki(folder_zrodlowy, sciezki, instrukcja, plik_wyjsciowy, args.budzet)
+        print(f"Zapisano {len(podsumowanie)} zapytań ({spakowane} dni) do pliku '{plik_wyjsciowy}'.")
+        return
+
+    plik_odpowiedzi = os.path.join(biezacy_folder, args.plik)
+    if not os.path.exists(plik_odpowiedzi):
+        print(f"BŁĄD KRYTYCZNY: Nie można znaleźć pliku z odpowiedziami: '{plik_odpowiedzi}'.")
+        return
+    katalog_bazowy = os.path.join(biezacy_folder, KATALOG_BAZOWY_LEKCJONARZA)
+    plik_bledow = os.path.join(biezacy_folder, PLIK_BLEDOW)
+
+    # Import lokalny - walidator_sugestii.py sam korzysta z funkcji tego modułu
+    from walidator_sugestii import skompiluj_walidator
+    from skladanie_promptu import PLIK_PIESNI
+    from szukanie_niezgodnosci import PIESNI_SOURCE_FILE_NAME
+    try:
+        walidator = skompiluj_walidator(os.path.join(biezacy_folder, PIESNI_SOURCE_FILE_NAME),
+                                        os.path.join(biezacy_folder, PLIK_PIESNI))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ostrzeżenie: Nie udało się wczytać bazy pieśni ({e}) - sprawdzam tylko strukturę odpowiedzi.")
+        walidator = None
+
+    liczniki = wczytaj_odpowiedzi(plik_odpowiedzi, katalog_bazowy, plik_bledow, args.od_nowa, walidator)
+
+    print("\n--- Podsumowanie ---")
+    print(f"Przetworzono linii odpowiedzi: {liczniki['linie']}")
+    print(f"Zaktualizowano dni: {liczniki['zastosowane']}")
+    if liczniki['odrzucone'] or liczniki['bledne_odpowiedzi']:
+        print(f"Odrzucono dni: {liczniki['odrzucone']}, błędnych odpowiedzi: {liczniki['bledne_odpowiedzi']}.")
+        print(f"Klucze zapytań do ponownego wysłania zapisano w '{plik_bledow}'.")
+
+
+if __name__ == '__main__':
+    main()
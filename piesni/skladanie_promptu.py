@@ -0,0 +1,307 @@
+import os
+import re
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest, bez_sekcji
+from pakowanie_paczek import FOLDER_ZRODLOWY, PLIK_INSTRUKCJI, normalizuj_tekst, przygotuj_dzien, szacuj_tokeny, zbuduj_zapytanie
+from szukanie_niezgodnosci import DISALLOWED_TITLES
+
+# Składa osobny, minimalny prompt dla każdego dnia: zamiast całej bazy pieśni z instrukcje.txt
+# dołącza tylko pieśni, które dla danego dnia w ogóle wolno wybrać (kategoria okresu, pieśni
+# eucharystyczne i ogólne zależnie od momentu, pieśni o świętym dnia), bez czterech zakazanych hymnów.
+# Raportuje oszczędność tokenów względem pełnego promptu.
+# Prompt ma stały układ: zasady, pełny indeks, pieśni wspólne dla wszystkich dni, pieśni okresu,
+# pieśni o świętym - dzięki temu dni z tego samego okresu mają identyczny bajt w bajt początek
+# zapytania, który dostawca modelu może trzymać w pamięci podręcznej (patrz analiza_cache.py).
+
+# --- Konfiguracja ---
+# Główna baza pieśni z kategoriami (numer w plikach dni = numerSiedl)
+PLIK_PIESNI = '../PiesniPoprawa/piesni_ostateczne.json'
+
+# Plik wyjściowy z zapytaniami (jeden dzień = jedna linia JSON)
+PLIK_WYJSCIOWY = 'requests_dzienne.jsonl'
+
+# Znaczniki sekcji w instrukcje.txt
+ZNACZNIK_OPISU = 'SEKCJA 2: OPIS'
+ZNACZNIK_PIESNI = 'SEKCJA 3: PIEŚNI'
+
+# Kategorie okresu liturgicznego według folderu w Lekcjonarz_JSON2
+KATEGORIE_OKRESU = {
+    'Adwent': ['Adwent'],
+    'Okres Bożego Narodzenia': ['Boże Narodzenie', 'Objawienie Pańskie', 'Świętej Rodziny'],
+    'Wielki Post': ['Wielki Post', 'Środa popielcowa'],
+    'Triduum Paschalne': ['Wielki Post', 'Wielki Piątek', 'Wielkanocne'],
+    'Okres Wielkanocny': ['Wielkanocne', 'Wniebowstąpienie Pańskie', 'do Ducha Świętego', 'do Miłosierdzia Bożego'],
+    'Okres Zwykły': [],
+    'Święta i Uroczystości': [],
+    'Datowane': [],
+}
+
+# Dodatkowe kategorie wynikające z tytułu dnia (uroczystości, święta, wspomnienia)
+SLOWA_KLUCZOWE_TYTULU = [
+    (('NMP', 'Maryi', 'Matki Bożej', 'Matki Kościoła', 'Różańcowej'), ['do Najświętszej Maryi Panny']),
+    (('Serca Pana Jezusa', 'Serca Jezusa'), ['do Serca Jezusa']),
+    (('Trójcy',), ['do Trójcy Świętej']),
+    (('Ducha Świętego',), ['do Ducha Świętego']),
+    (('Kapłana',), ['Do Jezusa wiecznego Kapłana']),
+    (('Króla Wszechświata',), ['Jezusa Chrystusa, Króla Wszechświata']),
+    (('Przemienienie',), ['Przemienienie Pańskie']),
+    (('Wniebowstąpienie',), ['Wniebowstąpienie Pańskie']),
+    (('Józefa',), ['do Świętego Józefa']),
+    (('Archanioł',), ['ku czci świętych Archaniołów']),
+    (('Aniołów Stróżów',), ['ku czci świętych Aniołów Stróżów']),
+    (('Miłosierdzia',), ['do Miłosierdzia Bożego']),
+    (('Wszystkich Świętych',), ['o Świętych']),
+    (('zmarłych',), ['za zmarłych']),
+    (('Świętej Rodziny',), ['Świętej Rodziny']),
+    (('Objawienie',), ['Objawienie Pańskie']),
+    (('Popielcowa', 'Popielcowej'), ['Środa popielcowa']),
+    (('Wielki Piątek', 'Męki Pańskiej'), ['Wielki Piątek']),
+    (('Ciała i Krwi',), ['Eucharystyczne']),
+]
+
+# Kategorie o charakterze ogólnym i eucharystycznym
+KATEGORIE_OGOLNE = ['przygodne', 'Mszalne', 'Uwielbienie', 'z Taize']
+KATEGORIE_EUCHARYSTYCZNE = ['Eucharystyczne']
+
+# Z jakich grup wolno dobierać pieśni na dany moment (zgodnie z SEKCJĄ 1 instrukcji).
+# 'uwielbienie' formalnie może sięgać do wszystkich okresów - tu zawężamy do grup pasujących do dnia.
+ZASADY_MOMENTOW = {
+    'wejscie': ('okres', 'ogolne', 'swieci'),
+    'ofiarowanie': ('okres', 'eucharystyczne'),
+    'komunia': ('okres', 'eucharystyczne'),
+    'uwielbienie': ('okres', 'ogolne', 'eucharystyczne', 'swieci'),
+    'rozeslanie': ('okres', 'ogolne', 'swieci'),
+    'ogolne': ('okres', 'ogolne'),
+}
+
+# Ile numerów z rankingu trafności czytań (trafnosc_czytan.py) podawać w prompcie przy --trafnosc
+MAKS_NAJTRAFNIEJSZYCH = 15
+
+MIESIACE = ['stycznia', 'lutego', 'marca', 'kwietnia', 'maja', 'czerwca', 'lipca',
+            'sierpnia', 'września', 'października', 'listopada', 'grudnia']
+
+_LINIA_OPISU = re.compile(r'^(\d+)\s*(?:-\s*(\d+)\s*)?-\s*(.+?)(?:\s*\((\d+ \w+)\))?\s*$')
+_DATA_W_TYTULE = re.compile(r'^(\d{1,2}) (\w+)')
+
+
+def wczytaj_sekcje_instrukcji(sciezka: str) -> Tuple[str, List[str]]:
+    """
+    Dzieli instrukcje.txt na część z zasadami (SEKCJA 1) i linie indeksu tematycznego (SEKCJA 2).
+
+    Returns:
+        Krotka (tekst SEKCJI 1, lista linii SEKCJI 2 z zakresami numerów).
+    """
+    with open(sciezka, 'r', encoding='utf-8') as f:
+        tekst = normalizuj_tekst(f.read())
+    zasady, reszta = tekst.split(ZNACZNIK_OPISU, 1)
+    opis = reszta.split(ZNACZNIK_PIESNI, 1)[0]
+    linie_opisu = [linia.strip() for linia in opis.splitlines() if _LINIA_OPISU.match(linia.strip())]
+    return zasady.rstrip(), linie_opisu
+
+
+def parsuj_opis(linie_opisu: List[str]) -> List[Dict[str, Any]]:
+    """
+    Zamienia linie indeksu ('448-452 - św. Stanisława ze Szczepanowa (8 maja)') na słowniki
+    {'od', 'do', 'nazwa', 'data', 'linia'}.
+    """
+    wpisy = []
+    for linia in linie_opisu:
+        dopasowanie = _LINIA_OPISU.match(linia)
+        od, do, nazwa, data = dopasowanie.groups()
+        wpisy.append({'od': int(od), 'do': int(do or od), 'nazwa': nazwa, 'data': data, 'linia': linia})
+    return wpisy
+
+
+def wczytaj_piesni(sciezka: str) -> List[Dict[str, Any]]:
+    """Wczytuje bazę pieśni i zostawia tylko pieśni z numerem Siedleckiego, bez zakazanych hymnów."""
+    with open(sciezka, 'r', encoding='utf-8') as f:
+        piesni = json.load(f)
+    return [p for p in piesni
+            if p.get('numerSiedl', '').isdigit() and p.get('tytul', '').strip() not in DISALLOWED_TITLES]
+
+
+def kategorie_dnia(sciezka_w_drzewie: str, tytul_dnia: str) -> List[str]:
+    """
+    Wyznacza kategorie okresu dla dnia: z folderu najwyższego poziomu, z daty (dla dni datowanych
+    17-31 grudnia i 1-13 stycznia) oraz ze słów kluczowych w tytule.
+    """
+    folder = sciezka_w_drzewie.split('/', 1)[0]
+    kategorie = list(KATEGORIE_OKRESU.get(folder, []))
+
+    dopasowanie = _DATA_W_TYTULE.match(tytul_dnia)
+    if dopasowanie and dopasowanie.group(2) in MIESIACE:
+        dzien, miesiac = int(dopasowanie.group(1)), MIESIACE.index(dopasowanie.group(2)) + 1
+        if miesiac == 12 and 17 <= dzien <= 24:
+            kategorie += KATEGORIE_OKRESU['Adwent']
+        elif (miesiac == 12 and dzien >= 25) or (miesiac == 1 and dzien <= 13):
+            kategorie += KATEGORIE_OKRESU['Okres Bożego Narodzenia']
+
+    for slowa, dodatkowe in SLOWA_KLUCZOWE_TYTULU:
+        if any(slowo in tytul_dnia for slowo in slowa):
+            kategorie += dodatkowe
+    return list(dict.fromkeys(kategorie))
+
+
+def numery_swietych(tytul_dnia: str, opis: List[Dict[str, Any]]) -> Set[int]:
+    """
+    Wyznacza numery pieśni o świętym dnia: po dacie w tytule ('11 czerwca - ...') lub po nazwie
+    z indeksu. Dla każdego dnia o świętym dochodzą ogólne 'Pieśni Ku Czci Świętych'.
+    """
+    numery: Set[int] = set()
+    dopasowanie = _DATA_W_TYTULE.match(tytul_dnia)
+    data = f"{int(dopasowanie.group(1))} {dopasowanie.group(2)}" if dopasowanie else None
+
+    for wpis in opis:
+        nazwa = re.sub(r'^(św\.?|bł\.)\s*', '', wpis['nazwa'])
+        if (data and wpis['data'] == data) or (wpis['data'] and nazwa in tytul_dnia):
+            numery.update(range(wpis['od'], wpis['do'] + 1))
+
+    if numery or re.search(r'\b(św|bł)\.', tytul_dnia):
+        for wpis in opis:
+            if 'Ku Czci Świętych' in wpis['nazwa']:
+                numery.update(range(wpis['od'], wpis['do'] + 1))
+    return numery
+
+
+def wybierz_kandydatow(sciezka_w_drzewie: str, tytul_dnia: str, piesni: List[Dict[str, Any]],
+                       opis: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Wybiera pieśni dozwolone dla dnia i dla każdej zapisuje momenty, w których wolno jej użyć.
+    Kolejność jest stała: najpierw pieśni ogólne i eucharystyczne (wspólne dla wszystkich dni),
+    potem pieśni okresu, na końcu pieśni o świętych - w każdej grupie rosnąco po numerze.
+
+    Returns:
+        Krotka (lista pieśni {'tytul', 'numer', 'kategoria', 'momenty', 'tekst'}, kategorie okresu dnia).
+    """
+    okres = kategorie_dnia(sciezka_w_drzewie, tytul_dnia)
+    swieci = numery_swietych(tytul_dnia, opis)
+    grupy = {
+        'okres': lambda p: p['kategoria'] in okres,
+        'ogolne': lambda p: p['kategoria'] in KATEGORIE_OGOLNE,
+        'eucharystyczne': lambda p: p['kategoria'] in KATEGORIE_EUCHARYSTYCZNE,
+        'swieci': lambda p: int(p['numerSiedl']) in swieci,
+    }
+
+    kandydaci = []
+    for piesn in piesni:
+        momenty = [moment for moment, zrodla in ZASADY_MOMENTOW.items()
+                   if any(grupy[zrodlo](piesn) for zrodlo in zrodla)]
+        if momenty:
+            kandydaci.append({'tytul': piesn['tytul'], 'numer': piesn['numerSiedl'], 'kategoria': piesn['kategoria'],
+                              'momenty': momenty, 'tekst': piesn['tekst']})
+
+    def grupa(kandydat):
+        if kandydat['kategoria'] in KATEGORIE_OGOLNE + KATEGORIE_EUCHARYSTYCZNE:
+            return 0
+        return 1 if kandydat['kategoria'] in okres else 2
+    kandydaci.sort(key=lambda k: (grupa(k), int(k['numer'])))
+    return kandydaci, okres
+
+
+def zloz_prompt(zasady: str, opis: List[Dict[str, Any]], kandydaci: List[Dict[str, Any]],
+                najtrafniejsze: Optional[List[str]] = None) -> str:
+    """
+    Składa minimalny prompt: zasady z SEKCJI 1, pełny indeks tematyczny oraz bazę pieśni zawężoną
+    do kandydatów (z listą dozwolonych momentów przy każdej pieśni). Części niezależne od dnia stoją
+    na początku, a każda pieśń jest zapisana w jednej linii w stałej postaci, więc wspólny początek
+    promptów nie zależy od kolejności przetwarzania dni. Opcjonalna lista najtrafniejszych numerów
+    (z trafnosc_czytan.py) jest dopisywana na samym końcu, żeby nie zmieniać wspólnego początku.
+    """
+    dopisek = ''
+    if najtrafniejsze:
+        numery = {k['numer'] for k in kandydaci}
+        wybrane = [n for n in najtrafniejsze if n in numery][:MAKS_NAJTRAFNIEJSZYCH]
+        if wybrane:
+            dopisek = ("\n\nPieśni z tej listy najbliższe tematycznie czytaniom dnia (od najtrafniejszej): "
+                       + ', '.join(wybrane) + ".")
+    return (
+        f"{zasady}\n\n{ZNACZNIK_OPISU}\n\n"
+        "Poniższa sekcja to Twój indeks tematyczny.\n\n"
+        + '\n'.join(w['linia'] for w in opis) +
+        f"\n\n{ZNACZNIK_PIESNI}\n\n"
+        "Poniższa sekcja zawiera wyłącznie pieśni, które wolno zaproponować w tym dniu. Pole 'momenty' "
+        "określa, w których momentach liturgii można użyć danej pieśni. Nie proponuj pieśni spoza tej listy.\n\n"
+        "[\n" + ',\n'.join(json.dumps(k, ensure_ascii=False) for k in kandydaci) + "\n]"
+        + dopisek
+    )
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Składanie minimalnych promptów dla poszczególnych dni.")
+    parser.add_argument('--wyjscie', default=PLIK_WYJSCIOWY, help=f"plik wyjściowy JSONL (domyślnie {PLIK_WYJSCIOWY})")
+    parser.add_argument('--tylko-bez-piesni', action='store_true', help="tylko dni bez piesniSugerowane")
+    parser.add_argument('--szczegoly', action='store_true', help="wypisz oszczędność tokenów dla każdego dnia")
+    parser.add_argument('--trafnosc', action='store_true', help="dopisz pieśni najbliższe czytaniom z rankingu trafnosc_czytan.py")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+    plik_wyjsciowy = os.path.join(biezacy_folder, args.wyjscie)
+
+    try:
+        zasady, linie_opisu = wczytaj_sekcje_instrukcji(os.path.join(biezacy_folder, PLIK_INSTRUKCJI))
+        piesni = wczytaj_piesni(os.path.join(biezacy_folder, PLIK_PIESNI))
+        with open(os.path.join(biezacy_folder, PLIK_INSTRUKCJI), 'r', encoding='utf-8') as f:
+            tokeny_pelnej_instrukcji = szacuj_tokeny(f.read())
+    except (OSError, ValueError) as e:
+        print(f"BŁĄD: Nie udało się wczytać instrukcji lub bazy pieśni: {e}")
+        return
+    opis = parsuj_opis(linie_opisu)
+
+    manifest = odswiez_manifest(folder_zrodlowy, os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW))
+    ranking = {}
+    if args.trafnosc:
+        # Import dopiero tutaj - ranking wymaga NumPy, a bez --trafnosc skrypt działa bez niego
+        from trafnosc_czytan import NAZWA_PLIKU_RANKINGU, wczytaj_ranking
+        ranking = wczytaj_ranking(os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW, NAZWA_PLIKU_RANKINGU))
+        if not ranking:
+            print("Ostrzeżenie: Brak rankingu trafności - uruchom najpierw trafnosc_czytan.py.")
+    sciezki = sorted(bez_sekcji(manifest) if args.tylko_bez_piesni else manifest['pliki'])
+    if not sciezki:
+        print("Brak dni do przetworzenia.")
+        return
+
+    suma_pelna, suma_minimalna, zlozone, bez_okresu = 0, 0, 0, []
+    with open(plik_wyjsciowy, 'w', encoding='utf-8') as f:
+        for sciezka in sciezki:
+            try:
+                dzien_json, tokeny_dnia = przygotuj_dzien(folder_zrodlowy, sciezka)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Ostrzeżenie: Pomijam plik '{sciezka}' z powodu błędu odczytu: {e}")
+                continue
+            tytul = manifest['pliki'][sciezka].get('tytul_dnia') or ''
+            kandydaci, okres = wybierz_kandydatow(sciezka, tytul, piesni, opis)
+            if not okres:
+                bez_okresu.append(sciezka)
+            prompt = zloz_prompt(zasady, opis, kandydaci, ranking.get(sciezka))
+            f.write(json.dumps(zbuduj_zapytanie(sciezka, prompt, [dzien_json]), ensure_ascii=False) + '\n')
+            zlozone += 1
+
+            pelny = tokeny_pelnej_instrukcji + tokeny_dnia
+            minimalny = szacuj_tokeny(prompt) + tokeny_dnia
+            suma_pelna += pelny
+            suma_minimalna += minimalny
+            if args.szczegoly:
+                print(f"{sciezka}: {len(kandydaci)} pieśni, {pelny} -> {minimalny} tokenów (-{1 - minimalny / pelny:.1%})")
+
+    print("\n--- Podsumowanie ---")
+    if not zlozone:
+        print(f"Nie złożono żadnego promptu - wszystkie {len(sciezki)} pliki pominięto.")
+        return
+    print(f"Złożono prompty dla {zlozone} dni (pominięto {len(sciezki) - zlozone}).")
+    print(f"Szacowane tokeny: pełny kontekst {suma_pelna}, minimalne prompty {suma_minimalna} "
+          f"(oszczędność {1 - suma_minimalna / suma_pelna:.1%}).")
+    if bez_okresu:
+        print(f"Dni bez kategorii okresu (tylko pieśni ogólne, eucharystyczne i o świętych): {len(bez_okresu)}")
+    print(f"Zapytania zapisano w pliku '{plik_wyjsciowy}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import bisect
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest, oblicz_skrot, wczytaj_json, zapisz_json_atomowo
+from pakowanie_paczek import FOLDER_ZRODLOWY
+from plan_roku import FOLDER_KALENDARZA, PLIK_NAZW_KALENDARZA, ROK, dni_roku
+from skladanie_promptu import PLIK_PIESNI, wczytaj_piesni
+
+# Zmaterializowany widok użycia pieśni w sekcjach piesniSugerowane całego korpusu: liczba użyć każdej
+# pieśni w rozbiciu na moment i okres liturgiczny (folder najwyższego poziomu drzewa) oraz pierwsze
+# i ostatnie użycie w kolejności kalendarza wybranego roku. Widok leży w folderze manifestów razem
+# z listą pieśni każdego dnia, więc po zmianie pojedynczych plików odejmowany jest ich stary wkład
+# i dodawany nowy - czytane są tylko pliki, których skrót w manifeście drzewa się zmienił.
+# Dla każdej pieśni widok trzyma też indeks odwrotny: listę (ścieżka dnia, moment), w których występuje.
+
+# --- Konfiguracja ---
+# Plik z widokiem (w folderze manifestów)
+NAZWA_PLIKU_STATYSTYK = 'statystyki_piesni.json'
+
+# Domyślna liczba wierszy dla zapytania 'top'
+TOP_N = 20
+
+# Wersja układu widoku; widok zapisany w innej wersji jest budowany od nowa
+WERSJA_WIDOKU = 2
+
+
+def piesni_dnia(sciezka: str) -> List[Tuple[str, str]]:
+    """Zwraca pary (numer, moment) z sekcji piesniSugerowane pliku dnia."""
+    try:
+        with open(sciezka, 'r', encoding='utf-8') as f:
+            dane = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    piesni = dane.get('piesniSugerowane') if isinstance(dane, dict) else None
+    if not isinstance(piesni, list):
+        return []
+    return [(str(p['numer']), p.get('moment') or '') for p in piesni if isinstance(p, dict) and p.get('numer')]
+
+
+def _dodaj_wklad(widok: dict, sciezka: str, dzien: dict, znak: int, zmienione: set):
+    """Dodaje (znak=1) lub odejmuje (znak=-1) wkład jednego dnia do liczników i indeksu odwrotnego pieśni."""
+    for numer, moment in dzien['piesni']:
+        piesn = widok['piesni'].setdefault(numer, {'razem': 0, 'liczby': {}, 'daty': [], 'wystapienia': []})
+        piesn['razem'] += znak
+        if znak > 0:
+            bisect.insort(piesn['wystapienia'], [sciezka, moment])
+        else:
+            piesn['wystapienia'].remove([sciezka, moment])
+        liczby = piesn['liczby'].setdefault(moment, {})
+        liczby[dzien['okres']] = liczby.get(dzien['okres'], 0) + znak
+        if not liczby[dzien['okres']]:
+            del liczby[dzien['okres']]
+            if not liczby:
+                del piesn['liczby'][moment]
+        if dzien.get('data'):
+            if znak > 0:
+                bisect.insort(piesn['daty'], dzien['data'])
+            else:
+                piesn['daty'].remove(dzien['data'])
+        zmienione.add(numer)
+
+
+def aktualizuj_widok(folder_zrodlowy: str, manifest: dict, plik_statystyk: str, kalendarz: Dict[str, str],
+                     klucz_kalendarza: str, od_nowa: bool = False) -> Tuple[dict, int]:
+    """
+    Doprowadza widok użycia pieśni do zgodności z korpusem, czytając tylko zmienione pliki dni.
+
+    Args:
+        folder_zrodlowy (str): Folder drzewa z dniami (Lekcjonarz_JSON2).
+        manifest (dict): Aktualny manifest drzewa.
+        plik_statystyk (str): Plik widoku w folderze manifestów.
+        kalendarz (dict): Ścieżka względna dnia -> data ISO w wybranym roku (dla kolejności kalendarza).
+        klucz_kalendarza (str): Skrót kalendarza; po jego zmianie daty wszystkich dni są przeliczane.
+        od_nowa (bool): Zbuduj widok od zera.
+
+    Returns:
+        Krotka (widok, liczba przeczytanych plików dni).
+    """
+    widok = wczytaj_json(plik_statystyk, None)
+    if od_nowa or not widok or widok.get('wersja') != WERSJA_WIDOKU:
+        widok = {'wersja': WERSJA_WIDOKU, 'klucz_kalendarza': None, 'dni': {}, 'piesni': {}}
+    zmienione_piesni = set()
+
+    if widok['klucz_kalendarza'] != klucz_kalendarza:
+        for sciezka, dzien in widok['dni'].items():
+            if dzien.get('data') != kalendarz.get(sciezka):
+                _dodaj_wklad(widok, sciezka, dzien, -1, zmienione_piesni)
+                dzien['data'] = kalendarz.get(sciezka)
+                _dodaj_wklad(widok, sciezka, dzien, 1, zmienione_piesni)
+        widok['klucz_kalendarza'] = klucz_kalendarza
+
+    for sciezka in widok['dni'].keys() - manifest['pliki'].keys():
+        _dodaj_wklad(widok, sciezka, widok['dni'].pop(sciezka), -1, zmienione_piesni)
+
+    przeczytane = 0
+    for sciezka, wpis in manifest['pliki'].items():
+        stary = widok['dni'].get(sciezka)
+        if stary and stary['skrot'] == wpis['skrot']:
+            continue
+        if stary:
+            _dodaj_wklad(widok, sciezka, stary, -1, zmienione_piesni)
+        nowy = {'skrot': wpis['skrot'], 'okres': sciezka.split('/', 1)[0], 'data': kalendarz.get(sciezka)}
+        nowy['piesni'] = piesni_dnia(os.path.join(folder_zrodlowy, sciezka)) if 'piesniSugerowane' in wpis.get('sekcje', []) else []
+        widok['dni'][sciezka] = nowy
+        _dodaj_wklad(widok, sciezka, nowy, 1, zmienione_piesni)
+        przeczytane += 1
+
+    for numer in zmienione_piesni:
+        piesn = widok['piesni'][numer]
+        if not piesn['razem']:
+            del widok['piesni'][numer]
+            continue
+        piesn['pierwsze'] = piesn['daty'][0] if piesn['daty'] else None
+        piesn['ostatnie'] = piesn['daty'][-1] if piesn['daty'] else None
+
+    if przeczytane or zmienione_piesni or not os.path.exists(plik_statystyk):
+        zapisz_json_atomowo(plik_statystyk, widok)
+    return widok, przeczytane
+
+
+def odswiez_widok(folder_zrodlowy: str, rok: int = ROK, od_nowa: bool = False) -> Tuple[dict, int]:
+    """
+    Odświeża manifest drzewa i widok użycia pieśni (z datami dni według kalendarza danego roku).
+
+    Returns:
+        Krotka (widok, liczba przeczytanych plików dni) jak w aktualizuj_widok.
+    """
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_manifestow = os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW)
+    plik_kalendarza = os.path.join(biezacy_folder, FOLDER_KALENDARZA, f"{rok}.json")
+
+    manifest = odswiez_manifest(folder_zrodlowy, folder_manifestow)
+    kalendarz, klucz_kalendarza = {}, None
+    if os.path.exists(plik_kalendarza):
+        with open(plik_kalendarza, 'r', encoding='utf-8') as f:
+            dane_kalendarza = json.load(f)
+        with open(os.path.join(biezacy_folder, FOLDER_KALENDARZA, PLIK_NAZW_KALENDARZA), 'r', encoding='utf-8') as f:
+            nazwy = json.load(f)
+        dni, _ = dni_roku(dane_kalendarza, nazwy, sorted(manifest['pliki']))
+        kalendarz = {dzien['sciezka']: dzien['data'] for dzien in dni}
+        klucz_kalendarza = oblicz_skrot(plik_kalendarza)
+    else:
+        print(f"Ostrzeżenie: Brak kalendarza '{plik_kalendarza}' - pierwsze/ostatnie użycie nie będzie wyznaczone.")
+
+    return aktualizuj_widok(folder_zrodlowy, manifest, os.path.join(folder_manifestow, NAZWA_PLIKU_STATYSTYK),
+                            kalendarz, klucz_kalendarza, od_nowa)
+
+
+def najczesciej(widok: dict, n: int, moment: Optional[str] = None, okres: Optional[str] = None) -> List[Tuple[str, int]]:
+    """Zwraca n najczęściej używanych pieśni (numer, liczba), opcjonalnie dla jednego momentu lub okresu."""
+    wyniki = []
+    for numer, piesn in widok['piesni'].items():
+        liczba = sum(ile for m, okresy in piesn['liczby'].items() if moment in (None, m)
+                     for o, ile in okresy.items() if okres in (None, o))
+        if liczba:
+            wyniki.append((numer, liczba))
+    wyniki.sort(key=lambda para: (-para[1], int(para[0]) if para[0].isdigit() else 0))
+    return wyniki[:n]
+
+
+def nieuzywane(widok: dict, piesni: List[Dict[str, Any]], moment: Optional[str] = None,
+               okres: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Zwraca pieśni z bazy, które nie występują w żadnej propozycji (dla momentu / okresu, jeśli podano)."""
+    uzywane = {numer for numer, _ in najczesciej(widok, len(widok['piesni']), moment, okres)}
+    return [p for p in piesni if p['numerSiedl'] not in uzywane]
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Statystyki użycia pieśni w piesniSugerowane całego korpusu.")
+    parser.add_argument('zapytanie', nargs='?', default='top', choices=['top', 'nieuzywane', 'piesn'],
+                        help="top: najczęściej używane; nieuzywane: pieśni z bazy bez użyć; piesn: szczegóły pieśni")
+    parser.add_argument('numery', nargs='*', help="numery pieśni dla zapytania 'piesn'")
+    parser.add_argument('-n', type=int, default=TOP_N, help=f"liczba wierszy dla 'top' (domyślnie {TOP_N})")
+    parser.add_argument('--moment', help="ogranicz do jednego momentu (np. wejscie)")
+    parser.add_argument('--okres', help="ogranicz do jednego okresu (folder drzewa, np. 'Wielki Post')")
+    parser.add_argument('--rok', type=int, default=ROK, help=f"rok kalendarza dla pierwszego/ostatniego użycia (domyślnie {ROK})")
+    parser.add_argument('--dni', action='store_true', help="dla 'piesn': wypisz też dni, w których pieśń występuje")
+    parser.add_argument('--od-nowa', action='store_true', help="zbuduj widok od zera")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+    if not os.path.isdir(folder_zrodlowy):
+        print(f"BŁĄD: Folder źródłowy '{folder_zrodlowy}' nie istnieje.")
+        return
+
+    widok, przeczytane = odswiez_widok(folder_zrodlowy, args.rok, args.od_nowa)
+    piesni = wczytaj_piesni(os.path.join(biezacy_folder, PLIK_PIESNI))
+    tytuly = {p['numerSiedl']: p['tytul'] for p in piesni}
+
+    if args.zapytanie == 'top':
+        for numer, liczba in najczesciej(widok, args.n, args.moment, args.okres):
+            piesn = widok['piesni'][numer]
+            print(f"{liczba:5d}  {numer:>4}  {tytuly.get(numer, '?')}  (pierwsze: {piesn['pierwsze'] or '-'}, ostatnie: {piesn['ostatnie'] or '-'})")
+    elif args.zapytanie == 'nieuzywane':
+        wynik = nieuzywane(widok, piesni, args.moment, args.okres)
+        for piesn in wynik:
+            print(f"{piesn['numerSiedl']:>4}  {piesn['tytul']}  ({piesn.get('kategoria', '')})")
+        print(f"Pieśni z bazy bez użyć: {len(wynik)} z {len(piesni)}.")
+    else:
+        for numer in args.numery:
+            piesn = widok['piesni'].get(numer)
+            if not piesn:
+                print(f"{numer} {tytuly.get(numer, '?')}: brak użyć.")
+                continue
+            print(f"{numer} {tytuly.get(numer, '?')}: {piesn['razem']} użyć (pierwsze: {piesn['pierwsze'] or '-'}, ostatnie: {piesn['ostatnie'] or '-'})")
+            for moment, okresy in sorted(piesn['liczby'].items()):
+                print(f"  {moment or '(bez momentu)'}: " + ", ".join(f"{o} {ile}" for o, ile in sorted(okresy.items())))
+            if args.dni:
+                for sciezka, moment in piesn['wystapienia']:
+                    print(f"    {sciezka} ({moment})")
+
+    print("\n--- Podsumowanie ---")
+    print(f"Dni w widoku: {len(widok['dni'])}, przeczytane pliki: {przeczytane}, używane pieśni: {len(widok['piesni'])}.")
+
+
+if __name__ == '__main__':
+    main()
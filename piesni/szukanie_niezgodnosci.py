@@ -1,7 +1,12 @@
 import os
+import sys
 import json
 from typing import Dict, List, Any, Optional, Set
 
+# Pomiary (profilowanie.py) leżą w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from profilowanie import odcinek, uruchom_z_profilem
+
 # --- Konfiguracja ---
 LEKCJONARZ_DIR_NAME = '../Lekcjonarz_JSON2'
 PIESNI_SOURCE_FILE_NAME = 'piesni.json'
@@ -74,7 +79,7 @@ def verify_and_report_files(leksjonarz_path: str, master_songs: Dict[str, str])
                 file_path = os.path.join(root, filename)
                 
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
+                    with open(file_path, 'r', encoding='utf-8') as f, odcinek('dekodowanie JSON'):
                         daily_data = json.load(f)
                 except (json.JSONDecodeError, Exception) as e:
                     print(f"Ostrzeżenie: Pomijam plik z powodu błędu odczytu: {file_path}. Błąd: {e}")
@@ -150,4 +155,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    uruchom_z_profilem(main)
\ No newline at end of file
@@ -0,0 +1,339 @@
+import io
+import re
+import json
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+# Strumieniowy, tolerancyjny parser JSON dla odpowiedzi modelu. Czyta plik blokami (stała pamięć
+# niezależnie od rozmiaru pliku), wyszukuje kolejne obiekty najwyższego poziomu (w tablicy
+# albo w sekwencji zaczynającej się od przecinka) i naprawia typowe błędy:
+#   - niezakodowane cudzysłowy wewnątrz wartości (zamieniane na apostrofy; decyzja, czy cudzysłów
+#     zamyka napis, zapada na podstawie znaków strukturalnych stojących za nim),
+#   - przecinki przed '}' / ']' oraz zdublowane przecinki,
+#   - brakujące przecinki między elementami,
+#   - znaki nowej linii i inne znaki sterujące wewnątrz napisów,
+#   - obcięty koniec pliku (niedokończony napis / obiekt jest domykany).
+# Każda naprawa jest raportowana z pozycją (linia, kolumna, przesunięcie znakowe) w pliku wejściowym.
+
+# --- Konfiguracja ---
+# Liczba znaków wczytywanych jednorazowo z pliku
+ROZMIAR_BLOKU = 1 << 16
+
+# Jak daleko (w znakach) szukać znaku strukturalnego za podejrzanym cudzysłowem
+ZASIEG_PODGLADU = 4096
+
+_ZNAK_SPECJALNY_W_NAPISIE = re.compile(r'["\\\x00-\x1f]')
+_KONIEC_LITERALU = re.compile(r'[\s,:{}\[\]"]')
+_BIALE = ' \t\r\n'
+_DOZWOLONE_ESKAPY = '"\\/bfnrtu'
+_POCZATEK_WARTOSCI = '"{[-0123456789tfn'
+_ESKAPY_STERUJACE = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+
+
+class _Czytnik:
+    """Bufor na strumieniu tekstu z podglądem do przodu i śledzeniem pozycji (linia/kolumna)."""
+
+    def __init__(self, strumien: TextIO, rozmiar_bloku: int):
+        self.strumien = strumien
+        self.rozmiar_bloku = rozmiar_bloku
+        self.bufor = ''
+        self.i = 0
+        self.przesuniecie_bufora = 0
+        self.linia = 1
+        self.poczatek_linii = 0
+        self.koniec = False
+
+    def _dopelnij(self, potrzeba: int):
+        while len(self.bufor) - self.i < potrzeba and not self.koniec:
+            blok = self.strumien.read(self.rozmiar_bloku)
+            if not blok:
+                self.koniec = True
+                break
+            self.przesuniecie_bufora += self.i
+            self.bufor = self.bufor[self.i:] + blok
+            self.i = 0
+
+    def znak(self, k: int = 0) -> str:
+        """Zwraca znak o k pozycji dalej (pusty napis na końcu pliku)."""
+        self._dopelnij(k + 1)
+        j = self.i + k
+        return self.bufor[j] if j < len(self.bufor) else ''
+
+    def przesun(self, n: int = 1) -> str:
+        """Przesuwa pozycję o n znaków i zwraca pominięty fragment."""
+        self._dopelnij(n)
+        fragment = self.bufor[self.i:self.i + n]
+        nowe_linie = fragment.count('\n')
+        if nowe_linie:
+            self.linia += nowe_linie
+            self.poczatek_linii = self.przesuniecie_bufora + self.i + fragment.rfind('\n') + 1
+        self.i += len(fragment)
+        return fragment
+
+    def pozycja(self) -> Tuple[int, int, int]:
+        """Zwraca (linia, kolumna, przesunięcie znakowe) bieżącego znaku."""
+        przesuniecie = self.przesuniecie_bufora + self.i
+        return self.linia, przesuniecie - self.poczatek_linii + 1, przesuniecie
+
+    def nastepny_niebialy(self, od: int) -> Tuple[str, int, bool]:
+        """
+        Szuka pierwszego niebiałego znaku od pozycji +od.
+
+        Returns:
+            (znak lub '' na końcu pliku, jego odległość, czy po drodze była nowa linia).
+        """
+        k, nowa_linia = od, False
+        while k < od + ZASIEG_PODGLADU:
+            z = self.znak(k)
+            if z == '' or z not in _BIALE:
+                return z, k, nowa_linia
+            nowa_linia = nowa_linia or z == '\n'
+            k += 1
+        return '', k, nowa_linia
+
+    def czy_klucz_od(self, od: int) -> bool:
+        """Sprawdza, czy od pozycji +od (cudzysłów) zaczyna się krótki klucz zakończony dwukropkiem."""
+        k = od + 1
+        while k < od + 64:
+            z = self.znak(k)
+            if z in ('', '\n', '\\'):
+                return False
+            if z == '"':
+                return self.nastepny_niebialy(k + 1)[0] == ':'
+            k += 1
+        return False
+
+    def fragment_napisu(self) -> str:
+        """Zwraca (i pomija) najdłuższy fragment napisu bez cudzysłowu, ukośnika i znaków sterujących."""
+        self._dopelnij(1)
+        dopasowanie = _ZNAK_SPECJALNY_W_NAPISIE.search(self.bufor, self.i)
+        koniec = dopasowanie.start() if dopasowanie else len(self.bufor)
+        return self.przesun(koniec - self.i)
+
+    def literal(self) -> str:
+        """Zwraca (i pomija) literał: liczbę, true, false lub null."""
+        czesci = []
+        while True:
+            self._dopelnij(1)
+            dopasowanie = _KONIEC_LITERALU.search(self.bufor, self.i)
+            if dopasowanie:
+                czesci.append(self.przesun(dopasowanie.start() - self.i))
+                return ''.join(czesci)
+            if self.i >= len(self.bufor):
+                return ''.join(czesci)
+            czesci.append(self.przesun(len(self.bufor) - self.i))
+
+
+class _Obiekt:
+    """Stan budowy jednego obiektu najwyższego poziomu."""
+
+    def __init__(self, pozycja: Tuple[int, int, int]):
+        self.pozycja = pozycja
+        self.wyjscie: List[str] = []
+        self.dlugosc = 0
+        self.stos: List[List[Any]] = []  # [typ kontenera, czego oczekuje, bezpieczna długość wyjścia]
+        self.naprawy: List[Dict[str, Any]] = []
+
+    def dopisz(self, tekst: str):
+        self.wyjscie.append(tekst)
+        self.dlugosc += len(tekst)
+
+    def wartosc_zakonczona(self):
+        if self.stos:
+            self.stos[-1][1] = 'po_wartosci'
+            self.stos[-1][2] = self.dlugosc
+
+    def obetnij_do_bezpiecznej(self):
+        tekst = ''.join(self.wyjscie)[:self.stos[-1][2]]
+        self.wyjscie = [tekst]
+        self.dlugosc = len(tekst)
+
+
+def _napraw(obiekt: _Obiekt, czytnik: _Czytnik, rodzaj: str, opis: str, naprawy_poza: List[dict] = None):
+    linia, kolumna, przesuniecie = czytnik.pozycja()
+    wpis = {'rodzaj': rodzaj, 'opis': opis, 'linia': linia, 'kolumna': kolumna, 'przesuniecie': przesuniecie}
+    (obiekt.naprawy if obiekt is not None else naprawy_poza).append(wpis)
+
+
+def _czytaj_napis(obiekt: _Obiekt, czytnik: _Czytnik, czy_klucz: bool) -> bool:
+    """Czyta napis (kursor na otwierającym cudzysłowie). Zwraca False, jeśli plik urwał się w napisie."""
+    czytnik.przesun(1)
+    obiekt.dopisz('"')
+    while True:
+        fragment = czytnik.fragment_napisu()
+        if fragment:
+            obiekt.dopisz(fragment)
+        z = czytnik.znak()
+        if z == '':
+            return False
+        if z == '\\':
+            nastepny = czytnik.znak(1)
+            if nastepny and nastepny in _DOZWOLONE_ESKAPY:
+                obiekt.dopisz(czytnik.przesun(2))
+            else:
+                _napraw(obiekt, czytnik, 'bledna_sekwencja', "niedozwolona sekwencja ucieczki - zdublowano ukośnik")
+                czytnik.przesun(1)
+                obiekt.dopisz('\\\\')
+            continue
+        if z != '"':
+            _napraw(obiekt, czytnik, 'znak_sterujacy', f"znak sterujący {z!r} wewnątrz napisu")
+            czytnik.przesun(1)
+            obiekt.dopisz(_ESKAPY_STERUJACE.get(z, f'\\u{ord(z):04x}'))
+            continue
+
+        # Cudzysłów: zamyka napis tylko wtedy, gdy dalej stoi znak strukturalny pasujący do kontekstu
+        nastepny, k, nowa_linia = czytnik.nastepny_niebialy(1)
+        if czy_klucz:
+            zamyka = nastepny in (':', '')
+        elif nastepny in ('}', ']', ''):
+            zamyka = True
+        elif nastepny == ',':
+            po_przecinku, _, _ = czytnik.nastepny_niebialy(k + 1)
+            w_tablicy = obiekt.stos[-1][0] == '['
+            zamyka = po_przecinku == '' or po_przecinku in ('"}]' if not w_tablicy else _POCZATEK_WARTOSCI + '}]')
+        else:
+            # Kolejny napis w nowej linii albo kolejny klucz ("...":) oznacza brakujący przecinek, a nie cytat
+            zamyka = nastepny == '"' and (nowa_linia or czytnik.czy_klucz_od(k))
+
+        if zamyka:
+            czytnik.przesun(1)
+            obiekt.dopisz('"')
+            return True
+        _napraw(obiekt, czytnik, 'wewnetrzny_cudzyslow', "niezakodowany cudzysłów wewnątrz napisu zamieniony na apostrof")
+        czytnik.przesun(1)
+        obiekt.dopisz("'")
+
+
+def _domknij_obciety(obiekt: _Obiekt, czytnik: _Czytnik) -> str:
+    _napraw(obiekt, czytnik, 'obciety_koniec', f"plik urwał się wewnątrz obiektu - domknięto {len(obiekt.stos)} poziom(y)")
+    obiekt.obetnij_do_bezpiecznej()
+    for typ, _, _ in reversed(obiekt.stos):
+        obiekt.dopisz('}' if typ == '{' else ']')
+    return ''.join(obiekt.wyjscie)
+
+
+def _wynik(obiekt: _Obiekt, tekst: str) -> Dict[str, Any]:
+    try:
+        return {'obiekt': json.loads(tekst), 'naprawy': obiekt.naprawy, 'pozycja': obiekt.pozycja}
+    except json.JSONDecodeError as e:
+        return {'obiekt': None, 'blad': str(e), 'naprawy': obiekt.naprawy, 'pozycja': obiekt.pozycja}
+
+
+def parsuj_strumien(strumien: TextIO, rozmiar_bloku: int = ROZMIAR_BLOKU) -> Iterator[Dict[str, Any]]:
+    """
+    Czyta strumień tekstu i zwraca kolejne obiekty najwyższego poziomu po naprawie.
+
+    Args:
+        strumien: Otwarty plik tekstowy (lub io.StringIO).
+        rozmiar_bloku (int): Liczba znaków wczytywanych jednorazowo.
+
+    Yields:
+        Słowniki {'obiekt': dict lub None, 'naprawy': [...], 'pozycja': (linia, kolumna, przesunięcie)}
+        oraz 'blad', jeśli obiektu nie udało się naprawić. Tekst spoza obiektów (np. znaczniki ```)
+        jest pomijany i raportowany w wyniku z 'obiekt' równym None i rodzajem 'pominiety_tekst'.
+    """
+    czytnik = _Czytnik(strumien, rozmiar_bloku)
+    obiekt = None
+
+    while True:
+        z = czytnik.znak()
+        if z == '':
+            if obiekt is not None:
+                wynik = _wynik(obiekt, _domknij_obciety(obiekt, czytnik))
+                if wynik['obiekt'] == {}:
+                    wynik.update(obiekt=None, blad="obcięty obiekt nie zawiera żadnego kompletnego pola")
+                yield wynik
+            return
+
+        # --- Poziom najwyższy: szukamy początku kolejnego obiektu ---
+        if obiekt is None:
+            if z == '{':
+                obiekt = _Obiekt(czytnik.pozycja())
+                obiekt.dopisz(czytnik.przesun(1))
+                obiekt.stos.append(['{', 'klucz', obiekt.dlugosc])
+            elif z in _BIALE or z in ',[]':
+                czytnik.przesun(1)
+            else:
+                pominiete = []
+                _napraw(None, czytnik, 'pominiety_tekst', "tekst poza obiektami JSON", pominiete)
+                while czytnik.znak() not in ('', '\n', '{'):
+                    czytnik.przesun(1)
+                yield {'obiekt': None, 'naprawy': pominiete, 'pozycja': tuple(pominiete[0][k] for k in ('linia', 'kolumna', 'przesuniecie'))}
+            continue
+
+        # --- Wnętrze obiektu ---
+        ramka = obiekt.stos[-1]
+        typ, oczekuje = ramka[0], ramka[1]
+
+        if z in _BIALE:
+            czytnik.przesun(1)
+            continue
+
+        if oczekuje == 'po_wartosci' and z not in ',}]:':
+            if z == '"' or z in '{[' or (typ == '[' and z in _POCZATEK_WARTOSCI):
+                _napraw(obiekt, czytnik, 'brakujacy_przecinek', "wstawiono brakujący przecinek")
+                obiekt.dopisz(',')
+                ramka[1] = oczekuje = 'klucz' if typ == '{' else 'wartosc'
+
+        if z == '"':
+            if typ == '{' and oczekuje == 'klucz':
+                if not _czytaj_napis(obiekt, czytnik, True):
+                    continue
+                ramka[1] = 'dwukropek'
+            elif oczekuje == 'wartosc':
+                if not _czytaj_napis(obiekt, czytnik, False):
+                    continue
+                obiekt.wartosc_zakonczona()
+            else:
+                _napraw(obiekt, czytnik, 'nieoczekiwany_znak', "pominięto nieoczekiwany cudzysłów")
+                czytnik.przesun(1)
+        elif z == ':':
+            czytnik.przesun(1)
+            if typ == '{' and oczekuje == 'dwukropek':
+                obiekt.dopisz(':')
+                ramka[1] = 'wartosc'
+            else:
+                _napraw(obiekt, czytnik, 'nieoczekiwany_znak', "pominięto nieoczekiwany dwukropek")
+        elif z == ',':
+            if oczekuje == 'po_wartosci':
+                nastepny, _, _ = czytnik.nastepny_niebialy(1)
+                if nastepny in ('}', ']'):
+                    _napraw(obiekt, czytnik, 'przecinek_koncowy', f"usunięto przecinek przed '{nastepny}'")
+                else:
+                    obiekt.dopisz(',')
+                    ramka[1] = 'klucz' if typ == '{' else 'wartosc'
+            else:
+                _napraw(obiekt, czytnik, 'zdublowany_przecinek', "usunięto nadmiarowy przecinek")
+            czytnik.przesun(1)
+        elif z in '}]':
+            if (z == '}') != (typ == '{'):
+                _napraw(obiekt, czytnik, 'zly_nawias', f"zamieniono '{z}' na nawias zamykający '{typ}'")
+            if oczekuje in ('dwukropek', 'wartosc') and typ == '{':
+                _napraw(obiekt, czytnik, 'niedokonczony_klucz', "usunięto klucz bez wartości")
+                obiekt.obetnij_do_bezpiecznej()
+            czytnik.przesun(1)
+            obiekt.dopisz('}' if typ == '{' else ']')
+            obiekt.stos.pop()
+            if obiekt.stos:
+                obiekt.wartosc_zakonczona()
+            else:
+                yield _wynik(obiekt, ''.join(obiekt.wyjscie))
+                obiekt = None
+        elif z in '{[':
+            if oczekuje != 'wartosc':
+                _napraw(obiekt, czytnik, 'nieoczekiwany_znak', f"pominięto nieoczekiwany znak {z!r}")
+                czytnik.przesun(1)
+                continue
+            obiekt.dopisz(czytnik.przesun(1))
+            obiekt.stos.append([z, 'klucz' if z == '{' else 'wartosc', obiekt.dlugosc])
+        else:
+            if oczekuje == 'wartosc':
+                obiekt.dopisz(czytnik.literal())
+                obiekt.wartosc_zakonczona()
+            else:
+                _napraw(obiekt, czytnik, 'nieoczekiwany_znak', f"pominięto nieoczekiwany znak {z!r}")
+                czytnik.przesun(1)
+
+
+def parsuj_tekst(tekst: str) -> Iterator[Dict[str, Any]]:
+    """Wygodna odmiana parsuj_strumien dla tekstu w pamięci (np. jednej odpowiedzi modelu)."""
+    return parsuj_strumien(io.StringIO(tekst))
@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest, oblicz_skrot, zapisz_json_atomowo, wczytaj_json
+from pakowanie_paczek import FOLDER_ZRODLOWY
+from skladanie_promptu import PLIK_PIESNI, wczytaj_piesni
+
+# Offline'owy ranking pieśni względem czytań dnia. Teksty pieśni z głównej bazy są ważone BM25,
+# czytania każdego dnia z Lekcjonarz_JSON2 tworzą wektor zapytania (log tf), a cała macierz
+# dni x pieśni liczona jest iloczynami macierzy NumPy w paczkach dni. Dla każdego dnia zapisywane jest
+# top-K pieśni. Przy kolejnym uruchomieniu, jeśli baza pieśni się nie zmieniła, przeliczane są tylko dni,
+# których skrót w manifeście drzewa jest inny niż zapisany.
+
+# --- Konfiguracja ---
+# Plik z rankingiem (w folderze manifestów)
+NAZWA_PLIKU_RANKINGU = 'trafnosc_czytan.json'
+
+# Ilu najlepszych pieśni zapamiętywać dla dnia
+TOP_K = 40
+
+# Parametry BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Termy występujące w większej części pieśni niż ten próg nie niosą treści i są pomijane
+MAKS_UDZIAL_DOKUMENTOW = 0.5
+
+# Ile dni liczyć jednym iloczynem macierzy (ogranicza pamięć na macierz zapytań)
+ROZMIAR_PACZKI_DNI = 256
+
+# Najczęstsze polskie słowa funkcyjne
+SLOWA_POMIJANE = set("""
+a aby ach albo ale ani aż bo by być był była było byli będzie będą bez chociaż ci cię co czy dla do
+dziś gdy gdyż go i ich im in ja jak jakby jako je jego jej jest jestem jesteś jesteście jesteśmy jeśli
+już ku lecz lub ma mi mnie mną mu my na nad nam nami nas nasz nasza nasze naszych nie niech niechaj nim
+niż no o od on ona one oni ono oraz po pod przed przez przy się sobie tak tam te tej ten to tobie ty tych
+tylko tym u w we wam was wasz wszak wszystko wy z za ze że żeby oto tu tam kto który która które których
+""".split())
+
+# Końcówki fleksyjne obcinane przy sprowadzaniu słowa do tematu (od najdłuższych)
+KONCOWKI = sorted("""
+owania owanie ościami ościach ości ość owie owi ami ach ego emu ych ymi imi iej ów om em ie ia iu ą ę y i a o u e
+""".split(), key=len, reverse=True)
+
+# Maksymalna długość tematu po obcięciu końcówki
+DLUGOSC_TEMATU = 7
+
+_SLOWO = re.compile(r'[a-ząćęłńóśźż]+')
+
+
+def termy(tekst: str) -> List[str]:
+    """
+    Normalizuje polski tekst do listy termów: małe litery, bez słów funkcyjnych i krótszych niż 3 znaki,
+    z obciętą końcówką fleksyjną i tematem skróconym do DLUGOSC_TEMATU znaków.
+    """
+    wynik = []
+    for slowo in _SLOWO.findall(tekst.lower()):
+        if len(slowo) < 3 or slowo in SLOWA_POMIJANE:
+            continue
+        for koncowka in KONCOWKI:
+            if slowo.endswith(koncowka) and len(slowo) - len(koncowka) >= 3:
+                slowo = slowo[:-len(koncowka)]
+                break
+        wynik.append(slowo[:DLUGOSC_TEMATU])
+    return wynik
+
+
+def tekst_czytan(dzien: Dict[str, Any]) -> str:
+    """Łączy opisy i teksty wszystkich czytań dnia."""
+    czytania = dzien.get('czytania') or []
+    return '\n'.join(f"{c.get('opis', '')}\n{c.get('tekst', '')}" for c in czytania if isinstance(c, dict))
+
+
+def macierz_piesni(piesni: List[Dict[str, Any]]) -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Buduje macierz wag BM25 pieśni.
+
+    Returns:
+        Krotka (słownik term -> wiersz, macierz float32 o wymiarach termy x pieśni).
+    """
+    czestosci = [Counter(termy(f"{p['tytul']}\n{p.get('tekst', '')}")) for p in piesni]
+    liczba = len(czestosci)
+    df = Counter(t for c in czestosci for t in c)
+    slownik = {t: i for i, t in enumerate(sorted(t for t, n in df.items() if n <= MAKS_UDZIAL_DOKUMENTOW * liczba))}
+
+    dlugosci = np.array([sum(c.values()) for c in czestosci], dtype=np.float32)
+    srednia = float(dlugosci.mean()) if liczba else 1.0
+    idf = np.zeros(len(slownik), dtype=np.float32)
+    for t, i in slownik.items():
+        idf[i] = np.log(1 + (liczba - df[t] + 0.5) / (df[t] + 0.5))
+
+    macierz = np.zeros((len(slownik), liczba), dtype=np.float32)
+    for kolumna, c in enumerate(czestosci):
+        wiersze = [slownik[t] for t in c if t in slownik]
+        tf = np.array([c[t] for t in c if t in slownik], dtype=np.float32)
+        norma = BM25_K1 * (1 - BM25_B + BM25_B * dlugosci[kolumna] / srednia)
+        macierz[wiersze, kolumna] = idf[wiersze] * tf * (BM25_K1 + 1) / (tf + norma)
+    return slownik, macierz
+
+
+def wektory_dni(teksty: List[str], slownik: Dict[str, int]) -> np.ndarray:
+    """Macierz zapytań (dni x termy) z wagami 1 + ln(tf), znormalizowanymi do długości 1."""
+    macierz = np.zeros((len(teksty), len(slownik)), dtype=np.float32)
+    for wiersz, tekst in enumerate(teksty):
+        c = Counter(t for t in termy(tekst) if t in slownik)
+        if c:
+            macierz[wiersz, [slownik[t] for t in c]] = 1 + np.log(np.array(list(c.values()), dtype=np.float32))
+    normy = np.linalg.norm(macierz, axis=1, keepdims=True)
+    return macierz / np.where(normy > 0, normy, 1)
+
+
+def najlepsze(wyniki: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+    """Dla każdego wiersza macierzy wyników zwraca k kolumn o najwyższym wyniku, malejąco."""
+    k = min(k, wyniki.shape[1])
+    czesciowe = np.argpartition(-wyniki, k - 1, axis=1)[:, :k]
+    wybrane = np.take_along_axis(wyniki, czesciowe, axis=1)
+    kolejnosc = np.argsort(-wybrane, axis=1, kind='stable')
+    kolumny = np.take_along_axis(czesciowe, kolejnosc, axis=1)
+    wartosci = np.take_along_axis(wybrane, kolejnosc, axis=1)
+    return [[(int(c), float(w)) for c, w in zip(rk, rw) if w > 0] for rk, rw in zip(kolumny, wartosci)]
+
+
+def klucz_piesni(plik_piesni: str, k: int) -> str:
+    """Klucz części pieśniowej rankingu: skrót bazy pieśni, kodu tego modułu i K."""
+    skrot = hashlib.sha256()
+    for sciezka in (plik_piesni, os.path.abspath(__file__)):
+        skrot.update(oblicz_skrot(sciezka).encode('utf-8'))
+    skrot.update(str(k).encode('utf-8'))
+    return skrot.hexdigest()
+
+
+def zbuduj_ranking(folder_zrodlowy: str, manifest: dict, plik_piesni: str, plik_rankingu: str,
+                   k: int = TOP_K, od_nowa: bool = False) -> Tuple[dict, int]:
+    """
+    Aktualizuje ranking: przelicza dni nowe i zmienione (albo wszystkie, jeśli zmieniła się baza
+    pieśni), a wpisy dni usuniętych z drzewa pomija.
+
+    Returns:
+        Krotka (ranking {'klucz', 'dni': {ścieżka: {'skrot', 'kandydaci': [[numer, wynik], ...]}}}, liczba przeliczonych dni).
+    """
+    klucz = klucz_piesni(plik_piesni, k)
+    poprzedni = wczytaj_json(plik_rankingu, {})
+    if od_nowa or poprzedni.get('klucz') != klucz:
+        poprzedni = {'dni': {}}
+    dni = {s: w for s, w in poprzedni['dni'].items()
+           if s in manifest['pliki'] and w['skrot'] == manifest['pliki'][s]['skrot']}
+    do_przeliczenia = sorted(s for s in manifest['pliki'] if s not in dni)
+
+    if do_przeliczenia:
+        piesni = wczytaj_piesni(plik_piesni)
+        numery = [p['numerSiedl'] for p in piesni]
+        slownik, macierz = macierz_piesni(piesni)
+        for poczatek in range(0, len(do_przeliczenia), ROZMIAR_PACZKI_DNI):
+            paczka = do_przeliczenia[poczatek:poczatek + ROZMIAR_PACZKI_DNI]
+            teksty = []
+            for sciezka in paczka:
+                try:
+                    with open(os.path.join(folder_zrodlowy, sciezka), 'r', encoding='utf-8') as f:
+                        teksty.append(tekst_czytan(json.load(f)))
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Ostrzeżenie: Pomijam czytania z '{sciezka}': {e}")
+                    teksty.append('')
+            wyniki = wektory_dni(teksty, slownik) @ macierz
+            for sciezka, lista in zip(paczka, najlepsze(wyniki, k)):
+                dni[sciezka] = {'skrot': manifest['pliki'][sciezka]['skrot'],
+                                'kandydaci': [[numery[c], round(w, 4)] for c, w in lista]}
+
+    ranking = {'klucz': klucz, 'dni': dict(sorted(dni.items()))}
+    if do_przeliczenia or len(dni) != len(poprzedni['dni']):
+        zapisz_json_atomowo(plik_rankingu, ranking)
+    return ranking, len(do_przeliczenia)
+
+
+def wczytaj_ranking(plik_rankingu: str) -> Dict[str, List[str]]:
+    """Zwraca zapisany ranking jako słownik: ścieżka dnia -> numery pieśni od najtrafniejszej."""
+    ranking = wczytaj_json(plik_rankingu, {'dni': {}})
+    return {s: [numer for numer, _ in w['kandydaci']] for s, w in ranking['dni'].items()}
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Ranking pieśni według podobieństwa tekstu do czytań dnia (BM25).")
+    parser.add_argument('--top-k', type=int, default=TOP_K, help=f"ile pieśni zapamiętać dla dnia (domyślnie {TOP_K})")
+    parser.add_argument('--od-nowa', action='store_true', help="przelicz wszystkie dni")
+    parser.add_argument('--dzien', action='append', default=[], help="wypisz ranking dla dnia (ścieżka względna; można powtarzać)")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+    folder_manifestow = os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW)
+    plik_piesni = os.path.join(biezacy_folder, PLIK_PIESNI)
+    plik_rankingu = os.path.join(folder_manifestow, NAZWA_PLIKU_RANKINGU)
+
+    if not os.path.exists(plik_piesni):
+        print(f"BŁĄD: Nie znaleziono bazy pieśni: '{plik_piesni}'.")
+        return
+
+    manifest = odswiez_manifest(folder_zrodlowy, folder_manifestow)
+    ranking, przeliczone = zbuduj_ranking(folder_zrodlowy, manifest, plik_piesni, plik_rankingu, args.top_k, args.od_nowa)
+
+    if args.dzien:
+        tytuly = {p['numerSiedl']: p['tytul'] for p in wczytaj_piesni(plik_piesni)}
+        for sciezka in args.dzien:
+            wpis = ranking['dni'].get(sciezka)
+            if wpis is None:
+                print(f"Ostrzeżenie: Brak dnia '{sciezka}' w drzewie.")
+                continue
+            print(f"\n{sciezka}:")
+            for numer, wynik in wpis['kandydaci']:
+                print(f"  {numer:>4} {wynik:7.3f}  {tytuly.get(numer, '?')}")
+
+    print("\n--- Podsumowanie ---")
+    print(f"Dni w rankingu: {len(ranking['dni'])}, przeliczone teraz: {przeliczone}.")
+    print(f"Ranking zapisano w pliku '{os.path.normpath(plik_rankingu)}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import FOLDER_MANIFESTOW, odswiez_manifest
+from profilowanie import odcinek, uruchom_z_profilem
+from pakowanie_paczek import FOLDER_ZRODLOWY, PLIK_WYJSCIOWY
+from przetwarzanie_wsadowe import PLIK_ODPOWIEDZI, czytaj_linie_od, domknij_tablice, waliduj_dzien, wyciagnij_tekst
+from skladanie_promptu import KATEGORIE_EUCHARYSTYCZNE, KATEGORIE_OGOLNE, PLIK_PIESNI, kategorie_dnia
+from szukanie_niezgodnosci import DISALLOWED_TITLES, PIESNI_SOURCE_FILE_NAME
+from tolerancyjny_json import parsuj_tekst
+
+# Waliduje propozycje pieśni w chwili, gdy wypływają z pliku odpowiedzi modelu, zamiast po zapisaniu
+# ich w plikach dni (jak szukanie_niezgodnosci.py). Walidator jest "kompilowany" raz: tytuły, kategorie
+# i zakazane hymny trafiają do słowników i zbiorów, a reguły momentów do tablicy, więc sprawdzenie
+# jednej propozycji to kilka wyszukiwań w tablicach haszujących.
+# Zapytania, których odpowiedzi zawierają błędne dni, są od razu przepisywane do pliku do ponownego wysłania.
+# Niedopasowanie kategorii pieśni do momentu jest tylko ostrzeżeniem - zależy od jakości kategorii w bazie
+# i nie powoduje ponowienia zapytania.
+
+# --- Konfiguracja ---
+# Reguły momentów: (minimalna liczba, maksymalna liczba, grupy kategorii, z których wolno dobierać
+# - None oznacza brak ograniczenia, kategorie zakazane w danym momencie)
+REGULY_MOMENTOW = {
+    'wejscie': (1, 2, None, frozenset()),
+    'ofiarowanie': (1, 2, ('okres', 'eucharystyczne'), frozenset()),
+    'komunia': (1, 2, ('okres', 'eucharystyczne'), frozenset()),
+    'uwielbienie': (1, 2, None, frozenset()),
+    'rozeslanie': (1, 2, None, frozenset()),
+    'ogolne': (2, 3, None, frozenset({'Hymny'})),
+}
+
+# Plik z zapytaniami do ponownego wysłania
+PLIK_PONOWNYCH = 'requests_ponowne.jsonl'
+
+
+_DOPISEK_W_NAWIASIE = re.compile(r'\s*\([^()]*\)\s*$')
+
+
+def _normalizuj(tytul: str) -> str:
+    """Ujednolica tytuł do porównań: pojedyncze spacje, bez rozróżniania wielkości liter."""
+    return ' '.join(tytul.split()).casefold()
+
+
+def _formy_tytulu(tytul: str) -> FrozenSet[str]:
+    """Dopuszczalne formy tytułu: pełny i bez dopisku w nawiasie ('... (podczas Mszy św. o NMP w Adwencie)')."""
+    pelny = _normalizuj(tytul)
+    return frozenset({pelny, _DOPISEK_W_NAWIASIE.sub('', pelny)})
+
+
+@odcinek('walidacja: kompilacja')
+def skompiluj_walidator(plik_tytulow: str, plik_kategorii: str) -> Callable[[Any], Tuple[List[str], List[str]]]:
+    """
+    Buduje funkcję walidującą obiekt dnia ({'sciezka', 'piesniSugerowane'}).
+
+    Args:
+        plik_tytulow (str): Główna lista pieśni (numer -> tytuł), ta sama co w szukanie_niezgodnosci.py.
+        plik_kategorii (str): Baza pieśni z kategoriami (numerSiedl -> kategoria).
+
+    Returns:
+        Funkcja zwracająca krotkę (błędy, ostrzeżenia) dla obiektu dnia - puste listy, jeśli dzień jest poprawny.
+    """
+    with open(plik_tytulow, 'r', encoding='utf-8') as f:
+        tytuly = {p['numer']: _formy_tytulu(p['tytul']) for p in json.load(f) if p.get('numer') and p.get('tytul')}
+    with open(plik_kategorii, 'r', encoding='utf-8') as f:
+        kategorie = {p['numerSiedl']: p['kategoria'] for p in json.load(f) if p.get('numerSiedl')}
+    zakazane = frozenset(_normalizuj(t) for t in DISALLOWED_TITLES)
+    grupy_stale = {'eucharystyczne': frozenset(KATEGORIE_EUCHARYSTYCZNE), 'ogolne': frozenset(KATEGORIE_OGOLNE)}
+    reguly = REGULY_MOMENTOW
+    dozwolone_dla_dnia: Dict[tuple, FrozenSet[str]] = {}
+
+    def dozwolone(sciezka: str, grupy: tuple) -> FrozenSet[str]:
+        klucz = (sciezka, grupy)
+        if klucz not in dozwolone_dla_dnia:
+            w_drzewie = sciezka.split('/', 1)[1] if '/' in sciezka else sciezka
+            tytul_dnia = os.path.splitext(os.path.basename(sciezka))[0]
+            zbior = set()
+            for grupa in grupy:
+                zbior |= set(kategorie_dnia(w_drzewie, tytul_dnia)) if grupa == 'okres' else grupy_stale[grupa]
+            dozwolone_dla_dnia[klucz] = frozenset(zbior)
+        return dozwolone_dla_dnia[klucz]
+
+    def waliduj(dzien: Any) -> Tuple[List[str], List[str]]:
+        bledy, ostrzezenia = waliduj_dzien(dzien), []
+        if not isinstance(dzien, dict) or not isinstance(dzien.get('piesniSugerowane'), list):
+            return bledy, ostrzezenia
+        sciezka = dzien.get('sciezka') or ''
+        liczby = dict.fromkeys(reguly, 0)
+
+        for i, piesn in enumerate(dzien['piesniSugerowane']):
+            if not isinstance(piesn, dict):
+                continue
+            numer, moment = piesn.get('numer'), piesn.get('moment')
+            tytul = _normalizuj(str(piesn.get('piesn') or ''))
+            wzorcowe = tytuly.get(numer)
+            if wzorcowe is None:
+                bledy.append(f"piesniSugerowane[{i}]: nieznany numer {numer!r}")
+            elif tytul not in wzorcowe:
+                bledy.append(f"piesniSugerowane[{i}]: tytuł {piesn.get('piesn')!r} nie pasuje do numeru {numer}")
+            if tytul in zakazane or (wzorcowe and not wzorcowe.isdisjoint(zakazane)):
+                bledy.append(f"piesniSugerowane[{i}]: zakazany hymn {piesn.get('piesn')!r}")
+
+            regula = reguly.get(moment)
+            if regula is None:
+                continue
+            liczby[moment] += 1
+            kategoria = kategorie.get(numer)
+            if kategoria is None:
+                continue
+            if kategoria in regula[3]:
+                bledy.append(f"piesniSugerowane[{i}]: kategoria {kategoria!r} niedozwolona w momencie {moment!r}")
+            elif regula[2] is not None and kategoria not in dozwolone(sciezka, regula[2]):
+                ostrzezenia.append(f"piesniSugerowane[{i}]: pieśń z kategorii {kategoria!r} nie pasuje do momentu {moment!r} w tym dniu")
+
+        for moment, (minimum, maksimum, _, _) in reguly.items():
+            if liczby[moment] < minimum:
+                bledy.append(f"brak pieśni na moment {moment!r}")
+            elif liczby[moment] > maksimum:
+                bledy.append(f"za dużo pieśni na moment {moment!r} ({liczby[moment]} > {maksimum})")
+        return bledy, ostrzezenia
+
+    return waliduj
+
+
+def indeksuj_zapytania(plik_zapytan: str) -> Dict[str, tuple]:
+    """Zapamiętuje pozycję bajtową każdej linii pliku zapytań według klucza (bez trzymania treści w pamięci)."""
+    indeks, poczatek = {}, 0
+    for koniec, linia in czytaj_linie_od(plik_zapytan, 0):
+        if linia.strip():
+            indeks[json.loads(linia).get('key')] = (poczatek, koniec - poczatek)
+        poczatek = koniec
+    return indeks
+
+
+def sprawdz_odpowiedzi(plik_odpowiedzi: str, waliduj: Callable[[Any], Tuple[List[str], List[str]]],
+                       plik_zapytan: str = None, plik_ponownych: str = None) -> Dict[str, Any]:
+    """
+    Czyta plik odpowiedzi strumieniowo, waliduje każdy dzień zaraz po sparsowaniu i od razu dopisuje
+    zapytanie z błędnymi dniami do pliku ponownych zapytań.
+
+    Returns:
+        Liczniki: dni, bledne_dni, ostrzezenia, propozycje, ponowione, bledne_odpowiedzi (linie, które nie są
+        poprawnym JSON-em), sekundy_walidacji (cały przebieg, z parsowaniem) oraz lista 'bledy'.
+    """
+    indeks = indeksuj_zapytania(plik_zapytan) if plik_zapytan and plik_ponownych else {}
+    wynik = {'dni': 0, 'bledne_dni': 0, 'ostrzezenia': 0, 'propozycje': 0, 'ponowione': 0, 'bledne_odpowiedzi': 0,
+             'sekundy_walidacji': 0.0, 'bledy': []}
+    ponowne = open(plik_ponownych, 'w', encoding='utf-8') if indeks else None
+    zapytania = open(plik_zapytan, 'rb') if indeks else None
+
+    try:
+        for koniec_linii, linia in czytaj_linie_od(plik_odpowiedzi, 0):
+            if not linia.strip():
+                continue
+            # Mierzony jest cały przebieg linii: dekodowanie, parsowanie odpowiedzi i reguły
+            start = time.perf_counter()
+            try:
+                with odcinek('dekodowanie JSON'):
+                    odpowiedz = json.loads(linia)
+                if not isinstance(odpowiedz, dict):
+                    raise ValueError("linia nie jest obiektem")
+            except ValueError as e:  # JSONDecodeError, a przy uciętym znaku wielobajtowym UnicodeDecodeError
+                wynik['bledne_odpowiedzi'] += 1
+                wynik['bledy'].append({'key': f"bajt-{koniec_linii - len(linia)}", 'sciezka': None,
+                                       'bledy': [f"niepoprawna linia JSON: {e}"], 'ostrzezenia': []})
+                wynik['sekundy_walidacji'] += time.perf_counter() - start
+                continue
+            klucz = odpowiedz.get('key')
+            tekst = wyciagnij_tekst(odpowiedz)
+            zle = tekst is None
+            # Szybka ścieżka: poprawny JSON po domknięciu do tablicy; parser tolerancyjny tylko przy błędzie
+            try:
+                with odcinek('dekodowanie odpowiedzi'):
+                    dane = json.loads(domknij_tablice(tekst or ''))
+                obiekty = [{'obiekt': dzien} for dzien in (dane if isinstance(dane, list) else [dane])]
+            except ValueError:
+                with odcinek('naprawa odpowiedzi'):
+                    obiekty = list(parsuj_tekst(tekst))
+            for obiekt in obiekty:
+                dzien = obiekt['obiekt']
+                if dzien is None:
+                    zle = zle or 'blad' in obiekt
+                    continue
+                with odcinek('walidacja: reguły'):
+                    bledy, ostrzezenia = waliduj(dzien)
+                wynik['dni'] += 1
+                wynik['propozycje'] += len(dzien.get('piesniSugerowane') or []) if isinstance(dzien, dict) else 0
+                wynik['ostrzezenia'] += len(ostrzezenia)
+                if bledy:
+                    zle = True
+                    wynik['bledne_dni'] += 1
+                if bledy or ostrzezenia:
+                    wynik['bledy'].append({'key': klucz, 'sciezka': dzien.get('sciezka') if isinstance(dzien, dict) else None,
+                                           'bledy': bledy, 'ostrzezenia': ostrzezenia})
+            wynik['sekundy_walidacji'] += time.perf_counter() - start
+
+            if zle and klucz in indeks:
+                poczatek, dlugosc = indeks.pop(klucz)
+                zapytania.seek(poczatek)
+                ponowne.write(zapytania.read(dlugosc).decode('utf-8'))
+                ponowne.flush()
+                wynik['ponowione'] += 1
+    finally:
+        if ponowne:
+            ponowne.close()
+            zapytania.close()
+    return wynik
+
+
+def sprawdz_korpus(folder_zrodlowy: str, waliduj: Callable[[Any], Tuple[List[str], List[str]]]) -> Dict[str, Any]:
+    """Waliduje piesniSugerowane zapisane już w plikach dni (te same reguły co dla odpowiedzi modelu)."""
+    manifest = odswiez_manifest(folder_zrodlowy, os.path.join(os.path.dirname(folder_zrodlowy), FOLDER_MANIFESTOW))
+    nazwa_drzewa = os.path.basename(os.path.normpath(folder_zrodlowy))
+    wynik = {'dni': 0, 'bledne_dni': 0, 'ostrzezenia': 0, 'propozycje': 0, 'ponowione': 0, 'bledne_odpowiedzi': 0,
+             'sekundy_walidacji': 0.0, 'bledy': []}
+    for sciezka in sorted(manifest['pliki']):
+        start = time.perf_counter()
+        with open(os.path.join(folder_zrodlowy, sciezka), 'r', encoding='utf-8') as f, odcinek('dekodowanie JSON'):
+            dane = json.load(f)
+        dzien = {'sciezka': f"{nazwa_drzewa}/{sciezka}", 'piesniSugerowane': dane.get('piesniSugerowane')}
+        with odcinek('walidacja: reguły'):
+            bledy, ostrzezenia = waliduj(dzien)
+        wynik['sekundy_walidacji'] += time.perf_counter() - start
+        wynik['dni'] += 1
+        wynik['propozycje'] += len(dzien['piesniSugerowane'] or [])
+        wynik['ostrzezenia'] += len(ostrzezenia)
+        if bledy:
+            wynik['bledne_dni'] += 1
+        if bledy or ostrzezenia:
+            wynik['bledy'].append({'key': None, 'sciezka': dzien['sciezka'], 'bledy': bledy, 'ostrzezenia': ostrzezenia})
+    return wynik
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Walidacja propozycji pieśni z odpowiedzi modelu.")
+    parser.add_argument('odpowiedzi', nargs='?', default=PLIK_ODPOWIEDZI, help="plik JSONL z odpowiedziami modelu")
+    parser.add_argument('--zapytania', default=PLIK_WYJSCIOWY, help="plik zapytań, z którego wybierane są zapytania do ponowienia")
+    parser.add_argument('--ponowne', default=PLIK_PONOWNYCH, help="plik na zapytania do ponownego wysłania")
+    parser.add_argument('--korpus', action='store_true', help="zamiast odpowiedzi sprawdź pliki dni w Lekcjonarz_JSON2")
+    parser.add_argument('--szczegoly', action='store_true', help="wypisz błędy każdego dnia")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    try:
+        waliduj = skompiluj_walidator(os.path.join(biezacy_folder, PIESNI_SOURCE_FILE_NAME),
+                                      os.path.join(biezacy_folder, PLIK_PIESNI))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"BŁĄD: Nie udało się wczytać bazy pieśni: {e}")
+        return
+
+    if args.korpus:
+        wynik = sprawdz_korpus(os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY)), waliduj)
+    else:
+        plik_odpowiedzi = os.path.join(biezacy_folder, args.odpowiedzi)
+        if not os.path.exists(plik_odpowiedzi):
+            print(f"BŁĄD: Nie znaleziono pliku z odpowiedziami: '{plik_odpowiedzi}'.")
+            return
+        plik_zapytan = os.path.join(biezacy_folder, args.zapytania)
+        wynik = sprawdz_odpowiedzi(plik_odpowiedzi, waliduj, plik_zapytan if os.path.exists(plik_zapytan) else None,
+                                   os.path.join(biezacy_folder, args.ponowne))
+
+    if args.szczegoly:
+        for wpis in wynik['bledy']:
+            print(f"\n{wpis['sciezka']} ({wpis['key']}):")
+            for blad in wpis['bledy']:
+                print(f"  - BŁĄD: {blad}")
+            for ostrzezenie in wpis['ostrzezenia']:
+                print(f"  - Ostrzeżenie: {ostrzezenie}")
+
+    print("\n--- Podsumowanie ---")
+    print(f"Sprawdzone dni: {wynik['dni']}, propozycje: {wynik['propozycje']}, dni z błędami: {wynik['bledne_dni']}, ostrzeżenia: {wynik['ostrzezenia']}")
+    if wynik['bledne_odpowiedzi']:
+        print(f"Linie odpowiedzi, które nie są poprawnym JSON-em: {wynik['bledne_odpowiedzi']}")
+    if wynik['sekundy_walidacji']:
+        print(f"Szybkość walidacji: {wynik['propozycje'] / wynik['sekundy_walidacji']:.0f} propozycji/s")
+    if wynik['ponowione']:
+        print(f"Zapytania do ponownego wysłania ({wynik['ponowione']}) zapisano w pliku '{args.ponowne}'.")
+
+
+if __name__ == '__main__':
+    uruchom_z_profilem(main)
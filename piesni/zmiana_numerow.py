@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Manifest korpusu (manifest.py) leży w głównym folderze projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from manifest import zapisz_json_atomowo
+from pakowanie_paczek import FOLDER_ZRODLOWY
+from skladanie_promptu import PLIK_PIESNI, wczytaj_piesni
+from statystyki_piesni import odswiez_widok
+
+# Przenosi poprawki numerów i tytułów pieśni z bazy (PiesniPoprawa/piesni_ostateczne.json) do plików dni.
+# Dni, w których występuje pieśń, są brane z indeksu odwrotnego w widoku statystyk (statystyki_piesni.py),
+# więc czytane i zapisywane są tylko pliki, których zmiana dotyczy. Pliki są przetwarzane równolegle,
+# każdy zapisywany atomowo; wszystkie zmiany w jednym pliku są nakładane naraz (także zamiany numerów A<->B).
+# Bez --zastosuj skrypt tylko wypisuje, których plików dotyczyłaby zmiana.
+
+# --- Konfiguracja ---
+# Liczba wątków zapisujących pliki dni
+LICZBA_WATKOW = 8
+
+
+def parsuj_zmiany(numery: List[str], tytuly: List[str], plik_zmian: Optional[str],
+                  tytuly_bazy: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Składa zmiany z linii poleceń i pliku w słownik: stary numer -> {'numer'?, 'piesn'?}.
+    Przy zmianie numeru bez podanego tytułu przyjmowany jest tytuł nowego numeru z bazy (jeśli jest),
+    a '--tytul NUMER' bez '=' oznacza tytuł z bazy.
+    """
+    zmiany: Dict[str, Dict[str, str]] = {}
+    if plik_zmian:
+        with open(plik_zmian, 'r', encoding='utf-8') as f:
+            for wpis in json.load(f):
+                zmiana = zmiany.setdefault(str(wpis['numer']), {})
+                if wpis.get('nowy_numer'):
+                    zmiana['numer'] = str(wpis['nowy_numer'])
+                if wpis.get('piesn'):
+                    zmiana['piesn'] = wpis['piesn']
+    for para in numery:
+        stary, _, nowy = para.partition('=')
+        if not nowy:
+            raise ValueError(f"zmiana numeru '{para}' nie ma postaci STARY=NOWY")
+        zmiany.setdefault(stary.strip(), {})['numer'] = nowy.strip()
+    for para in tytuly:
+        numer, rowna_sie, tytul = para.partition('=')
+        numer = numer.strip()
+        if not rowna_sie:
+            if numer not in tytuly_bazy:
+                raise ValueError(f"pieśni {numer} nie ma w bazie - podaj tytuł jako NUMER=TYTUŁ")
+            tytul = tytuly_bazy[numer]
+        zmiany.setdefault(numer, {})['piesn'] = tytul.strip()
+
+    for stary, zmiana in zmiany.items():
+        if 'numer' in zmiana and 'piesn' not in zmiana and zmiana['numer'] in tytuly_bazy:
+            zmiana['piesn'] = tytuly_bazy[zmiana['numer']]
+    return zmiany
+
+
+def pliki_do_zmiany(widok: dict, zmiany: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
+    """Z indeksu odwrotnego: ścieżka dnia -> numery ze zmian, które w nim występują."""
+    pliki: Dict[str, List[str]] = {}
+    for numer in zmiany:
+        for sciezka, _ in widok['piesni'].get(numer, {}).get('wystapienia', []):
+            numery = pliki.setdefault(sciezka, [])
+            if numer not in numery:
+                numery.append(numer)
+    return pliki
+
+
+def zmien_plik(sciezka: str, zmiany: Dict[str, Dict[str, str]]) -> int:
+    """Nakłada zmiany na sekcję piesniSugerowane jednego pliku dnia; zwraca liczbę zmienionych wpisów."""
+    with open(sciezka, 'r', encoding='utf-8') as f:
+        dane = json.load(f)
+    zmienione = 0
+    for piesn in dane.get('piesniSugerowane') or []:
+        zmiana = zmiany.get(str(piesn.get('numer')))
+        if not zmiana:
+            continue
+        nowa = dict(piesn, **zmiana)
+        if nowa != piesn:
+            piesn.update(zmiana)
+            zmienione += 1
+    if zmienione:
+        zapisz_json_atomowo(sciezka, dane, wciecie=2)
+    return zmienione
+
+
+def zastosuj_zmiany(folder_zrodlowy: str, pliki: Dict[str, List[str]], zmiany: Dict[str, Dict[str, str]],
+                    watki: int = LICZBA_WATKOW) -> Tuple[int, int, List[str]]:
+    """
+    Zapisuje zmiany równolegle w podanych plikach dni.
+
+    Returns:
+        Krotka (liczba zmienionych plików, liczba zmienionych wpisów, komunikaty błędów).
+    """
+    def zadanie(sciezka):
+        return zmien_plik(os.path.join(folder_zrodlowy, sciezka), {n: zmiany[n] for n in pliki[sciezka]})
+
+    zmienione_pliki, zmienione_wpisy, bledy = 0, 0, []
+    with ThreadPoolExecutor(max_workers=watki) as pula:
+        for sciezka, przyszly in [(s, pula.submit(zadanie, s)) for s in sorted(pliki)]:
+            try:
+                wpisy = przyszly.result()
+            except (OSError, json.JSONDecodeError) as e:
+                bledy.append(f"{sciezka}: {e}")
+                continue
+            zmienione_pliki += bool(wpisy)
+            zmienione_wpisy += wpisy
+    return zmienione_pliki, zmienione_wpisy, bledy
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Zmiana numerów i tytułów pieśni we wszystkich plikach dni, które ich używają.")
+    parser.add_argument('--numer', action='append', default=[], metavar='STARY=NOWY', help="zmiana numeru pieśni (można powtarzać)")
+    parser.add_argument('--tytul', action='append', default=[], metavar='NUMER[=TYTUŁ]',
+                        help="nowy tytuł pieśni; bez '=' - tytuł z bazy pieśni (można powtarzać)")
+    parser.add_argument('--plik', help="plik JSON z listą zmian [{'numer', 'nowy_numer'?, 'piesn'?}]")
+    parser.add_argument('--zastosuj', action='store_true', help="zapisz zmiany (domyślnie tylko lista plików)")
+    parser.add_argument('--watki', type=int, default=LICZBA_WATKOW, help=f"liczba wątków zapisu (domyślnie {LICZBA_WATKOW})")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_zrodlowy = os.path.normpath(os.path.join(biezacy_folder, FOLDER_ZRODLOWY))
+    if not os.path.isdir(folder_zrodlowy):
+        print(f"BŁĄD: Folder źródłowy '{folder_zrodlowy}' nie istnieje.")
+        return
+
+    try:
+        tytuly_bazy = {p['numerSiedl']: p['tytul'] for p in wczytaj_piesni(os.path.join(biezacy_folder, PLIK_PIESNI))}
+        zmiany = parsuj_zmiany(args.numer, args.tytul, args.plik, tytuly_bazy)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"BŁĄD: {e}")
+        return
+    if not zmiany:
+        print("Nie podano żadnych zmian (--numer, --tytul lub --plik).")
+        return
+
+    widok, _ = odswiez_widok(folder_zrodlowy)
+    pliki = pliki_do_zmiany(widok, zmiany)
+    for stary, zmiana in sorted(zmiany.items()):
+        liczba = len(widok['piesni'].get(stary, {}).get('wystapienia', []))
+        print(f"{stary} -> {zmiana.get('numer', stary)} '{zmiana.get('piesn', '(bez zmiany tytułu)')}': {liczba} wystąpień")
+
+    if not args.zastosuj:
+        for sciezka in sorted(pliki):
+            print(f"  {sciezka}")
+        print(f"\nZmiana dotyczy {len(pliki)} plików dni. Uruchom z --zastosuj, aby ją zapisać.")
+        return
+
+    zmienione_pliki, zmienione_wpisy, bledy = zastosuj_zmiany(folder_zrodlowy, pliki, zmiany, args.watki)
+    for blad in bledy:
+        print(f"BŁĄD: {blad}")
+    # Odświeżenie widoku przeczyta tylko właśnie zapisane pliki i uaktualni indeks odwrotny
+    widok, przeczytane = odswiez_widok(folder_zrodlowy)
+
+    print("\n--- Podsumowanie ---")
+    print(f"Zmienione pliki: {zmienione_pliki} z {len(pliki)}, zmienione wpisy: {zmienione_wpisy}, błędy: {len(bledy)}.")
+    print(f"Indeks odwrotny odświeżony ({przeczytane} plików dni przeczytanych ponownie).")
+
+
+if __name__ == '__main__':
+    main()
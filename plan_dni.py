@@ -0,0 +1,252 @@
+import os
+import re
+import bisect
+import hashlib
+import argparse
+import datetime
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
+
+from manifest import FOLDER_MANIFESTOW, oblicz_skrot, odswiez_manifest, wczytaj_json, zapisz_json_atomowo
+from rok_liturgiczny import FOLDER_KALENDARZA, PLIK_MAPY_NAZW, kalendarz_roku
+
+# Plan dni roku: data -> obchód z kalendarza (Kalendarz/<rok>.json), plik dnia w Lekcjonarz_JSON2 dla właściwego
+# roku A/B/C lub I/II, kolor i ranga. Złączenie kalendarza z mapą nazw (slownik_poprawiony_i_odwrocony.json,
+# nazwy plików bez przyrostka ' rok X') i ścieżkami drzewa - także z datą na początku nazwy ('d miesiąca - ...')
+# - jest liczone raz na rok i zapisywane w folderze manifestów z kluczem z treści kalendarza, mapy nazw i listy
+# plików drzewa, więc kolejne uruchomienia tylko wczytują gotowy plan. W pamięci plan jest listą dni w kolejności
+# dat ze słownikiem data -> dzień (odczyt jednej daty) i przeszukiwaniem binarnym dla zakresów dat.
+# Brak pliku kalendarza danego roku oznacza kalendarz liczony lokalnie (rok_liturgiczny.py).
+
+# --- Konfiguracja ---
+# Drzewo z dniami (względem głównego folderu projektu)
+FOLDER_DNI = 'Lekcjonarz_JSON2'
+
+# Plik z planem (w folderze manifestów); {rok} jest podmieniany
+NAZWA_PLIKU_PLANU = 'plan_dni_{rok}.json'
+
+# Ranga obchodu przy wyborze jednego pliku dnia dla daty (mniejsza = ważniejsza)
+RANGI_OBCHODOW = {'Uroczystość': 0, 'Święto': 1, '': 2, 'Wspomnienie obowiązkowe': 3, 'Wspomnienie dowolne': 4}
+
+# Nazwy miesięcy w nazwach plików dni datowanych
+MIESIACE = ['stycznia', 'lutego', 'marca', 'kwietnia', 'maja', 'czerwca', 'lipca',
+            'sierpnia', 'września', 'października', 'listopada', 'grudnia']
+
+# Słowa pomijane przy porównaniu obchodu z nazwą pliku datowanego i rozwinięcia skrótów w nazwach plików
+SLOWA_OGOLNE = {'uroczystość', 'święto', 'świętych', 'wspomnienie'}
+SKROTY = {'nmp': 'najświętszej maryi panny'}
+# --- Koniec Konfiguracji ---
+
+_ROK_W_NAZWIE = re.compile(r'\s+rok\s+\(?([ABC]|I{1,2})\)?$')
+_DATA_W_NAZWIE = re.compile(r'^(\d{1,2}) (\w+)')
+_NAWIAS = re.compile(r'\([^)]*\)')
+
+# Wersja sposobu przypisywania plików - część klucza planu, więc jej zmiana unieważnia zapisane plany
+_WERSJA_PLANU = 3
+
+_wczytane: Dict[str, 'PlanDni'] = {}
+
+
+def _rdzenie(tekst: str) -> set:
+    """Początki (5 liter) znaczących słów tekstu - porównanie odporne na odmianę ('Narodzenia'/'Narodzenie')."""
+    slowa = ' '.join(SKROTY.get(slowo, slowo) for slowo in re.findall(r'\w+', tekst.lower())).split()
+    return {slowo[:5] for slowo in slowa if len(slowo) >= 4 and slowo not in SLOWA_OGOLNE}
+
+
+def ten_sam_obchod(nazwa_obchodu: str, sciezka: str) -> bool:
+    """
+    Czy plik datowany ('d miesiąca - tytuł') opisuje ten obchód: wszystkie znaczące słowa tytułu (bez dopisków
+    w nawiasach) muszą występować w nazwie obchodu. Chroni przed przypisaniem np. pliku św. Wojciecha
+    (23 kwietnia) środzie w Oktawie Wielkanocy, gdy uroczystość jest przeniesiona.
+    """
+    tytul = os.path.splitext(sciezka.rsplit('/', 1)[-1])[0].partition(' - ')[2]
+    rdzenie = _rdzenie(_NAWIAS.sub(' ', tytul))
+    return bool(rdzenie) and rdzenie <= _rdzenie(nazwa_obchodu)
+
+
+def zbuduj_plan(kalendarz: Dict[str, dict], nazwy: Dict[str, str], pliki: List[str]) -> List[dict]:
+    """
+    Przypisuje datom z kalendarza pliki dni: obchód z kalendarza jest szukany po nazwie pliku
+    (przez mapę nazw); dopiero gdy żaden obchód daty nie ma pliku o swojej nazwie, brany jest plik z tą datą
+    na początku nazwy ('d miesiąca - ...', w dowolnym folderze drzewa), o ile opisuje jeden z obchodów
+    (ten_sam_obchod). Z kilku obchodów tej samej daty wybierany jest najważniejszy, z kilku plików datowanych
+    tego samego obchodu - ten z Datowane/, a z wariantów pliku - zgodny z rokiem A/B/C lub I/II.
+
+    Returns:
+        Lista dni w kolejności dat: {'data' (RRRR-MM-DD), 'sciezka' (None, jeśli nie znaleziono pliku),
+        'obchod', 'typ', 'kolor', 'ranga', 'rok_litera', 'rok_cyfra', 'niedziela', 'obchody' (wszystkie nazwy)}.
+    """
+    po_nazwie, po_dacie = defaultdict(list), defaultdict(list)
+    for sciezka in pliki:
+        nazwa = os.path.splitext(sciezka.rsplit('/', 1)[-1])[0]
+        dopasowanie = _ROK_W_NAZWIE.search(nazwa)
+        po_nazwie[nazwa[:dopasowanie.start()] if dopasowanie else nazwa].append((dopasowanie.group(1) if dopasowanie else None, sciezka))
+        data = _DATA_W_NAZWIE.match(nazwa)
+        if data and data.group(2) in MIESIACE:
+            po_dacie[(int(data.group(1)), MIESIACE.index(data.group(2)) + 1)].append(sciezka)
+
+    def wariant(warianty, info):
+        rok = {'1': 'I', '2': 'II'}.get(info.get('rok_cyfra'))
+        for oznaczenie, sciezka in warianty:
+            if oznaczenie in (None, info.get('rok_litera'), rok):
+                return sciezka
+        return None
+
+    obchody = defaultdict(list)
+    for nazwa, info in kalendarz.items():
+        obchody[datetime.datetime.strptime(info['data'], '%d-%m-%Y').date()].append((nazwa, info))
+
+    dni = []
+    for data in sorted(obchody):
+        wybor = []
+        for kolejnosc, (nazwa, info) in enumerate(obchody[data]):
+            sciezka = wariant(po_nazwie.get(nazwy.get(nazwa, nazwa), []), info)
+            if sciezka:
+                wybor.append((RANGI_OBCHODOW.get(info.get('typ', ''), 2), False, sciezka, kolejnosc))
+        if not wybor:
+            wybor = [(RANGI_OBCHODOW.get(info.get('typ', ''), 2), not sciezka.startswith('Datowane/'), sciezka, kolejnosc)
+                     for kolejnosc, (nazwa, info) in enumerate(obchody[data])
+                     for sciezka in po_dacie.get((data.day, data.month), [])
+                     if ten_sam_obchod(nazwa, sciezka)]
+        if wybor:
+            ranga, _, sciezka, kolejnosc = min(wybor)
+        else:
+            ranga, kolejnosc, sciezka = min((RANGI_OBCHODOW.get(info.get('typ', ''), 2), k, None)
+                                            for k, (_, info) in enumerate(obchody[data]))
+        nazwa, info = obchody[data][kolejnosc]
+        dni.append({
+            'data': data.isoformat(),
+            'sciezka': sciezka,
+            'obchod': nazwa,
+            'typ': info.get('typ', ''),
+            'kolor': info.get('kolor', ''),
+            'ranga': ranga,
+            'rok_litera': info.get('rok_litera'),
+            'rok_cyfra': info.get('rok_cyfra'),
+            'niedziela': data.weekday() == 6,
+            'obchody': [n for n, _ in obchody[data]],
+        })
+    return dni
+
+
+def _data_iso(data: Union[str, datetime.date]) -> str:
+    """Data w postaci RRRR-MM-DD (z obiektu daty lub napisu)."""
+    return data.isoformat() if isinstance(data, datetime.date) else datetime.date.fromisoformat(data).isoformat()
+
+
+class PlanDni:
+    """
+    Plan dni jednego roku: lista dni w kolejności dat, słownik data -> dzień i lista dat (RRRR-MM-DD)
+    do przeszukiwania binarnego zakresów.
+    """
+
+    def __init__(self, dni: List[dict]):
+        self.dni = dni
+        self.daty = [dzien['data'] for dzien in dni]
+        self.po_dacie = {dzien['data']: dzien for dzien in dni}
+
+    def dzien(self, data: Union[str, datetime.date]) -> Optional[dict]:
+        """Dzień planu dla daty lub None, jeśli data nie należy do kalendarza."""
+        return self.po_dacie.get(_data_iso(data))
+
+    def zakres(self, od: Union[str, datetime.date], do: Union[str, datetime.date]) -> List[dict]:
+        """Dni planu z zakresu dat od-do (włącznie)."""
+        poczatek = bisect.bisect_left(self.daty, _data_iso(od))
+        koniec = bisect.bisect_right(self.daty, _data_iso(do))
+        return self.dni[poczatek:koniec]
+
+    def rozwiazane(self) -> List[dict]:
+        """Dni, którym przypisano plik dnia."""
+        return [dzien for dzien in self.dni if dzien['sciezka']]
+
+    def nierozwiazane(self) -> List[str]:
+        """Daty, dla których nie znaleziono pliku dnia."""
+        return [dzien['data'] for dzien in self.dni if not dzien['sciezka']]
+
+
+def wczytaj_plan(rok: int, folder_glowny: Optional[str] = None) -> PlanDni:
+    """
+    Zwraca plan dni roku: z pamięci, z pliku w folderze manifestów (jeśli klucz się zgadza) albo liczony od nowa
+    i zapisywany. Kluczem jest skrót wersji planu, treści kalendarza i mapy nazw oraz lista plików drzewa dni.
+
+    Raises:
+        OSError: jeśli nie da się odczytać kalendarza lub mapy nazw.
+        json.JSONDecodeError: jeśli kalendarz lub mapa nazw nie są poprawnym JSON-em.
+    """
+    folder_glowny = folder_glowny or os.path.dirname(os.path.abspath(__file__))
+    folder_manifestow = os.path.join(folder_glowny, FOLDER_MANIFESTOW)
+    plik_kalendarza = os.path.join(folder_glowny, FOLDER_KALENDARZA, f"{rok}.json")
+    plik_nazw = os.path.join(folder_glowny, FOLDER_KALENDARZA, PLIK_MAPY_NAZW)
+
+    pliki = sorted(odswiez_manifest(os.path.join(folder_glowny, FOLDER_DNI), folder_manifestow)['pliki'])
+    kalendarz_z_pliku = os.path.exists(plik_kalendarza)
+    skrot = hashlib.sha256()
+    for czesc in [f"wersja {_WERSJA_PLANU}", oblicz_skrot(plik_kalendarza) if kalendarz_z_pliku else f"rok_liturgiczny {rok}",
+                  oblicz_skrot(plik_nazw)] + pliki:
+        skrot.update(czesc.encode('utf-8') + b'\n')
+    klucz = skrot.hexdigest()
+    if klucz in _wczytane:
+        return _wczytane[klucz]
+
+    plik_planu = os.path.join(folder_manifestow, NAZWA_PLIKU_PLANU.format(rok=rok))
+    zapisany = wczytaj_json(plik_planu, {})
+    if zapisany.get('klucz') == klucz:
+        dni = zapisany['dni']
+    else:
+        nazwy = wczytaj_json(plik_nazw, None)
+        if nazwy is None:
+            raise FileNotFoundError(f"Brak mapy nazw '{plik_nazw}'")
+        kalendarz = wczytaj_json(plik_kalendarza) if kalendarz_z_pliku else kalendarz_roku(rok, nazwy)
+        dni = zbuduj_plan(kalendarz, nazwy, pliki)
+        zapisz_json_atomowo(plik_planu, {'klucz': klucz, 'rok': rok, 'dni': dni})
+    _wczytane[klucz] = PlanDni(dni)
+    return _wczytane[klucz]
+
+
+def opis_dnia(dzien: dict) -> str:
+    """Jednowierszowy opis dnia planu."""
+    plik = dzien['sciezka'] or 'BRAK PLIKU DNIA'
+    return f"{dzien['data']}  {dzien['obchod']} [{dzien['typ'] or 'dzień'}, {dzien['kolor']}, rok {dzien['rok_litera']}/{dzien['rok_cyfra']}] -> {plik}"
+
+
+def main():
+    """Wypisuje dni planu dla podanych dat lub zakresu oraz daty bez pliku dnia."""
+    parser = argparse.ArgumentParser(description="Plan dni roku: data -> obchód z kalendarza i plik dnia z Lekcjonarz_JSON2.")
+    parser.add_argument('daty', nargs='*', help="daty w postaci RRRR-MM-DD")
+    parser.add_argument('--od', help="początek zakresu dat (RRRR-MM-DD)")
+    parser.add_argument('--do', help="koniec zakresu dat (RRRR-MM-DD, domyślnie koniec roku daty --od)")
+    parser.add_argument('--rok', type=int, action='append', default=[], help="wypisz daty bez pliku dnia dla roku (można powtarzać)")
+    args = parser.parse_args()
+    if not (args.daty or args.od or args.rok):
+        parser.error("podaj daty, zakres --od/--do albo --rok")
+
+    try:
+        daty = [datetime.date.fromisoformat(d) for d in args.daty]
+        od = datetime.date.fromisoformat(args.od) if args.od else None
+        do = datetime.date.fromisoformat(args.do) if args.do else (datetime.date(od.year, 12, 31) if od else None)
+    except ValueError as e:
+        print(f"BŁĄD: Niepoprawna data: {e}")
+        return
+
+    try:
+        for data in daty:
+            dzien = wczytaj_plan(data.year).dzien(data)
+            print(opis_dnia(dzien) if dzien else f"{data.isoformat()}  brak daty w kalendarzu roku {data.year}")
+        if od:
+            for rok in range(od.year, do.year + 1):
+                for dzien in wczytaj_plan(rok).zakres(od, do):
+                    print(opis_dnia(dzien))
+        for rok in args.rok:
+            plan = wczytaj_plan(rok)
+            nierozwiazane = plan.nierozwiazane()
+            print(f"\n--- Podsumowanie {rok} ---")
+            print(f"Dni w kalendarzu: {len(plan.dni)}, z plikiem dnia: {len(plan.dni) - len(nierozwiazane)}, "
+                  f"bez pliku: {len(nierozwiazane)}.")
+            for data in nierozwiazane:
+                print(f"  {opis_dnia(plan.dzien(data))}")
+    except (OSError, ValueError) as e:
+        print(f"BŁĄD: Nie udało się zbudować planu dni: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+# Lekkie pomiary dla skryptów korpusu: odcinki (nazwany fragment kodu - liczba wejść i łączny czas)
+# i liczniki zdarzeń. Dopóki profilowanie jest wyłączone, odcinek to jedno sprawdzenie flagi, a licznik
+# nic nie robi, więc wywołania mogą zostać w kodzie na stałe. Opcja --profile (uruchom_z_profilem w bloku
+# __main__ skryptu albo 'laudate --profile ...' dla dowolnego narzędzia) włącza odcinki, cProfile i tracemalloc,
+# a po zakończeniu zapisuje w folderze manifestów zrzut pstats, raport największych alokacji i podsumowanie
+# odcinków. Odcinki mierzone w procesach roboczych puli nie trafiają do podsumowania procesu głównego.
+
+# --- Konfiguracja ---
+# Folder na wyniki profilowania (względem głównego folderu projektu)
+FOLDER_PROFILI = os.path.join('manifesty', 'profile')
+
+# Liczba pozycji w raporcie alokacji i liczba klatek stosu zapamiętywanych przez tracemalloc
+POZYCJE_ALOKACJI = 25
+KLATKI_STOSU = 1
+
+# Liczba funkcji wypisywanych z pstats (sortowanie po czasie łącznym)
+POZYCJE_PSTATS = 20
+# --- Koniec Konfiguracji ---
+
+OPCJA = '--profile'
+
+_wlaczone = False
+_odcinki = defaultdict(lambda: [0, 0.0])
+_liczniki: Counter = Counter()
+
+
+@contextmanager
+def odcinek(nazwa: str):
+    """Mierzy czas bloku 'with' pod podaną nazwą (tylko przy włączonym profilowaniu)."""
+    if not _wlaczone:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wpis = _odcinki[nazwa]
+        wpis[0] += 1
+        wpis[1] += time.perf_counter() - start
+
+
+def licz(nazwa: str, ile: int = 1):
+    """Zwiększa licznik zdarzeń (tylko przy włączonym profilowaniu)."""
+    if _wlaczone:
+        _liczniki[nazwa] += ile
+
+
+def podsumowanie_odcinkow() -> List[str]:
+    """Wiersze podsumowania: odcinki od najdłuższego (łączny czas, wejścia, średnia) i liczniki."""
+    wiersze = []
+    for nazwa, (wejscia, sekundy) in sorted(_odcinki.items(), key=lambda para: -para[1][1]):
+        wiersze.append(f"{sekundy:10.3f} s  {wejscia:8d}x  {sekundy / wejscia * 1000:10.3f} ms  {nazwa}")
+    if _liczniki:
+        wiersze.append('')
+        wiersze += [f"{liczba:10d}  {nazwa}" for nazwa, liczba in sorted(_liczniki.items())]
+    return wiersze
+
+
+def wyciagnij_opcje(argumenty: List[str]) -> Tuple[List[str], Optional[str]]:
+    """
+    Usuwa z listy argumentów opcję --profile (lub --profile=PREFIKS).
+
+    Returns:
+        Krotka (argumenty bez opcji, prefiks plików wynikowych - '' dla domyślnego - albo None bez opcji).
+    """
+    reszta, prefiks = [], None
+    for argument in argumenty:
+        if argument == OPCJA:
+            prefiks = ''
+        elif argument.startswith(OPCJA + '='):
+            prefiks = argument[len(OPCJA) + 1:]
+        else:
+            reszta.append(argument)
+    return reszta, prefiks
+
+
+@contextmanager
+def profil(nazwa: str, prefiks: str = ''):
+    """
+    Profiluje blok 'with': włącza odcinki, cProfile i tracemalloc, a na końcu (także po wyjątku) zapisuje
+    <prefiks>.pstats, <prefiks>-pamiec.txt i <prefiks>-odcinki.txt oraz wypisuje podsumowanie.
+    Domyślny prefiks to <FOLDER_PROFILI>/<nazwa>-<data i czas>.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    global _wlaczone
+    if not prefiks:
+        folder_glowny = os.path.dirname(os.path.abspath(__file__))
+        prefiks = os.path.join(folder_glowny, FOLDER_PROFILI, f"{nazwa}-{time.strftime('%Y%m%d-%H%M%S')}")
+    prefiks = os.path.abspath(prefiks)
+    os.makedirs(os.path.dirname(prefiks), exist_ok=True)
+
+    _odcinki.clear()
+    _liczniki.clear()
+    _wlaczone = True
+    tracemalloc.start(KLATKI_STOSU)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        czas = time.perf_counter() - start
+        migawka = tracemalloc.take_snapshot()
+        _, szczyt = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _wlaczone = False
+
+        profiler.dump_stats(f"{prefiks}.pstats")
+        alokacje = migawka.statistics('lineno')
+        with open(f"{prefiks}-pamiec.txt", 'w', encoding='utf-8') as f:
+            f.write(f"Szczyt pamięci śledzonej przez tracemalloc: {szczyt / 1024 / 1024:.1f} MiB\n")
+            f.write(f"Łącznie zajęte na końcu: {sum(s.size for s in alokacje) / 1024 / 1024:.1f} MiB\n\n")
+            f.writelines(f"{statystyka}\n" for statystyka in alokacje[:POZYCJE_ALOKACJI])
+        odcinki = podsumowanie_odcinkow()
+        with open(f"{prefiks}-odcinki.txt", 'w', encoding='utf-8') as f:
+            f.write(f"Czas całkowity: {czas:.3f} s\n\n")
+            f.writelines(f"{wiersz}\n" for wiersz in odcinki)
+
+        print(f"\n--- Profil ({nazwa}) ---", file=sys.stderr)
+        print(f"Czas całkowity: {czas:.3f} s, szczyt pamięci: {szczyt / 1024 / 1024:.1f} MiB", file=sys.stderr)
+        for wiersz in odcinki:
+            print(wiersz, file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(POZYCJE_PSTATS)
+        print(f"Zapisano: {prefiks}.pstats, {prefiks}-pamiec.txt, {prefiks}-odcinki.txt", file=sys.stderr)
+
+
+def uruchom_z_profilem(funkcja: Callable, nazwa: Optional[str] = None):
+    """
+    Wywołuje funkcję (zwykle main skryptu); jeśli w sys.argv jest --profile, usuwa tę opcję przed
+    parsowaniem argumentów przez skrypt i wykonuje funkcję pod profilem.
+    """
+    sys.argv, prefiks = wyciagnij_opcje(sys.argv)
+    if prefiks is None:
+        return funkcja()
+    with profil(nazwa or os.path.splitext(os.path.basename(sys.argv[0]))[0], prefiks):
+        return funkcja()
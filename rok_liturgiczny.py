@@ -0,0 +1,572 @@
+import os
+import time
+import argparse
+import datetime
+from typing import Dict, List, Optional, Tuple
+
+from manifest import wczytaj_json, zapisz_json_atomowo
+
+# Kalendarz liturgiczny liczony lokalnie, bez pobierania pliku ICS z gcatholic.org (PobieranieKalendarza/PobierzKalendarz.kt).
+# Z daty Wielkanocy (komputus gregoriański) i pierwszej niedzieli Adwentu wynikają granice okresów i numery tygodni;
+# na dni okresowe nakładane są obchody stałe (tabela SWIETA_STALE, kalendarz ogólny z własnymi obchodami polskimi)
+# zgodnie z tabelą pierwszeństwa: uroczystości przeszkodzone są przenoszone na najbliższy wolny dzień, święta
+# i wspomnienia przeszkodzone - pomijane, a w dni uprzywilejowane (Wielki Post, 17-24 grudnia, oktawa Narodzenia)
+# wspomnienia stają się dowolnymi. Nazwy są tworzone w brzmieniu gcatholic.org i tłumaczone tą samą mapą co
+# w narzędziu Kotlin (Kalendarz/slownik_poprawiony_i_odwrocony.json), a rok A/B/C i I/II - jak w calculateLiturgicalCycles,
+# więc wynik ma postać plików Kalendarz/<rok>.json.
+
+# --- Konfiguracja ---
+# Folder z kalendarzami (względem głównego folderu projektu)
+FOLDER_KALENDARZA = 'Kalendarz'
+
+# Mapa nazw gcatholic.org -> nazwy w kalendarzu (ta sama co translationMap w PobierzKalendarz.kt)
+PLIK_MAPY_NAZW = 'slownik_poprawiony_i_odwrocony.json'
+
+# Kody rodzajów obchodów (jak w pliku ICS) i ich nazwy w kalendarzu
+TYPY = {'U': 'Uroczystość', 'Ś': 'Święto', 'W': 'Wspomnienie obowiązkowe', 'w': 'Wspomnienie dowolne', '': ''}
+
+# Pierwszeństwo obchodów stałych (tabela dni liturgicznych; mniejsza liczba - ważniejszy dzień)
+RANGI_TYPOW = {'U': 3, 'Ś': 7, 'W': 10, 'w': 12, '': 13}
+# Obchody stałe o randze innej niż wynika z kodu: święta Pańskie (wypierają niedzielę zwykłą) i Dzień Zaduszny
+RANGI_SZCZEGOLNE = {
+    'Ofiarowanie Pańskie': 5,
+    'Przemienienie Pańskie': 5,
+    'Podwyższenie Krzyża Świętego': 5,
+    'Rocznica poświęcenia Bazyliki Laterańskiej': 5,
+    'Wspomnienie wszystkich wiernych zmarłych': 3,
+}
+
+# Ranga dni uprzywilejowanych: wspomnienia są w nie tylko wspominane (jako dowolne, w kolorze dnia)
+RANGA_DNI_UPRZYWILEJOWANYCH = 9
+# Najniższa ranga dnia, w który nie obchodzi się żadnych wspomnień (niedziele, święta, uroczystości)
+RANGA_BEZ_WSPOMNIEN = 8
+
+# Sobotnie wspomnienie NMP w okresie zwykłym (w kalendarzu z datą w nazwie, jak w PobierzKalendarz.kt)
+WSPOMNIENIE_SOBOTNIE = 'Najświętszej Maryi Panny'
+
+# Obchody stałe: (miesiąc, dzień, nazwa jak w gcatholic.org, kod rodzaju, kolor)
+SWIETA_STALE = [
+    (1, 1, 'Świętej Bożej Rodzicielki Maryi', 'U', 'Biały'),
+    (1, 2, 'Świętych Bazylego Wielkiego i Grzegorza z Nazjanzu, biskupów i doktorów Kościoła', 'W', 'Biały'),
+    (1, 3, 'Najświętszego Imienia Jezus', 'w', 'Biały'),
+    (1, 7, 'Św. Rajmunda z Penyafort, prezbitera', 'w', 'Biały'),
+    (1, 13, 'Św. Hilarego, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (1, 17, 'Św. Antoniego, opata', 'W', 'Biały'),
+    (1, 19, 'Św. Józefa Sebastiana Pelczara, biskupa', 'w', 'Biały'),
+    (1, 20, 'Św. Fabiana, papieża i męczennika', 'w', 'Czerwony'),
+    (1, 20, 'Św. Sebastiana, męczennika', 'w', 'Czerwony'),
+    (1, 21, 'Św. Agnieszki, dziewicy i męczennicy', 'W', 'Czerwony'),
+    (1, 22, 'Św. Wincentego Pallottiego, prezbitera', 'w', 'Biały'),
+    (1, 22, 'Św. Wincentego, diakona i męczennika', 'w', 'Czerwony'),
+    (1, 24, 'Św. Franciszka Salezego, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (1, 25, 'Nawrócenie św. Pawła, Apostoła', 'Ś', 'Biały'),
+    (1, 26, 'Świętych biskupów Tymoteusza i Tytusa', 'W', 'Biały'),
+    (1, 27, 'Św. Anieli Merici, dziewicy', 'w', 'Biały'),
+    (1, 28, 'Św. Tomasza z Akwinu, prezbitera i doktora Kościoła', 'W', 'Biały'),
+    (1, 31, 'Św. Jana Bosko, prezbitera', 'W', 'Biały'),
+    (2, 2, 'Ofiarowanie Pańskie', 'Ś', 'Biały'),
+    (2, 3, 'Św. Błażeja, biskupa i męczennika', 'w', 'Czerwony'),
+    (2, 3, 'Św. Oskara, biskupa', 'w', 'Biały'),
+    (2, 5, 'Św. Agaty, dziewicy i męczennicy', 'W', 'Czerwony'),
+    (2, 6, 'Świętych męczenników Pawła Miki i Towarzyszy', 'W', 'Czerwony'),
+    (2, 8, 'Św. Hieronima Emilianiego', 'w', 'Biały'),
+    (2, 8, 'Św. Józefiny Bakhity, dziewicy', 'w', 'Biały'),
+    (2, 10, 'Św. Scholastyki, dziewicy', 'W', 'Biały'),
+    (2, 11, 'Najświętszej Maryi Panny z Lourdes', 'w', 'Biały'),
+    (2, 14, 'Świętych Cyryla, mnicha i Metodego, biskupa', 'Ś', 'Biały'),
+    (2, 17, 'Świętych Siedmiu Założycieli Zakonu Serwitów Najświętszej Maryi Panny', 'w', 'Biały'),
+    (2, 21, 'Św. Piotra Damianiego, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (2, 22, 'Katedry św. Piotra, Apostoła', 'Ś', 'Biały'),
+    (2, 23, 'Św. Polikarpa, biskupa i męczennika', 'W', 'Czerwony'),
+    (2, 27, 'Św. Grzegorza z Nareku, opata i doktora Kościoła', 'w', 'Biały'),
+    (3, 4, 'Św. Kazimierza', 'Ś', 'Biały'),
+    (3, 7, 'Świętych męczennic Perpetuy i Felicyty', 'W', 'Czerwony'),
+    (3, 8, 'Św. Jana Bożego, zakonnika', 'w', 'Biały'),
+    (3, 9, 'Św. Franciszki Rzymianki, zakonnicy', 'w', 'Biały'),
+    (3, 17, 'Św. Patryka, biskupa', 'w', 'Biały'),
+    (3, 18, 'Św. Cyryla Jerozolimskiego, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (3, 19, 'Św. Józefa, Oblubieńca Najświętszej Maryi Panny', 'U', 'Biały'),
+    (3, 23, 'Św. Turybiusza z Mongrovejo, biskupa', 'w', 'Biały'),
+    (3, 25, 'Zwiastowanie Pańskie', 'U', 'Biały'),
+    (4, 2, 'Św. Franciszka z Paoli, pustelnika', 'w', 'Biały'),
+    (4, 4, 'Św. Izydora, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (4, 5, 'Św. Wincentego Ferreriusza, prezbitera', 'w', 'Biały'),
+    (4, 7, 'Św. Jana Chrzciciela de la Salle, prezbitera', 'W', 'Biały'),
+    (4, 13, 'Św. Marcina I, papieża i męczennika', 'w', 'Czerwony'),
+    (4, 21, 'Św. Anzelma, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (4, 23, 'Św. Wojciecha, biskupa i męczennika', 'U', 'Czerwony'),
+    (4, 24, 'Św. Fidelisa z Sigmaringen, prezbitera i męczennika', 'w', 'Czerwony'),
+    (4, 25, 'Św. Marka, Ewangelisty', 'Ś', 'Czerwony'),
+    (4, 28, 'Św. Piotra Chanela, prezbitera i męczennika', 'w', 'Czerwony'),
+    (4, 28, 'Św. Ludwika Marii Grignion de Montfort, prezbitera', 'w', 'Biały'),
+    (4, 29, 'Św. Katarzyny Sieneńskiej, dziewicy i doktora Kościoła', 'Ś', 'Biały'),
+    (4, 30, 'Św. Piusa V, papieża', 'w', 'Biały'),
+    (5, 1, 'Św. Józefa, rzemieślnika', 'w', 'Biały'),
+    (5, 2, 'Św. Atanazego, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (5, 3, 'Najświętszej Maryi Panny, Królowej Polski', 'U', 'Biały'),
+    (5, 4, 'Św. Floriana, męczennika', 'w', 'Czerwony'),
+    (5, 5, 'Św. Stanisława Kazimierczyka, prezbitera', 'w', 'Biały'),
+    (5, 6, 'Świętych Apostołów Filipa i Jakuba', 'Ś', 'Czerwony'),
+    (5, 8, 'Św. Stanisława, biskupa i męczennika', 'U', 'Czerwony'),
+    (5, 10, 'Św. Jan z Ávili, prezbitera i doktora Kościoła', 'w', 'Biały'),
+    (5, 12, 'Św. Pankracego, męczennika', 'w', 'Czerwony'),
+    (5, 12, 'Świętych męczenników Nereusza i Achillesa', 'w', 'Czerwony'),
+    (5, 13, 'Najświętszej Maryi Panny Fatimskiej', 'w', 'Biały'),
+    (5, 14, 'Św. Macieja, Apostoła', 'Ś', 'Czerwony'),
+    (5, 16, 'Św. Andrzeja Boboli, prezbitera i męczennika', 'Ś', 'Czerwony'),
+    (5, 18, 'Św. Jana I, papieża i męczennika', 'w', 'Czerwony'),
+    (5, 18, 'Św. Stanisława Papczyńskiego, prezbitera', 'w', 'Biały'),
+    (5, 20, 'Św. Bernardyna ze Sieny, prezbitera', 'w', 'Biały'),
+    (5, 21, 'Świętych męczenników Krzysztofa Magallanesa, prezbitera, i Towarzyszy', 'w', 'Czerwony'),
+    (5, 22, 'Św. Rity z Cascii, zakonnicy', 'w', 'Biały'),
+    (5, 24, 'Najświętszej Maryi Panny, Wspomożycielki Wiernych', 'W', 'Biały'),
+    (5, 25, 'Św. Bedy Czcigodnego, prezbitera i doktora Kościoła', 'w', 'Biały'),
+    (5, 25, 'Św. Grzegorza VII, papieża', 'w', 'Biały'),
+    (5, 25, 'Św. Marii Magdaleny de Pazzi, dziewicy', 'w', 'Biały'),
+    (5, 26, 'Św. Filipa Nereusza, prezbitera', 'W', 'Biały'),
+    (5, 27, 'Św. Augustyna z Canterbury, biskupa', 'w', 'Biały'),
+    (5, 27, 'Św. Pawła VI, papieża', 'w', 'Biały'),
+    (5, 28, 'Bł. Stefan Wyszyński, biskupa', 'w', 'Biały'),
+    (5, 29, 'Św. Urszuli Ledóchowskiej, dziewicy', 'W', 'Biały'),
+    (5, 30, 'Św. Jana Sarkandra, prezbitera i męczennika', 'w', 'Czerwony'),
+    (5, 30, 'Św. Zdzisławy', 'w', 'Biały'),
+    (5, 31, 'Nawiedzenie Najświętszej Maryi Panny', 'Ś', 'Biały'),
+    (6, 1, 'Św. Justyna, męczennika', 'W', 'Czerwony'),
+    (6, 2, 'Świętych męczenników Marcelina i Piotra', 'w', 'Czerwony'),
+    (6, 3, 'Świętych męczenników Karola Lwangi i Towarzyszy', 'W', 'Czerwony'),
+    (6, 5, 'Św. Bonifacego, biskupa i męczennika', 'W', 'Czerwony'),
+    (6, 6, 'Św. Norberta, biskupa', 'w', 'Biały'),
+    (6, 9, 'Św. Efrema, diakona i doktora Kościoła', 'w', 'Biały'),
+    (6, 11, 'Św. Barnaby, Apostoła', 'W', 'Czerwony'),
+    (6, 13, 'Św. Antoniego z Padwy, prezbitera i doktora Kościoła', 'W', 'Biały'),
+    (6, 14, 'Bł. Michała Kozala, biskupa i męczennika', 'W', 'Czerwony'),
+    (6, 17, 'Św. Alberta Chmielowskiego, zakonnika', 'W', 'Biały'),
+    (6, 19, 'Św. Romualda, opata', 'w', 'Biały'),
+    (6, 21, 'Św. Alojzego Gonzagi, zakonnika', 'W', 'Biały'),
+    (6, 22, 'Św. Paulina z Noli, biskupa', 'w', 'Biały'),
+    (6, 22, 'Świętych męczenników Jana Fishera, biskupa, i Tomasza More', 'w', 'Czerwony'),
+    (6, 24, 'Narodzenie św. Jana Chrzciciela', 'U', 'Biały'),
+    (6, 26, 'Św. Zygmunta Gorazdowskiego, prezbitera', 'w', 'Biały'),
+    (6, 27, 'Św. Cyryla Aleksandryjskiego, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (6, 28, 'Św. Ireneusza, biskupa, męczennika i doktora Kościoła', 'W', 'Czerwony'),
+    (6, 29, 'Świętych Apostołów Piotra i Pawła', 'U', 'Czerwony'),
+    (6, 30, 'Świętych pierwszych męczenników świętego Kościoła Rzymskiego', 'w', 'Czerwony'),
+    (7, 1, 'Św. Ottona z Bambergu, biskupa', 'w', 'Biały'),
+    (7, 3, 'Św. Tomasza, Apostoła', 'Ś', 'Czerwony'),
+    (7, 4, 'Św. Elżbiety Portugalskiej', 'w', 'Biały'),
+    (7, 5, 'Św. Antoniego Marii Zaccarii, prezbitera', 'w', 'Biały'),
+    (7, 5, 'Św. Marii Goretti, dziewicy i męczennicy', 'w', 'Czerwony'),
+    (7, 8, 'Św. Jana z Dukli, prezbitera', 'W', 'Biały'),
+    (7, 9, 'Świętych męczenników Augustyna Zhao Rong, prezbitera,i Towarzyszy', 'w', 'Czerwony'),
+    (7, 11, 'Św. Benedykta, opata', 'Ś', 'Biały'),
+    (7, 12, 'Św. Brunona Bonifacego z Kwerfurtu, biskupa i męczennika', 'W', 'Czerwony'),
+    (7, 14, 'Św. Henryka', 'w', 'Biały'),
+    (7, 14, 'Św. Kamila de Lellis, prezbitera', 'w', 'Biały'),
+    (7, 15, 'Św. Bonawentury, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (7, 16, 'Najświętszej Maryi Panny z Góry Karmel', 'W', 'Biały'),
+    (7, 18, 'Św. Szymona z Lipnicy, prezbitera', 'w', 'Biały'),
+    (7, 21, 'Św. Apolinarego, biskupa i męczennika', 'w', 'Czerwony'),
+    (7, 21, 'Św. Wawrzyńca z Brindisi, prezbitera i doktora Kościoła', 'w', 'Biały'),
+    (7, 22, 'Św. Marii Magdaleny', 'Ś', 'Biały'),
+    (7, 23, 'Św. Brygidy, zakonnicy', 'Ś', 'Biały'),
+    (7, 24, 'Św. Kingi, dziewicy', 'W', 'Biały'),
+    (7, 25, 'Św. Jakuba, Apostoła', 'Ś', 'Czerwony'),
+    (7, 26, 'Świętych Joachima i Anny, rodziców Najświętszej Maryi Panny', 'W', 'Biały'),
+    (7, 28, 'Św. Sarbeliusza Makhlufa, prezbitera', 'w', 'Biały'),
+    (7, 29, 'Świętych Marty, Marii i Łazarza', 'W', 'Biały'),
+    (7, 30, 'Św. Piotra Chryzologa, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (7, 31, 'Św. Ignacego z Loyoli, prezbitera', 'W', 'Biały'),
+    (8, 1, 'Św. Alfonsa Marii Liguoriego, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (8, 2, 'Św. Euzebiusza z Vercelli, biskupa', 'w', 'Biały'),
+    (8, 2, 'Św. Piotra Juliani Eymarda, prezbitera', 'w', 'Biały'),
+    (8, 4, 'Św. Jana Marii Vianneya, prezbitera', 'W', 'Biały'),
+    (8, 5, 'Rocznica poświęcenia rzymskiej Bazyliki Najświętszej Maryi Panny', 'w', 'Biały'),
+    (8, 6, 'Przemienienie Pańskie', 'Ś', 'Biały'),
+    (8, 7, 'Św. Kajetana, prezbitera', 'w', 'Biały'),
+    (8, 7, 'Świętych męczenników Sykstusa II, papieża, i Towarzyszy', 'w', 'Czerwony'),
+    (8, 8, 'Św. Dominika, prezbitera', 'W', 'Biały'),
+    (8, 9, 'Św. Teresy Benedykty od Krzyża, dziewicy i męczennicy', 'Ś', 'Czerwony'),
+    (8, 10, 'Św. Wawrzyńca, diakona i męczennika', 'Ś', 'Czerwony'),
+    (8, 11, 'Św. Klary, dziewicy', 'W', 'Biały'),
+    (8, 12, 'Św. Joanny Franciszki de Chantal, zakonnicy', 'w', 'Biały'),
+    (8, 13, 'Świętych męczenników Poncjana, papieża, i Hipolita,prezbitera', 'w', 'Czerwony'),
+    (8, 14, 'Św. Maksymiliana Marii Kolbego, prezbitera i męczennika', 'W', 'Czerwony'),
+    (8, 15, 'Wniebowzięcie Najświętszej Maryi Panny', 'U', 'Biały'),
+    (8, 16, 'Św. Stefana Węgierskiego', 'w', 'Biały'),
+    (8, 17, 'Św. Jacka, prezbitera', 'W', 'Biały'),
+    (8, 19, 'Św. Jana Eudesa, prezbitera', 'w', 'Biały'),
+    (8, 20, 'Św. Bernarda, opata i doktora Kościoła', 'W', 'Biały'),
+    (8, 21, 'Św. Piusa X, papieża', 'W', 'Biały'),
+    (8, 22, 'Najświętszej Maryi Panny, Królowej', 'W', 'Biały'),
+    (8, 23, 'Św. Róży z Limy, dziewicy', 'w', 'Biały'),
+    (8, 24, 'Św. Bartłomieja, Apostoła', 'Ś', 'Czerwony'),
+    (8, 25, 'Św. Józefa Kalasantego, prezbitera', 'w', 'Biały'),
+    (8, 25, 'Św. Ludwika', 'w', 'Biały'),
+    (8, 26, 'Najświętszej Maryi Panny Częstochowskiej', 'U', 'Biały'),
+    (8, 27, 'Św. Moniki', 'W', 'Biały'),
+    (8, 28, 'Św. Augustyna, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (8, 29, 'Męczeństwo św. Jana Chrzciciela', 'W', 'Czerwony'),
+    (9, 3, 'Św. Grzegorza Wielkiego, papieża i doktora Kościoła', 'W', 'Biały'),
+    (9, 4, 'Błogosławionych dziewicy i męczennicy Marii Stelli i Towarzyszek', 'w', 'Czerwony'),
+    (9, 5, 'Św. Teresa z Kalkuty, męczennicy', 'w', 'Biały'),
+    (9, 7, 'Św. Melchiora Grodzieckiego, prezbitera i męczennika', 'w', 'Czerwony'),
+    (9, 8, 'Narodzenie Najświętszej Maryi Panny', 'Ś', 'Biały'),
+    (9, 9, 'Św. Piotra Klawera, prezbitera', 'w', 'Biały'),
+    (9, 12, 'Najświętszego Imienia Maryi', 'w', 'Biały'),
+    (9, 13, 'Św. Jana Chryzostoma, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (9, 14, 'Podwyższenie Krzyża Świętego', 'Ś', 'Czerwony'),
+    (9, 15, 'Najświętszej Maryi Panny Bolesnej', 'W', 'Biały'),
+    (9, 16, 'Świętych męczenników Korneliusza, papieża, i Cypriana, biskupa', 'W', 'Czerwony'),
+    (9, 17, 'Św. Hildegardy z Bingen, dziewicy i doktora Kościoła', 'w', 'Biały'),
+    (9, 17, 'Św. Roberta Bellarmina, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (9, 17, 'Św. Zygmunta Szczęsnego Felińskiego, biskupa', 'w', 'Biały'),
+    (9, 18, 'Św. Stanisława Kostki, zakonnika', 'Ś', 'Biały'),
+    (9, 19, 'Św. Januarego, biskupa i męczennika', 'w', 'Czerwony'),
+    (9, 20, 'Świętych męczenników Andrzeja Kim Taegon, prezbitera,Pawła Chong Hasang i Towarzyszy', 'W', 'Czerwony'),
+    (9, 21, 'Św. Mateusza, Apostoła i Ewangelisty', 'Ś', 'Czerwony'),
+    (9, 23, 'Św. Pio z Pietrelciny, prezbitera', 'W', 'Biały'),
+    (9, 26, 'Świętych męczenników Kosmy i Damiana', 'w', 'Czerwony'),
+    (9, 26, 'Świętych męczenników Wawrzyńca Ruiz i Towarzyszy', 'w', 'Czerwony'),
+    (9, 27, 'Św. Wincentego à Paulo, prezbitera', 'W', 'Biały'),
+    (9, 28, 'Św. Wacława, męczennika', 'W', 'Czerwony'),
+    (9, 29, 'Świętych Archaniołów Michała, Gabriela i Rafała', 'Ś', 'Biały'),
+    (9, 30, 'Św. Hieronima, prezbitera i doktora Kościoła', 'W', 'Biały'),
+    (10, 1, 'Św. Teresy od Dzieciątka Jezus, dziewicy i doktora Kościoła', 'W', 'Biały'),
+    (10, 2, 'Świętych Aniołów Stróżów', 'W', 'Biały'),
+    (10, 4, 'Św. Franciszka z Asyżu, zakonnika', 'W', 'Biały'),
+    (10, 5, 'Św. Faustyny Kowalskiej, dziewicy', 'W', 'Biały'),
+    (10, 6, 'Św. Brunona, prezbitera', 'w', 'Biały'),
+    (10, 7, 'Najświętszej Maryi Panny Różańcowej', 'W', 'Biały'),
+    (10, 9, 'Św. Jana Leonardiego, prezbitera', 'w', 'Biały'),
+    (10, 9, 'Świętych męczenników Dionizego, biskupa, i Towarzyszy', 'w', 'Czerwony'),
+    (10, 11, 'Św. Jana XXIII, papieża', 'w', 'Biały'),
+    (10, 13, 'Bł. Honorata Koźmińskiego, prezbitera', 'W', 'Biały'),
+    (10, 14, 'Św. Kaliksta I, papieża i męczennika', 'w', 'Czerwony'),
+    (10, 14, 'Św. Małgorzaty Marii Alacoque, dziewicy', 'w', 'Biały'),
+    (10, 15, 'Św. Teresy od Jezusa, dziewicy i doktora Kościoła', 'W', 'Biały'),
+    (10, 16, 'Św. Jadwigi Śląskiej', 'W', 'Biały'),
+    (10, 17, 'Św. Ignacego Antiocheńskiego, biskupa i męczennika', 'W', 'Czerwony'),
+    (10, 18, 'Św. Łukasza, Ewangelisty', 'Ś', 'Czerwony'),
+    (10, 19, 'Św. Pawła od Krzyża, prezbitera', 'w', 'Biały'),
+    (10, 19, 'Świętych męczenników Jana de Brébeuf i Izaaka Jogues, prezbiterów, i Towarzyszy', 'w', 'Czerwony'),
+    (10, 19, 'Bł. Jerzego Popiełuszki, prezbitera i męczennika', 'w', 'Czerwony'),
+    (10, 20, 'Św. Jana Kantego, prezbitera', 'W', 'Biały'),
+    (10, 22, 'Św. Jana Pawła II, papieża', 'W', 'Biały'),
+    (10, 23, 'Św. Jana Kapistrana, prezbitera', 'w', 'Biały'),
+    (10, 23, 'Św. Józefa Bilczewskiego, biskupa', 'w', 'Biały'),
+    (10, 24, 'Św. Antoniego Marii Clareta, biskupa', 'w', 'Biały'),
+    (10, 28, 'Świętych Apostołów Szymona i Judy Tadeusza', 'Ś', 'Czerwony'),
+    (11, 1, 'Wszystkich Świętych', 'U', 'Biały'),
+    (11, 2, 'Wspomnienie wszystkich wiernych zmarłych', '', 'Fioletowy'),
+    (11, 3, 'Św. Marcina de Porres, zakonnika', 'w', 'Biały'),
+    (11, 4, 'Św. Karola Boremeusza, biskupa', 'W', 'Biały'),
+    (11, 9, 'Rocznica poświęcenia Bazyliki Laterańskiej', 'Ś', 'Biały'),
+    (11, 10, 'Św. Leona Wielkiego, papieża i doktora Kościoła', 'W', 'Biały'),
+    (11, 11, 'Św. Marcina z Tours, biskupa', 'W', 'Biały'),
+    (11, 12, 'Św. Jozafata, biskupa i męczennika', 'W', 'Czerwony'),
+    (11, 13, 'Świętych Benedykta, Jana, Mateusza, Izaaka i Krystyna, pierwszych męczenników Polski', 'W', 'Czerwony'),
+    (11, 15, 'Św. Alberta Wielkiego, biskupa i doktora Kościoła', 'w', 'Biały'),
+    (11, 16, 'Św. Małgorzaty Szkockiej', 'w', 'Biały'),
+    (11, 16, 'Św. Gertrudy, dziewicy', 'w', 'Biały'),
+    (11, 17, 'Św. Elżbiety Węgierskiej, zakonnicy', 'W', 'Biały'),
+    (11, 18, 'Bł. Karoliny Kózkówny, dziewicy i męczennicy', 'W', 'Czerwony'),
+    (11, 20, 'Św. Rafała Kalinowskiego, prezbitera', 'W', 'Biały'),
+    (11, 21, 'Ofiarowanie Najświętszej Maryi Panny', 'W', 'Biały'),
+    (11, 22, 'Św. Cecylii, dziewicy i męczennicy', 'W', 'Czerwony'),
+    (11, 23, 'Św. Klemensa I, papieża i męczennika', 'w', 'Czerwony'),
+    (11, 23, 'Św. Kolumbana, opata', 'w', 'Biały'),
+    (11, 24, 'Świętych męczenników Andrzeja Dung-Lac, prezbitera, iTowarzyszy', 'W', 'Czerwony'),
+    (11, 25, 'Św. Katarzyny Aleksandryjskiej, dziewicy i męczennicy', 'w', 'Czerwony'),
+    (11, 30, 'Św. Andrzeja, Apostoła', 'Ś', 'Czerwony'),
+    (12, 3, 'Św. Franciszka Ksawerego, prezbitera', 'W', 'Biały'),
+    (12, 4, 'Św. Barbary, dziewicy i męczennicy', 'w', 'Czerwony'),
+    (12, 4, 'Św. Jana Damasceńskiego, prezbitera i doktora Kościoła', 'w', 'Biały'),
+    (12, 6, 'Św. Mikołaja, biskupa', 'w', 'Biały'),
+    (12, 7, 'Św. Ambrożego, biskupa i doktora Kościoła', 'W', 'Biały'),
+    (12, 8, 'Niepokalane poczęcie Najświętszej Maryi Panny', 'U', 'Biały'),
+    (12, 9, 'Św. Jana Diego Cuauhtlatoatzin', 'w', 'Biały'),
+    (12, 10, 'Najświętszej Maryi Panny Loretańskiej', 'w', 'Biały'),
+    (12, 11, 'Św. Damazego I, papieża', 'w', 'Biały'),
+    (12, 12, 'Najświętszej Maryi Panny z Guadalupe', 'w', 'Biały'),
+    (12, 13, 'Św. Łucji, dziewicy i męczennicy', 'W', 'Czerwony'),
+    (12, 14, 'Św. Jana od Krzyża, prezbitera i doktora Kościoła', 'W', 'Biały'),
+    (12, 21, 'Św. Piotra Kanizjusza, prezbitera i doktora Kościoła', 'w', 'Biały'),
+    (12, 26, 'Św. Szczepana, pierwszego męczennika', 'Ś', 'Czerwony'),
+    (12, 27, 'Św. Jana, Apostoła i Ewangelisty', 'Ś', 'Biały'),
+    (12, 28, 'Świętych Młodziaków, męczenników', 'Ś', 'Czerwony'),
+    (12, 29, 'Św. Tomasza Becketa, biskupa i męczennika', 'w', 'Biały'),
+    (12, 31, 'Św. Sylwestra I, papieża', 'w', 'Biały'),
+]
+# --- Koniec Konfiguracji ---
+
+DNI_TYGODNIA = ['Poniedziałek', 'Wtorek', 'Środa', 'Czwartek', 'Piątek', 'Sobota', 'Niedziela']
+DNI_WIELKIEGO_TYGODNIA = ['Wielki Poniedziałek', 'Wielki Wtorek', 'Wielka Środa']
+DNI_OKTAWY = {5: 'V', 6: 'VI', 7: 'VII'}
+
+# Obchód: (nazwa jak w gcatholic.org, kod rodzaju, kolor, ranga)
+Obchod = Tuple[str, str, str, int]
+
+
+def rzymska(liczba: int) -> str:
+    """Liczba w zapisie rzymskim (numery tygodni i niedziel w nazwach gcatholic.org)."""
+    wynik = ''
+    for wartosc, znaki in ((10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')):
+        while liczba >= wartosc:
+            wynik += znaki
+            liczba -= wartosc
+    return wynik
+
+
+def wielkanoc(rok: int) -> datetime.date:
+    """Data Wielkanocy w kalendarzu gregoriańskim (algorytm Meeusa/Jonesa/Butchera)."""
+    a, b, c = rok % 19, rok // 100, rok % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    miesiac = (h + l - 7 * m + 90) // 25
+    return datetime.date(rok, miesiac, (h + l - 7 * m + 33 * miesiac + 19) % 32)
+
+
+def pierwsza_niedziela_adwentu(rok: int) -> datetime.date:
+    """Pierwsza niedziela Adwentu: ostatnia niedziela nie późniejsza niż 3 grudnia."""
+    trzeci_grudnia = datetime.date(rok, 12, 3)
+    return trzeci_grudnia - datetime.timedelta(days=(trzeci_grudnia.weekday() + 1) % 7)
+
+
+def cykle(data: datetime.date) -> Tuple[str, str]:
+    """
+    Rok niedzielny (A/B/C) i rok dni powszednich (1/2) dla daty - tak samo jak calculateLiturgicalCycles
+    w PobierzKalendarz.kt (rok 1/2 według parzystości roku kalendarzowego).
+    """
+    rok_cyfra = '1' if data.year % 2 else '2'
+    rok_odniesienia = data.year - 1 if data < pierwsza_niedziela_adwentu(data.year) else data.year
+    return 'ABC'[rok_odniesienia % 3], rok_cyfra
+
+
+def obchody_okresowe(rok: int) -> Dict[datetime.date, Obchod]:
+    """Dni okresowe (proper de tempore) roku kalendarzowego; 1 stycznia i niedziela Świętej Rodziny włącznie."""
+    dzien = datetime.timedelta(days=1)
+    wn = wielkanoc(rok)
+    popielec = wn - 46 * dzien
+    pierwsza_niedziela_postu = wn - 42 * dzien
+    pieciesiatnica = wn + 49 * dzien
+    adwent = pierwsza_niedziela_adwentu(rok)
+    objawienie = datetime.date(rok, 1, 6)
+    chrzest = objawienie + ((6 - objawienie.weekday()) or 7) * dzien
+    swieta_rodzina = next((datetime.date(rok, 12, d) for d in range(26, 32) if datetime.date(rok, 12, d).weekday() == 6),
+                          datetime.date(rok, 12, 30))
+    ruchome = {
+        wn - 7 * dzien: ('Niedziela Palmowa Męki Pańskiej', '', 'Czerwony', 2),
+        wn - 3 * dzien: ('Wielki Czwartek: Wieczerzy Pańskiej', '', 'Biały', 1),
+        wn - 2 * dzien: ('Wielki Piątek: Męki Pańskiej', '', 'Czerwony', 1),
+        wn - dzien: ('Wielka Sobota', '', 'Biały', 1),
+        wn: ('Niedziela Zmartwychwstania Pańskiego', '', 'Biały', 1),
+        wn + 42 * dzien: ('Wniebowstąpienie Pańskie', 'U', 'Biały', 2),
+        pieciesiatnica: ('Niedziela Zesłania Ducha Świętego', 'U', 'Czerwony', 2),
+        wn + 56 * dzien: ('Najświętszej Trójcy', 'U', 'Biały', 3),
+        wn + 60 * dzien: ('Najświętszego Ciała i Krwi Chrystusa', 'U', 'Biały', 3),
+        wn + 68 * dzien: ('Najświętszego Serca Pana Jezusa', 'U', 'Biały', 3),
+        adwent - 7 * dzien: ('Jezusa Chrystusa, Króla Wszechświata', 'U', 'Biały', 3),
+        objawienie: ('Objawienie Pańskie', 'U', 'Biały', 2),
+        chrzest: ('Chrzest Pański', 'Ś', 'Biały', 5),
+        datetime.date(rok, 12, 25): ('Narodzenie Pańskie', 'U', 'Biały', 2),
+        swieta_rodzina: ('Świętej Rodziny Jezusa, Maryi i Józefa', 'Ś', 'Biały', 5),
+    }
+
+    obchody = {}
+    data = datetime.date(rok, 1, 2)
+    while data.year == rok:
+        nazwa_dnia, niedziela = DNI_TYGODNIA[data.weekday()], data.weekday() == 6
+        if data in ruchome:
+            obchod = ruchome[data]
+        elif data < objawienie:
+            obchod = (('II Niedziela po Bożym Narodzeniu', '', 'Biały', 6) if niedziela
+                      else (f'{nazwa_dnia} przed Objawieniem Pańskim', '', 'Biały', 13))
+        elif data < chrzest:
+            obchod = (f'{nazwa_dnia} po Objawieniu Pańskim', '', 'Biały', 13)
+        elif data < popielec:
+            tydzien = rzymska((data - chrzest).days // 7 + 1)
+            obchod = ((f'{tydzien} Niedziela Zwykła', '', 'Zielony', 6) if niedziela
+                      else (f'{nazwa_dnia} {tydzien} tygodnia zwykłego', '', 'Zielony', 13))
+        elif data == popielec:
+            obchod = ('Środa Popielcowa', '', 'Fioletowy', 2)
+        elif data < pierwsza_niedziela_postu:
+            obchod = (f'{nazwa_dnia} po Popielcu', '', 'Fioletowy', RANGA_DNI_UPRZYWILEJOWANYCH)
+        elif data < wn - 7 * dzien:
+            numer = (data - pierwsza_niedziela_postu).days // 7 + 1
+            if niedziela:
+                obchod = (f'{rzymska(numer)} Niedziela Wielkiego Postu' + (' „Laetare”' if numer == 4 else ''), '', 'Fioletowy', 2)
+            else:
+                obchod = (f'{nazwa_dnia} {rzymska(numer)} tygodnia Wielkiego Postu', '', 'Fioletowy', RANGA_DNI_UPRZYWILEJOWANYCH)
+        elif data < wn:
+            obchod = (DNI_WIELKIEGO_TYGODNIA[data.weekday()], '', 'Fioletowy', 2)
+        elif data < wn + 7 * dzien:
+            obchod = (f'{nazwa_dnia} w Oktawie Wielkanocy', 'U', 'Biały', 2)
+        elif data < pieciesiatnica:
+            numer = (data - wn).days // 7 + 1
+            if niedziela:
+                obchod = ('II Niedziela Wielkanocna czyli Miłosierdzia Bożego' if numer == 2
+                          else f'{rzymska(numer)} Niedziela Wielkanocna', '', 'Biały', 2)
+            else:
+                obchod = (f'{nazwa_dnia} {rzymska(numer)} Tygodnia Wielkanocnego', '', 'Biały', 13)
+        elif data < adwent:
+            tydzien = rzymska(35 - ((adwent - data).days + 6) // 7)
+            obchod = ((f'{tydzien} Niedziela Zwykła', '', 'Zielony', 6) if niedziela
+                      else (f'{nazwa_dnia} {tydzien} tygodnia zwykłego', '', 'Zielony', 13))
+        elif data < datetime.date(rok, 12, 25):
+            numer = rzymska((data - adwent).days // 7 + 1)
+            if niedziela:
+                obchod = (f'{numer} Niedziela Adwentu', '', 'Fioletowy', 2)
+            elif data.day >= 17:
+                obchod = (f'Dzień adwentu ({data.day} grudnia)', '', 'Fioletowy', RANGA_DNI_UPRZYWILEJOWANYCH)
+            else:
+                obchod = (f'{nazwa_dnia} {numer} tygodnia Adwentu', '', 'Fioletowy', 13)
+        else:
+            obchod = (f'{DNI_OKTAWY.get(data.day - 24, rzymska(data.day - 24))} dzień w oktawie Narodzenia Pańskiego',
+                      '', 'Biały', RANGA_DNI_UPRZYWILEJOWANYCH)
+        obchody[data] = obchod
+        data += dzien
+    return obchody
+
+
+def obchody_stale(rok: int, okresowe: Dict[datetime.date, Obchod]) -> Dict[datetime.date, List[Obchod]]:
+    """
+    Obchody stałe i ruchome wspomnienia roku z rangami. Uroczystość przeszkodzona przez ważniejszy dzień
+    (albo inną uroczystość) trafia na najbliższy wolny dzień; uroczystość św. Józefa przypadająca
+    w Wielkim Tygodniu - na sobotę przed Niedzielą Palmową.
+    """
+    wn = wielkanoc(rok)
+    wpisy = [
+        (wn + datetime.timedelta(days=50), 'Najświętszej Maryi Panny, Matki Kościoła', 'Ś', 'Biały'),
+        (wn + datetime.timedelta(days=53), 'Jezusa Chrystusa, Najwyższego i Wiecznego Kapłana', 'Ś', 'Biały'),
+        (wn + datetime.timedelta(days=69), 'Niepokalanego Serca Najświętszej Maryi Panny', 'W', 'Biały'),
+    ]
+    wpisy += [(datetime.date(rok, m, d), nazwa, kod, kolor) for m, d, nazwa, kod, kolor in SWIETA_STALE]
+
+    def przeszkodzona(data, ranga):
+        return (okresowe.get(data, ('', '', '', 99))[3] <= ranga
+                or any(obchod[1] == 'U' for obchod in stale.get(data, [])))
+
+    # Najpierw obchody w swoich dniach, potem przeniesione uroczystości - na dni, które zostały wolne
+    stale: Dict[datetime.date, List[Obchod]] = {}
+    przeniesione = []
+    for data, nazwa, kod, kolor in wpisy:
+        ranga = RANGI_SZCZEGOLNE.get(nazwa, RANGI_TYPOW[kod])
+        if kod == 'U' and przeszkodzona(data, ranga):
+            przeniesione.append((data, nazwa, kod, kolor, ranga))
+        else:
+            stale.setdefault(data, []).append((nazwa, kod, kolor, ranga))
+    for data, nazwa, kod, kolor, ranga in przeniesione:
+        if nazwa.startswith('Św. Józefa, Oblubieńca') and wn - datetime.timedelta(days=7) <= data < wn:
+            data = wn - datetime.timedelta(days=8)
+        while przeszkodzona(data, ranga):
+            data += datetime.timedelta(days=1)
+        stale.setdefault(data, []).append((nazwa, kod, kolor, ranga))
+    return stale
+
+
+def obchody_dnia(data: datetime.date, okresowy: Optional[Obchod], stale: List[Obchod]) -> List[Obchod]:
+    """
+    Obchody jednej daty w kolejności kalendarza: najpierw obchód główny, potem wspomnienia, które
+    w tym dniu można obchodzić. Kod rodzaju wspomnień w dni uprzywilejowane jest zamieniany na dowolny.
+    """
+    okresowy = okresowy or ('', '', '', 99)
+    stale = sorted(stale, key=lambda obchod: obchod[3])
+    if stale and stale[0][3] < okresowy[3] and stale[0][1] != 'w':
+        glowny, reszta = stale[0], stale[1:]
+        if glowny[1] == 'W' and any(kod == 'W' for _, kod, _, _ in reszta):
+            # Kilka wspomnień obowiązkowych jednego dnia obchodzi się jako dowolne, bez dnia powszedniego (jak w gcatholic.org)
+            return [(nazwa, 'w', kolor, ranga) for nazwa, _, kolor, ranga in stale]
+    else:
+        glowny, reszta = okresowy, stale
+    if glowny[3] <= RANGA_BEZ_WSPOMNIEN:
+        return [glowny]
+
+    wynik = [glowny]
+    for nazwa, kod, kolor, ranga in reszta:
+        if ranga > RANGA_DNI_UPRZYWILEJOWANYCH:
+            if okresowy[3] == RANGA_DNI_UPRZYWILEJOWANYCH:
+                wynik.append((nazwa, 'w', okresowy[2], ranga))
+            elif kod == 'w' or glowny is okresowy:
+                wynik.append((nazwa, 'w', kolor, ranga))
+    if (data.weekday() == 5 and glowny is okresowy and okresowy[0].endswith('tygodnia zwykłego')
+            and all(kod == 'w' for _, kod, _, _ in reszta)):
+        wynik.append((WSPOMNIENIE_SOBOTNIE, 'w', 'Biały', RANGI_TYPOW['w']))
+    return wynik
+
+
+def nazwa_w_kalendarzu(nazwa: str, data: datetime.date, mapa_nazw: Dict[str, str]) -> str:
+    """Nazwa obchodu po tłumaczeniu mapą nazw; sobotnie wspomnienie NMP dostaje datę, jak w PobierzKalendarz.kt."""
+    nazwa = mapa_nazw.get(nazwa, nazwa)
+    if nazwa == WSPOMNIENIE_SOBOTNIE:
+        nazwa = f"{nazwa} ({data.day:02d}-{data.month:02d})"
+    return nazwa
+
+
+def kalendarz_roku(rok: int, mapa_nazw: Dict[str, str]) -> Dict[str, dict]:
+    """Kalendarz roku w postaci plików Kalendarz/<rok>.json: nazwa -> {data, rok_litera, rok_cyfra, typ, kolor}."""
+    okresowe = obchody_okresowe(rok)
+    stale = obchody_stale(rok, okresowe)
+    kalendarz = {}
+    data = datetime.date(rok, 1, 1)
+    while data.year == rok:
+        rok_litera, rok_cyfra = cykle(data)
+        for nazwa, kod, kolor, _ in obchody_dnia(data, okresowe.get(data), stale.get(data, [])):
+            kalendarz[nazwa_w_kalendarzu(nazwa, data, mapa_nazw)] = {
+                'data': data.strftime('%d-%m-%Y'),
+                'rok_litera': rok_litera,
+                'rok_cyfra': rok_cyfra,
+                'typ': TYPY[kod],
+                'kolor': kolor,
+            }
+        data += datetime.timedelta(days=1)
+    return kalendarz
+
+
+def main():
+    """Generuje pliki kalendarza dla podanych lat."""
+    parser = argparse.ArgumentParser(description="Kalendarz liturgiczny liczony lokalnie (bez pobierania ICS) w formacie Kalendarz/<rok>.json.")
+    parser.add_argument('lata', nargs='*', type=int, help="lata do wygenerowania")
+    parser.add_argument('--od', type=int, help="pierwszy rok zakresu")
+    parser.add_argument('--do', type=int, help="ostatni rok zakresu (włącznie)")
+    parser.add_argument('--folder', default=FOLDER_KALENDARZA, help=f"folder wynikowy (domyślnie {FOLDER_KALENDARZA})")
+    parser.add_argument('--nadpisz', action='store_true', help="nadpisz istniejące pliki (np. pobrane z gcatholic.org)")
+    args = parser.parse_args()
+
+    lata = list(args.lata)
+    if args.od is not None:
+        lata += range(args.od, (args.do if args.do is not None else args.od) + 1)
+    if not lata:
+        parser.error("podaj lata albo zakres --od/--do")
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    mapa_nazw = wczytaj_json(os.path.join(biezacy_folder, FOLDER_KALENDARZA, PLIK_MAPY_NAZW), None)
+    if mapa_nazw is None:
+        print(f"Ostrzeżenie: Brak mapy nazw '{PLIK_MAPY_NAZW}' - nazwy zostaną w brzmieniu gcatholic.org.")
+        mapa_nazw = {}
+    folder = os.path.join(biezacy_folder, args.folder)
+
+    zapisane, pominiete, czas = 0, [], 0.0
+    for rok in sorted(set(lata)):
+        sciezka = os.path.join(folder, f"{rok}.json")
+        if os.path.exists(sciezka) and not args.nadpisz:
+            pominiete.append(rok)
+            continue
+        start = time.perf_counter()
+        kalendarz = kalendarz_roku(rok, mapa_nazw)
+        czas += time.perf_counter() - start
+        zapisz_json_atomowo(sciezka, kalendarz, wciecie=2)
+        zapisane += 1
+
+    print("\n--- Podsumowanie ---")
+    if zapisane:
+        print(f"Zapisane kalendarze: {zapisane} (średnio {czas / zapisane * 1000:.1f} ms na rok) w folderze '{folder}'.")
+    if pominiete:
+        print(f"Pominięto istniejące pliki (użyj --nadpisz): {', '.join(map(str, pominiete))}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+import os
+import json
+import shutil
+import argparse
+from typing import Dict, List, Any
+
+from manifest import FOLDER_MANIFESTOW, aktualizuj_manifest, wczytaj_json, zapisz_json_atomowo
+from profilowanie import uruchom_z_profilem
+
+# Synchronizuje drzewa Lekcjonarz_JSON2 i NiesprawdzoneDni na podstawie manifestów.
+# Różnice wyznaczane są z porównania skrótów (bez parsowania plików), a stan z ostatniej
+# synchronizacji pozwala odróżnić zmianę po jednej stronie od konfliktu (zmiana po obu stronach
+# albo zmiana po jednej i usunięcie po drugiej).
+
+# --- Konfiguracja ---
+DRZEWO_A = 'Lekcjonarz_JSON2'
+DRZEWO_B = 'NiesprawdzoneDni'
+
+# Plik ze skrótami plików z chwili ostatniej udanej synchronizacji (wspólna baza obu drzew)
+NAZWA_PLIKU_BAZY = 'synchronizacja_baza.json'
+
+KATEGORIE_ZMIAN = [
+    'tylko_a', 'tylko_b', 'zmienione_a', 'zmienione_b',
+    'usuniete_a', 'usuniete_b', 'konflikty'
+]
+
+
+def wyznacz_roznice(manifest_a: Dict[str, dict], manifest_b: Dict[str, dict],
+                    baza: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Porównuje manifesty dwóch drzew w jednym przebiegu, korzystając wyłącznie ze skrótów.
+
+    Args:
+        manifest_a (dict): Manifest drzewa A.
+        manifest_b (dict): Manifest drzewa B.
+        baza (dict): Ścieżka -> skrót z ostatniej synchronizacji.
+
+    Returns:
+        Słownik: kategoria zmiany -> posortowana lista ścieżek względnych.
+        Pliki identyczne w obu drzewach trafiają do kategorii 'identyczne', a pliki zmienione po jednej
+        stronie i usunięte po drugiej - do 'konflikty', tak jak zmiany po obu stronach.
+    """
+    roznice = {kategoria: [] for kategoria in KATEGORIE_ZMIAN + ['identyczne']}
+
+    for sciezka in sorted(manifest_a.keys() | manifest_b.keys()):
+        wpis_a = manifest_a.get(sciezka)
+        wpis_b = manifest_b.get(sciezka)
+        skrot_bazy = baza.get(sciezka)
+
+        if wpis_a and wpis_b:
+            if wpis_a['skrot'] == wpis_b['skrot']:
+                roznice['identyczne'].append(sciezka)
+                continue
+            zmiana_a = wpis_a['skrot'] != skrot_bazy
+            zmiana_b = wpis_b['skrot'] != skrot_bazy
+            if zmiana_a and zmiana_b:
+                roznice['konflikty'].append(sciezka)
+            elif zmiana_a:
+                roznice['zmienione_a'].append(sciezka)
+            else:
+                roznice['zmienione_b'].append(sciezka)
+        elif wpis_a:
+            # Plik był zsynchronizowany i nie zmienił się w A -> został usunięty w B;
+            # zmienił się w A i zniknął z B -> konflikt
+            if skrot_bazy is None:
+                roznice['tylko_a'].append(sciezka)
+            elif skrot_bazy == wpis_a['skrot']:
+                roznice['usuniete_b'].append(sciezka)
+            else:
+                roznice['konflikty'].append(sciezka)
+        else:
+            if skrot_bazy is None:
+                roznice['tylko_b'].append(sciezka)
+            elif skrot_bazy == wpis_b['skrot']:
+                roznice['usuniete_a'].append(sciezka)
+            else:
+                roznice['konflikty'].append(sciezka)
+
+    return roznice
+
+
+def _klucz_piesni(piesn: Dict[str, Any]):
+    return piesn.get('moment'), piesn.get('numer')
+
+
+def porownaj_strukturalnie(dane_a: Dict[str, Any], dane_b: Dict[str, Any]) -> List[str]:
+    """
+    Tworzy czytelny opis różnic w sekcjach 'czytania' i 'piesniSugerowane' dwóch wersji dnia.
+
+    Args:
+        dane_a (dict): Zawartość pliku w drzewie A.
+        dane_b (dict): Zawartość pliku w drzewie B.
+
+    Returns:
+        Lista linii tekstu opisujących różnice.
+    """
+    linie = []
+
+    czytania_a = dane_a.get('czytania', []) or []
+    czytania_b = dane_b.get('czytania', []) or []
+    if len(czytania_a) != len(czytania_b):
+        linie.append(f"czytania: liczba pozycji A={len(czytania_a)}, B={len(czytania_b)}")
+    for i in range(max(len(czytania_a), len(czytania_b))):
+        cz_a = czytania_a[i] if i < len(czytania_a) else {}
+        cz_b = czytania_b[i] if i < len(czytania_b) else {}
+        for pole in ['typ', 'sigla', 'opis', 'tekst']:
+            if cz_a.get(pole) != cz_b.get(pole):
+                typ = cz_a.get('typ') or cz_b.get('typ') or '?'
+                linie.append(f"czytania[{i}] ({typ}).{pole}: A={cz_a.get(pole)!r:.80} | B={cz_b.get(pole)!r:.80}")
+
+    piesni_a = {_klucz_piesni(p): p for p in dane_a.get('piesniSugerowane', []) or []}
+    piesni_b = {_klucz_piesni(p): p for p in dane_b.get('piesniSugerowane', []) or []}
+    for klucz in sorted(piesni_a.keys() - piesni_b.keys(), key=str):
+        p = piesni_a[klucz]
+        linie.append(f"piesniSugerowane: tylko w A -> [{p.get('moment')}] {p.get('numer')} {p.get('piesn')}")
+    for klucz in sorted(piesni_b.keys() - piesni_a.keys(), key=str):
+        p = piesni_b[klucz]
+        linie.append(f"piesniSugerowane: tylko w B -> [{p.get('moment')}] {p.get('numer')} {p.get('piesn')}")
+    for klucz in sorted(piesni_a.keys() & piesni_b.keys(), key=str):
+        for pole in ['piesn', 'opis']:
+            if piesni_a[klucz].get(pole) != piesni_b[klucz].get(pole):
+                linie.append(f"piesniSugerowane [{klucz[0]}] {klucz[1]}.{pole}: różni się między A i B")
+
+    for pole in sorted((dane_a.keys() | dane_b.keys()) - {'czytania', 'piesniSugerowane'}):
+        if dane_a.get(pole) != dane_b.get(pole):
+            linie.append(f"{pole}: A={dane_a.get(pole)!r} | B={dane_b.get(pole)!r}")
+
+    return linie
+
+
+def _kopiuj_atomowo(zrodlo: str, cel: str):
+    """Kopiuje plik (z czasem modyfikacji) przez plik tymczasowy i os.replace."""
+    os.makedirs(os.path.dirname(cel), exist_ok=True)
+    sciezka_tymczasowa = f"{cel}.tmp"
+    shutil.copy2(zrodlo, sciezka_tymczasowa)
+    os.replace(sciezka_tymczasowa, cel)
+
+
+def zastosuj_kierunek(katalog_zrodlowy: str, katalog_docelowy: str,
+                      manifest_zrodlowy: Dict[str, dict], roznice: Dict[str, List[str]],
+                      kierunek: str, baza: Dict[str, str], wymus: bool = False, usuwaj: bool = False) -> Dict[str, int]:
+    """
+    Przenosi zmiany ze strony źródłowej na docelową. Konflikty są pomijane, chyba że
+    podano wymus=True (wtedy wygrywa strona źródłowa - także jej usunięcie pliku).
+
+    Args:
+        kierunek (str): 'a-b' lub 'b-a'.
+        baza (dict): Baza synchronizacji, aktualizowana w miejscu.
+        wymus (bool): Czy nadpisywać pliki w konflikcie.
+        usuwaj (bool): Czy usuwać w drzewie docelowym pliki usunięte w źródłowym.
+
+    Returns:
+        Liczniki wykonanych operacji.
+    """
+    zr = 'a' if kierunek == 'a-b' else 'b'
+    do_skopiowania = roznice[f'tylko_{zr}'] + roznice[f'zmienione_{zr}']
+    do_usuniecia = roznice[f'usuniete_{zr}'] if usuwaj else []
+    if wymus:
+        do_skopiowania += [s for s in roznice['konflikty'] if s in manifest_zrodlowy]
+        do_usuniecia += [s for s in roznice['konflikty'] if s not in manifest_zrodlowy]
+    liczniki = {'skopiowane': 0, 'usuniete': 0, 'pominiete_konflikty': 0}
+
+    for sciezka in do_skopiowania:
+        zrodlo = os.path.join(katalog_zrodlowy, sciezka)
+        cel = os.path.join(katalog_docelowy, sciezka)
+        _kopiuj_atomowo(zrodlo, cel)
+        baza[sciezka] = manifest_zrodlowy[sciezka]['skrot']
+        liczniki['skopiowane'] += 1
+        print(f"  Skopiowano: {sciezka}")
+
+    for sciezka in do_usuniecia:
+        os.remove(os.path.join(katalog_docelowy, sciezka))
+        baza.pop(sciezka, None)
+        liczniki['usuniete'] += 1
+        print(f"  Usunięto: {sciezka}")
+
+    if not wymus:
+        liczniki['pominiete_konflikty'] = len(roznice['konflikty'])
+    return liczniki
+
+
+def pokaz_konflikty(katalog_a: str, katalog_b: str, konflikty: List[str]):
+    """Wypisuje strukturalne różnice dla plików w konflikcie (parsowane są tylko te pliki)."""
+    for sciezka in konflikty:
+        print(f"\n=== KONFLIKT: {sciezka}")
+        usuniety = [strona for katalog, strona in ((katalog_a, 'A'), (katalog_b, 'B'))
+                    if not os.path.exists(os.path.join(katalog, sciezka))]
+        if usuniety:
+            print(f"  Plik usunięty w {usuniety[0]}, a zmieniony w {'B' if usuniety[0] == 'A' else 'A'} od ostatniej synchronizacji.")
+            continue
+        try:
+            with open(os.path.join(katalog_a, sciezka), 'r', encoding='utf-8') as f:
+                dane_a = json.load(f)
+            with open(os.path.join(katalog_b, sciezka), 'r', encoding='utf-8') as f:
+                dane_b = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"  Nie można porównać strukturalnie: {e}")
+            continue
+        linie = porownaj_strukturalnie(dane_a, dane_b)
+        for linia in linie or ['(różnice wyłącznie w formatowaniu pliku)']:
+            print(f"  {linia}")
+
+
+def main():
+    """Główna funkcja sterująca wykonaniem skryptu."""
+    parser = argparse.ArgumentParser(description="Synchronizacja Lekcjonarz_JSON2 <-> NiesprawdzoneDni na podstawie manifestów.")
+    parser.add_argument('polecenie', choices=['roznice', 'konflikty', 'zastosuj'],
+                        help="roznice: podsumowanie zmian; konflikty: różnice strukturalne; zastosuj: przeniesienie zmian")
+    parser.add_argument('--kierunek', choices=['a-b', 'b-a'], default='b-a',
+                        help=f"a-b: {DRZEWO_A} -> {DRZEWO_B}, b-a: {DRZEWO_B} -> {DRZEWO_A} (domyślnie b-a)")
+    parser.add_argument('--wymus', action='store_true', help="nadpisz pliki w konflikcie wersją ze strony źródłowej")
+    parser.add_argument('--usuwaj', action='store_true', help="usuń w drzewie docelowym pliki usunięte w źródłowym")
+    parser.add_argument('--pokaz', action='store_true', help="wypisz wszystkie ścieżki w każdej kategorii")
+    args = parser.parse_args()
+
+    biezacy_folder = os.path.dirname(os.path.abspath(__file__))
+    folder_manifestow = os.path.join(biezacy_folder, FOLDER_MANIFESTOW)
+    katalog_a = os.path.join(biezacy_folder, DRZEWO_A)
+    katalog_b = os.path.join(biezacy_folder, DRZEWO_B)
+    sciezka_bazy = os.path.join(folder_manifestow, NAZWA_PLIKU_BAZY)
+
+    for katalog in [katalog_a, katalog_b]:
+        if not os.path.isdir(katalog):
+            print(f"BŁĄD: Folder '{katalog}' nie istnieje.")
+            return
+
+    manifest_a = aktualizuj_manifest(katalog_a, folder_manifestow)
+    manifest_b = aktualizuj_manifest(katalog_b, folder_manifestow)
+    baza = wczytaj_json(sciezka_bazy, {})
+
+    roznice = wyznacz_roznice(manifest_a, manifest_b, baza)
+    # Pliki identyczne po obu stronach są z definicji zsynchronizowane
+    for sciezka in roznice['identyczne']:
+        baza[sciezka] = manifest_a[sciezka]['skrot']
+
+    print(f"A = {DRZEWO_A} ({len(manifest_a)} plików), B = {DRZEWO_B} ({len(manifest_b)} plików)")
+    for kategoria in KATEGORIE_ZMIAN + ['identyczne']:
+        print(f"  {kategoria}: {len(roznice[kategoria])}")
+        if args.pokaz and kategoria != 'identyczne':
+            for sciezka in roznice[kategoria]:
+                print(f"    {sciezka}")
+
+    if args.polecenie == 'konflikty':
+        pokaz_konflikty(katalog_a, katalog_b, roznice['konflikty'])
+    elif args.polecenie == 'zastosuj':
+        if args.kierunek == 'a-b':
+            liczniki = zastosuj_kierunek(katalog_a, katalog_b, manifest_a, roznice,
+                                         args.kierunek, baza, args.wymus, args.usuwaj)
+            aktualizuj_manifest(katalog_b, folder_manifestow)
+        else:
+            liczniki = zastosuj_kierunek(katalog_b, katalog_a, manifest_b, roznice,
+                                         args.kierunek, baza, args.wymus, args.usuwaj)
+            aktualizuj_manifest(katalog_a, folder_manifestow)
+        print(f"\nSkopiowano: {liczniki['skopiowane']}, usunięto: {liczniki['usuniete']}.")
+        if liczniki['pominiete_konflikty']:
+            print(f"Pominięto {liczniki['pominiete_konflikty']} plików w konflikcie (użyj 'konflikty', aby je obejrzeć, lub --wymus).")
+
+    zapisz_json_atomowo(sciezka_bazy, baza)
+
+
+if __name__ == '__main__':
+    uruchom_z_profilem(main)